@@ -0,0 +1,67 @@
+"""
+Measures the throughput of `FileLock` when many processes take turns with it, in the default mode (the file is
+opened for each acquire and removed on release) and with `persistent=True`. Also counts how often a process found that
+another one was still inside the lock, and how many processes failed, both of which the race of the default mode allows
+(a process may remove the lock file of another one on release).
+
+	PYTHONPATH=src python benchmark/Concurrency_FileLock_contention.py [processes] [acquiresPerProcess]
+"""
+from Lang.Concurrency import FileSystem
+
+import _util
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+HOLD_TIME = 0.0001		# seconds inside the lock, so that another process can be scheduled meanwhile
+
+_RESULT = struct.Struct("ii")		# acquires done, overlaps seen
+
+def work(lock, shared, processNum, count):
+	"""Takes turns with the other processes, and writes its result to `shared` after each turn"""
+	overlaps = 0
+	for done in xrange(1, count + 1):
+		lock.acquire(timeout=None)
+		if shared[0] != b"\0":
+			overlaps += 1
+		shared[0] = b"\1"
+		time.sleep(HOLD_TIME)
+		shared[0] = b"\0"
+		lock.release()
+		_RESULT.pack_into(shared, 1 + _RESULT.size * processNum, done, overlaps)
+
+def run(persistent, processCount, count):
+	"""@return tuple:	`(seconds, acquires, overlaps, failures)`, where `failures` is the number of processes which raised an exception"""
+	lock = FileSystem.FileLock("Concurrency_FileLock_contention benchmark", persistent=persistent)
+	shared = mmap.mmap(-1, 1 + _RESULT.size * processCount)		# "inside the lock" flag, then the result of each process
+	start = time.time()
+	pids = []
+	for processNum in xrange(processCount):
+		pid = os.fork()
+		if pid == 0:
+			try:
+				work(lock, shared, processNum, count)
+			except Exception:
+				os._exit(1)
+			os._exit(0)
+		pids.append(pid)
+	failures = sum(1 for pid in pids if os.waitpid(pid, 0)[1] != 0)
+	seconds = time.time() - start
+	results = [_RESULT.unpack_from(shared, 1 + _RESULT.size * processNum) for processNum in xrange(processCount)]
+	return seconds, sum(acquires for acquires, _ in results), sum(overlaps for _, overlaps in results), failures
+
+def main():
+	processCount = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+	count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+	rows = []
+	for persistent in (False, True):
+		seconds, acquires, overlaps, failures = run(persistent, processCount, count)
+		rows.append(("persistent" if persistent else "default", processCount, acquires, "%.3f" % seconds,
+			"%.0f" % (acquires / seconds), overlaps, failures))
+	_util.printTable(("mode", "processes", "acquires", "seconds", "acquires per second", "overlaps", "failed processes"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,33 @@
+"""
+Measures uncontended `acquire` and `release` cycles of `FileLock` per second, in the default and persistent modes, and
+checks of `isTakenByAnyone` per second. These are mostly the overhead of the Python code around the system calls.
+
+	PYTHONPATH=src python benchmark/Concurrency_FileLock_cycle.py [cycles]
+"""
+from Lang.Concurrency import FileSystem
+
+import _util
+
+import sys
+
+def cycles(lock, count):
+	for _ in xrange(count):
+		lock.acquire(timeout=0)
+		lock.release()
+
+def checks(lock, count):
+	for _ in xrange(count):
+		lock.isTakenByAnyone()
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+	rows = []
+	for persistent in (False, True):
+		lock = FileSystem.FileLock("Concurrency_FileLock_cycle benchmark", persistent=persistent)
+		mode = "persistent" if persistent else "default"
+		rows.append((mode, "acquire + release", "%.0f" % (count / _util.timeIt(lambda: cycles(lock, count)))))
+		rows.append((mode, "isTakenByAnyone", "%.0f" % (count / _util.timeIt(lambda: checks(lock, count)))))
+	_util.printTable(("mode", "operation", "per second"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,57 @@
+"""
+Measures how long `FileLock.getSlotsTakenByAnyone` takes, when nobody has the lock and when another process has it,
+compared to the old way of checking, which took the lock and released it again.
+
+	PYTHONPATH=src python benchmark/Concurrency_FileLock_probe.py [checks]
+"""
+from Lang.Concurrency import FileSystem
+
+import _util
+
+import fcntl
+import os
+import sys
+import time
+
+def acquireReleaseProbe(lock):
+	"""The old `getSlotsTakenByAnyone`"""
+	if lock._acquire(shouldBlock=False) == True:
+		lock._release()
+		return 0
+	return 1
+
+def holdInChild(lock):
+	"""@return int:	The pid of a child process which has the lock until it's killed"""
+	readEnd, writeEnd = os.pipe()
+	pid = os.fork()
+	if pid == 0:
+		file_ = open(lock.getLockFilePath(), "w")
+		fcntl.lockf(file_.fileno(), fcntl.LOCK_EX)
+		os.write(writeEnd, b"x")
+		time.sleep(3600)
+		os._exit(0)
+	os.read(readEnd, 1)
+	os.close(readEnd)
+	os.close(writeEnd)
+	return pid
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+	lock = FileSystem.FileLock("Concurrency_FileLock_probe benchmark")
+	probes = (
+		("acquire and release", lambda: acquireReleaseProbe(lock)),
+		("getSlotsTakenByAnyone", lock.getSlotsTakenByAnyone),
+	)
+	rows = []
+	for state in ("free", "held by another process"):
+		pid = holdInChild(lock) if state != "free" else None
+		for name, probe in probes:
+			seconds = _util.timeIt(lambda: [probe() for _ in xrange(count)])
+			rows.append((state, name, "%.2f" % (seconds / count * 1e6)))
+		if pid != None:
+			os.kill(pid, 9)
+			os.waitpid(pid, 0)
+	_util.printTable(("lock", "check", "microseconds per check"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,117 @@
+"""
+Measures the handoff latency of a timed `acquire`: the time from when the holder of a lock releases it until a waiter,
+which is blocked in `acquire(timeout=...)`, has it. The waiter is another thread for `Threading.Lock`, and another
+process for `FileSystem.FileLock`.
+
+"sleep-polling" is how `acquire` used to wait, trying every `min(0.1, timeout / 10)` seconds. "backoff polling" is the
+fallback that implementations without a native timed wait use now, and "acquire" is the implementation's own timed wait.
+
+	PYTHONPATH=src python benchmark/Concurrency_handoff.py [handoffs]
+"""
+from Lang.Concurrency import Threading, FileSystem
+
+import _util
+
+import fcntl
+import os
+import sys
+import threading
+import time
+
+TIMEOUT = 10
+HOLD_TIME = 0.03
+
+def sleepPolling(lockSem, timeout):
+	"""The old loop of `LockSemaphore.acquire`"""
+	sleepTime = min(0.1, timeout / 10.0)
+	elapsedTime = 0
+	while True:
+		currentTimeStart = time.clock()
+		if lockSem._acquire(shouldBlock=False):
+			return True
+		time.sleep(sleepTime)
+		elapsedTime += time.clock() - currentTimeStart
+		if elapsedTime >= timeout:
+			return False
+
+class ThreadHolder(object):
+	def __init__(self, lock):
+		self._lock = lock
+	def hold(self):
+		"""Takes the lock in another thread, and releases it after `HOLD_TIME`"""
+		held = threading.Event()
+		self._releaseTime = None
+		def run():
+			self._lock._acquire(shouldBlock=True)
+			held.set()
+			time.sleep(HOLD_TIME)
+			self._releaseTime = time.time()
+			self._lock._release()
+		self._thread = threading.Thread(target=run)
+		self._thread.start()
+		held.wait()
+	def releaseTime(self):
+		self._thread.join()
+		return self._releaseTime
+
+class ProcessHolder(object):
+	def __init__(self, lock):
+		self._path = lock.getLockFilePath()
+	def hold(self):
+		"""Takes the lock in a child process, and releases it after `HOLD_TIME`"""
+		readEnd, writeEnd = os.pipe()
+		self._pid = os.fork()
+		if self._pid == 0:
+			try:
+				file_ = open(self._path, "w")
+				fcntl.lockf(file_.fileno(), fcntl.LOCK_EX)
+				os.write(writeEnd, b"x")
+				time.sleep(HOLD_TIME)
+				releaseTime = repr(time.time())
+				file_.close()
+				os.write(writeEnd, releaseTime.encode())
+			finally:
+				os._exit(0)
+		os.close(writeEnd)
+		os.read(readEnd, 1)
+		self._readEnd = readEnd
+	def releaseTime(self):
+		os.waitpid(self._pid, 0)
+		releaseTime = float(os.read(self._readEnd, 64))
+		os.close(self._readEnd)
+		return releaseTime
+
+def handoffs(lock, holder, acquire, count):
+	"""@return list:	The latency of each handoff, in seconds"""
+	latencies = []
+	for _ in xrange(count):
+		holder.hold()
+		if not acquire(lock, TIMEOUT):
+			raise Exception("timed out")
+		acquireTime = time.time()
+		latencies.append(acquireTime - holder.releaseTime())
+		lock._release()
+	return latencies
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+	threadLock = Threading.Lock()
+	fileLock = FileSystem.FileLock("Concurrency_handoff benchmark")
+	cases = (
+		("Threading.Lock", threadLock, ThreadHolder(threadLock)),
+		("FileSystem.FileLock", fileLock, ProcessHolder(fileLock)),
+	)
+	methods = (
+		("sleep-polling", sleepPolling),
+		("backoff polling", lambda lock, timeout: lock._acquireByPolling(timeout)),
+		("acquire", lambda lock, timeout: lock._acquireWithTimeout(timeout)),
+	)
+	rows = []
+	for name, lock, holder in cases:
+		for methodName, acquire in methods:
+			latencies = sorted(handoffs(lock, holder, acquire, count))
+			rows.append((name, methodName, "%.3f" % (latencies[len(latencies) // 2] * 1000), "%.3f" % (latencies[-1] * 1000)))
+	_util.printTable(("lock", "wait", "median ms", "max ms"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,72 @@
+"""
+Measures wall time and peak memory of the `Lang.Diff.SequenceMatcher` APIs with each algorithm, compared with plain
+`difflib.SequenceMatcher`, on the synthetic workloads in `workloads.py`.
+
+	PYTHONPATH=src python benchmark/Diff.py
+	PYTHONPATH=src python benchmark/Diff.py --sizes 1000000 --workloads randomEdits --engines myers,difflib
+"""
+from Lang.Diff import SequenceMatcher, ALGORITHMS
+
+import _util
+from workloads import WORKLOADS
+
+import argparse
+import difflib
+
+def _consume(iterable):
+	for _ in iterable:
+		pass
+
+def _consumeElems(iterable):
+	for match in iterable:
+		for side in (match.a, match.b):
+			if side != None:
+				_consume(side)
+
+# API name --> function which runs it on a new matcher
+APIS = {
+	"get_matching_blocks":				lambda diff: _consume(diff.get_matching_blocks()),
+	"get_mismatching_blocks":			lambda diff: _consume(diff.get_mismatching_blocks()),
+	"get_matching_elems_useOnce":		lambda diff: _consumeElems(diff.get_matching_elems_useOnce()),
+	"get_mismatching_elems_useOnce":	lambda diff: _consumeElems(diff.get_mismatching_elems_useOnce()),
+	"ratio":							lambda diff: diff.ratio(),
+}
+# the closest plain `difflib` equivalent of each API
+DIFFLIB_APIS = {
+	"get_matching_blocks":				lambda diff: diff.get_matching_blocks(),
+	"get_mismatching_blocks":			lambda diff: diff.get_opcodes(),
+	"get_matching_elems_useOnce":		lambda diff: [diff.a[i:i+size] for i, _, size in diff.get_matching_blocks()],
+	"get_mismatching_elems_useOnce":	lambda diff: [diff.a[i1:i2] for tag, i1, i2, _, _ in diff.get_opcodes() if tag != "equal"],
+	"ratio":							lambda diff: diff.ratio(),
+}
+
+def run(workloadName, size, engine, apiName, seed=0):
+	a, b = WORKLOADS[workloadName](size, seed)
+	if engine == "difflib":
+		func = lambda: DIFFLIB_APIS[apiName](difflib.SequenceMatcher(None, a, b))
+	else:
+		func = lambda: APIS[apiName](SequenceMatcher(a, b, algorithm=engine))
+	return _util.measure(func)
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated. Sizes up to 1000000 are supported, but difflib can take minutes on them.")
+	parser.add_argument("--workloads", default=",".join(sorted(WORKLOADS)))
+	parser.add_argument("--engines", default=",".join(sorted(ALGORITHMS) + ["difflib"]))
+	parser.add_argument("--apis", default=",".join(sorted(APIS)))
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args()
+	
+	rows = []
+	for workloadName in args.workloads.split(","):
+		for size in [int(size) for size in args.sizes.split(",")]:
+			for apiName in args.apis.split(","):
+				for engine in args.engines.split(","):
+					seconds, peakKB = run(workloadName, size, engine, apiName, args.seed)
+					rows.append((workloadName, size, apiName, engine, "%.4f" % seconds, peakKB))
+					print("\t".join(str(value) for value in rows[-1]))
+	print("")
+	_util.printTable(("workload", "size", "api", "engine", "seconds", "peak KB"), rows)
+
+if __name__ == "__main__":
+	main()
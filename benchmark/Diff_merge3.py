@@ -0,0 +1,50 @@
+"""
+Compares `Lang.Diff.merge3` with diffing `ours` and `theirs` against `base` in 2 independent `SequenceMatcher` instances.
+
+Run from the root of the repository:
+
+	PYTHONPATH=src python benchmark/Diff_merge3.py [size] [algorithm]
+"""
+from Lang.Diff import SequenceMatcher, merge3
+
+import _util
+
+import random
+import sys
+
+def makeInputs(size, editCount, seed=0):
+	"""@return tuple:	`(base, ours, theirs)` lists of lines, where each side has `editCount` random line edits"""
+	rand = random.Random(seed)
+	base = ["line %d %d\n" % (i, rand.randint(0, 1 << 30)) for i in xrange(size)]
+	sides = []
+	for side in ("ours", "theirs"):
+		lines = list(base)
+		for _ in xrange(editCount):
+			index = rand.randrange(len(lines))
+			action = rand.randint(0, 2)
+			if action == 0:
+				del lines[index]
+			elif action == 1:
+				lines.insert(index, "%s %d\n" % (side, rand.randint(0, 1 << 30)))
+			else:
+				lines[index] = "%s %d\n" % (side, rand.randint(0, 1 << 30))
+		sides.append(lines)
+	return base, sides[0], sides[1]
+
+def twoDiffs(base, ours, theirs, algorithm):
+	oursBlocks = list(SequenceMatcher(base, ours, algorithm=algorithm).get_mismatching_blocks())
+	theirsBlocks = list(SequenceMatcher(base, theirs, algorithm=algorithm).get_mismatching_blocks())
+	return oursBlocks, theirsBlocks
+
+def main():
+	size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	algorithm = sys.argv[2] if len(sys.argv) > 2 else "myers"
+	base, ours, theirs = makeInputs(size, editCount=max(1, size // 1000))
+	print("%d elements, algorithm=%s" % (size, algorithm))
+	print("2 independent diffs:	%.3fs" % _util.timeIt(lambda: twoDiffs(base, ours, theirs, algorithm)))
+	print("merge3:				%.3fs" % _util.timeIt(lambda: merge3(base, ours, theirs, algorithm=algorithm)))
+	hunks = merge3(base, ours, theirs, algorithm=algorithm)
+	print("%d hunks, %d conflicts" % (len(hunks), sum(1 for hunk in hunks if hunk.isConflict)))
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,72 @@
+"""
+Measures the throughput of `ConcurrentOrderedSet` when several threads change it and iterate over it at once, compared
+to guarding an `OrderedSet` with a lock around every change and every iteration.
+
+	PYTHONPATH=src python benchmark/Struct_ConcurrentOrderedSet.py [threads] [readsPerWrite]
+"""
+from Lang.Struct import OrderedSet, ConcurrentOrderedSet
+
+import _util
+
+import sys
+import threading
+
+SIZE = 1000
+OPERATIONS = 20000		# per thread
+
+class LockedOrderedSet(object):
+	"""The simple alternative: one lock held for every operation, including a whole iteration"""
+	def __init__(self, iterable):
+		self._set = OrderedSet(iterable)
+		self._lock = threading.Lock()
+	def add(self, elem):
+		with self._lock:
+			return self._set.add(elem)
+	def discard(self, elem):
+		with self._lock:
+			return self._set.discard(elem)
+	def __contains__(self, elem):
+		with self._lock:
+			return elem in self._set
+	def iterate(self):
+		with self._lock:
+			for elem in self._set:
+				pass
+
+class _Concurrent(ConcurrentOrderedSet):
+	def iterate(self):
+		for elem in self:
+			pass
+
+def work(set_, threadNum, readsPerWrite):
+	for i in xrange(OPERATIONS):
+		elem = (threadNum, i % SIZE)
+		if i % (readsPerWrite + 1) == 0:
+			set_.discard(elem)
+			set_.add(elem)
+		elif i % 100 == 1:
+			set_.iterate()
+		else:
+			elem in set_
+
+def run(cls, threadCount, readsPerWrite):
+	set_ = cls((threadNum, i) for threadNum in xrange(threadCount) for i in xrange(SIZE))
+	threads = [threading.Thread(target=work, args=(set_, threadNum, readsPerWrite)) for threadNum in xrange(threadCount)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+def main():
+	threadCounts = [int(sys.argv[1])] if len(sys.argv) > 1 else [1, 4, 16]
+	readsPerWrite = [int(sys.argv[2])] if len(sys.argv) > 2 else [0, 10, 100]
+	rows = []
+	for threadCount in threadCounts:
+		for reads in readsPerWrite:
+			for cls in (LockedOrderedSet, _Concurrent):
+				seconds = _util.timeIt(lambda: run(cls, threadCount, reads), repeat=1)
+				rows.append((cls.__name__.strip("_"), threadCount, reads, "%.3f" % seconds, "%.0f" % (threadCount * OPERATIONS / seconds)))
+	_util.printTable(("class", "threads", "reads per write", "seconds", "operations per second"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,45 @@
+"""
+Compares the ways of building a `FrozenDict` from a JSON-like document with many repeated sub-documents: eagerly, lazily
+(reading a few keys afterwards), and interned.
+
+	PYTHONPATH=src python benchmark/Struct_FrozenDict.py [records]
+"""
+from Lang.Struct import FrozenDict
+
+import _util
+
+import random
+import sys
+
+def makeDocument(records):
+	rand = random.Random(0)
+	owners = [{"name": "owner%d" % i, "address": {"city": "city%d" % (i % 5), "zip": str(10000 + i)}} for i in xrange(20)]
+	return {"records": [{
+		"id": i,
+		"owner": dict(rand.choice(owners)),
+		"tags": ["tag%d" % rand.randrange(10) for _ in xrange(3)],
+		"settings": {"retries": 3, "timeout": 30, "flags": {"a": True, "b": False}},
+	} for i in xrange(records)]}
+
+def readFew(frozenDict):
+	for record in frozenDict["records"][:10]:
+		record["owner"]["address"]["city"]
+
+def main():
+	records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+	document = makeDocument(records)
+	builds = (
+		("eager", lambda: FrozenDict(document)),
+		("lazy, read 10 records", lambda: readFew(FrozenDict.lazy(document))),
+		("lazy, read all", lambda: hash(FrozenDict.lazy(document))),
+		("interned", lambda: FrozenDict.interned(document)),
+	)
+	rows = []
+	for name, build in builds:
+		seconds, peakKB = _util.measure(lambda: _keep.append(build()))
+		rows.append((name, records, "%.3f" % seconds, peakKB))
+	_util.printTable(("construction", "records", "seconds", "peak KB"), rows)
+_keep = []		# so that the memory of each result is measured
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,42 @@
+"""
+Compares iterating over the ordered set classes in `Lang.Struct` with iterating over a `list`, and over the keys of an
+`OrderedDict`, which is also a linked list walked by a Python generator.
+
+	PYTHONPATH=src python benchmark/Struct_OrderedSet_iteration.py [size ...]
+"""
+from Lang.Struct import OrderedDict, OrderedSet, IndexedOrderedSet, CompactOrderedSet
+
+import _util
+
+import sys
+
+def build(name, size):
+	if name == "list":
+		return list(xrange(size))
+	if name == "OrderedDict":
+		return OrderedDict.fromkeys(xrange(size))
+	return globals()[name](xrange(size))
+
+def iterate(container):
+	for elem in container:
+		pass
+
+def iterateReversed(container):
+	for elem in reversed(container):
+		pass
+
+def main():
+	sizes = [int(size) for size in sys.argv[1:]] or [1000, 100000]
+	rows = []
+	for size in sizes:
+		for name in ("list", "OrderedDict", "OrderedSet", "IndexedOrderedSet", "CompactOrderedSet"):
+			container, other = build(name, size), build(name, size)
+			rows.append((name, size,
+				"%.2f" % (_util.timeIt(lambda: iterate(container)) * 1e9 / size),
+				"%.2f" % (_util.timeIt(lambda: iterateReversed(container)) * 1e9 / size),
+				"%.2f" % (_util.timeIt(lambda: container == other) * 1e9 / size),
+			))
+	_util.printTable(("class", "size", "iter ns/elem", "reversed ns/elem", "== ns/elem"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,31 @@
+"""
+Compares the memory used per element by the ordered set classes in `Lang.Struct`, and the time to build them.
+
+	PYTHONPATH=src python benchmark/Struct_OrderedSet_memory.py [size ...]
+"""
+from Lang.Struct import OrderedSet, IndexedOrderedSet, CompactOrderedSet
+
+import _util
+
+import sys
+
+CLASSES = (OrderedSet, IndexedOrderedSet, CompactOrderedSet)
+
+def build(cls, size):
+	set_ = cls(xrange(size))
+	for elem in xrange(0, size, 10):		# leave some holes, as in real use
+		set_.discard(elem)
+	return set_
+
+def main():
+	sizes = [int(size) for size in sys.argv[1:]] or [100000, 1000000]
+	rows = []
+	for size in sizes:
+		baselineSeconds, baselineKB = _util.measure(lambda: list(xrange(size)))		# the elements themselves
+		for cls in CLASSES:
+			seconds, peakKB = _util.measure(lambda: build(cls, size))
+			rows.append((cls.__name__, size, "%.3f" % seconds, peakKB, "%.0f" % (max(0, peakKB - baselineKB) * 1024.0 / size)))
+	_util.printTable(("class", "size", "build seconds", "peak KB", "bytes per element"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,36 @@
+"""
+Derives many changed versions of a large config, each differing from the base by a few keys, with `FrozenDict` (which
+copies every item) and with `PersistentFrozenDict` (which shares the unchanged parts of its trie).
+
+	PYTHONPATH=src python benchmark/Struct_PersistentFrozenDict.py [size] [versions] [changedKeys]
+"""
+from Lang.Struct import FrozenDict, PersistentFrozenDict
+
+import _util
+
+import random
+import sys
+
+def deriveFrozenDict(base, changesList):
+	return [FrozenDict(dict(base, **changes)) for changes in changesList]
+
+def derivePersistentFrozenDict(base, changesList):
+	return [base.update(changes) for changes in changesList]
+
+def main():
+	size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+	versions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+	changedKeys = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+	rand = random.Random(0)
+	items = dict(("key%d" % i, i) for i in xrange(size))
+	changesList = [dict(("key%d" % rand.randrange(size), -i) for _ in xrange(changedKeys)) for i in xrange(versions)]
+	rows = []
+	for cls, derive in ((FrozenDict, deriveFrozenDict), (PersistentFrozenDict, derivePersistentFrozenDict)):
+		base = cls(items)
+		seconds, peakKB = _util.measure(lambda: derive(base, changesList))
+		hashSeconds = _util.timeIt(lambda: [hash(version) for version in derive(base, changesList[:100])], repeat=1)
+		rows.append((cls.__name__, size, versions, "%.3f" % seconds, peakKB, "%.3f" % hashSeconds))
+	_util.printTable(("class", "size", "versions", "derive seconds", "peak KB", "derive and hash 100 seconds"), rows)
+
+if __name__ == "__main__":
+	main()
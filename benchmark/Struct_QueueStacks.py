@@ -0,0 +1,46 @@
+"""
+Compares the time of `push` followed by `pop` on the stacks and queues of `Lang.Struct.QueueStacks` with the same
+operations on a raw `list`, `collections.deque` and `heapq`.
+
+	PYTHONPATH=src python benchmark/Struct_QueueStacks.py [operations]
+"""
+from Lang.Struct import LIFOstack, FIFOqueue, PriorityQueue
+
+import _util
+
+from collections import deque
+import heapq
+import sys
+
+def pushPop(push, pop, peek, count):
+	for item in xrange(count):
+		push(item)
+		push(item)
+		peek()
+		pop()
+	for item in xrange(count):
+		pop()
+
+def main():
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+	list_ = []
+	deque_ = deque()
+	heap = []
+	stack, ringStack, queue, priorityQueue = LIFOstack(), LIFOstack(capacity=2 * count), FIFOqueue(), PriorityQueue()
+	cases = (
+		("list", lambda: pushPop(list_.append, list_.pop, lambda: list_[-1], count)),
+		("LIFOstack", lambda: pushPop(stack.push, stack.pop, stack.peek, count)),
+		("LIFOstack(capacity)", lambda: pushPop(ringStack.push, ringStack.pop, ringStack.peek, count)),
+		("deque", lambda: pushPop(deque_.append, deque_.popleft, lambda: deque_[0], count)),
+		("FIFOqueue", lambda: pushPop(queue.push, queue.pop, queue.peek, count)),
+		("heapq", lambda: pushPop(lambda item: heapq.heappush(heap, item), lambda: heapq.heappop(heap), lambda: heap[0], count)),
+		("PriorityQueue", lambda: pushPop(priorityQueue.push, priorityQueue.pop, priorityQueue.peek, count)),
+	)
+	rows = []
+	for name, case in cases:
+		seconds = _util.timeIt(case)
+		rows.append((name, count, "%.3f" % seconds, "%.0f" % (seconds * 1e9 / (4 * count))))
+	_util.printTable(("structure", "push/pop pairs", "seconds", "ns per operation"), rows)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,40 @@
+"""
+Helpers shared by the benchmarks. Every benchmark is a script which is run from the root of the repository:
+
+	PYTHONPATH=src python benchmark/<name>.py
+"""
+from Lang.Concurrency.Multiprocessing.decorators import processify
+
+import resource
+import time
+
+def timeIt(func, repeat=3):
+	"""@return float:	The fastest wall time of `repeat` calls of `func`, in seconds"""
+	best = None
+	for _ in xrange(repeat):
+		start = time.time()
+		func()
+		elapsed = time.time() - start
+		best = elapsed if best == None else min(best, elapsed)
+	return best
+
+def _measureInProcess(func):
+	before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	start = time.time()
+	func()
+	elapsed = time.time() - start
+	return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+_measureInChild = processify(_measureInProcess)
+
+def measure(func):
+	"""
+	Calls `func` once in a forked child process, so that its memory use doesn't affect other measurements.
+	
+	@return tuple:	`(seconds, peakKB)`, where `peakKB` is how much the peak resident memory of the child grew while `func` ran
+	"""
+	return _measureInChild(func)
+
+def printTable(headers, rows):
+	widths = [max(len(str(row[col])) for row in [headers] + rows) for col in xrange(len(headers))]
+	for row in [headers] + rows:
+		print("  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
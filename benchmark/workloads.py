@@ -0,0 +1,70 @@
+"""
+Reproducible inputs for the Diff benchmarks. Every generator takes a `size` and a `seed`, and returns an `(a, b)` pair of
+lists of lines, where `a` has `size` lines. The same arguments always return the same pair.
+"""
+import random
+
+def _line(rand, prefix="line"):
+	return "%s %d\n" % (prefix, rand.randint(0, 1 << 30))
+
+def randomEdits(size, seed=0, editRate=0.01):
+	"""Unique lines, with about `size * editRate` random lines deleted, inserted or replaced"""
+	rand = random.Random(seed)
+	a = [_line(rand) for _ in xrange(size)]
+	b = list(a)
+	for _ in xrange(max(1, int(size * editRate))):
+		index = rand.randrange(len(b))
+		action = rand.randint(0, 2)
+		if action == 0:
+			del b[index]
+		elif action == 1:
+			b.insert(index, _line(rand, "inserted"))
+		else:
+			b[index] = _line(rand, "replaced")
+	return a, b
+
+def blockMoves(size, seed=0, moveCount=10):
+	"""Unique lines, with `moveCount` blocks of about 1% of the lines each moved somewhere else"""
+	rand = random.Random(seed)
+	a = [_line(rand) for _ in xrange(size)]
+	b = list(a)
+	blockSize = max(1, size // 100)
+	for _ in xrange(moveCount):
+		start = rand.randrange(max(1, len(b) - blockSize))
+		block = b[start:start + blockSize]
+		del b[start:start + blockSize]
+		destination = rand.randrange(len(b) + 1)
+		b[destination:destination] = block
+	return a, b
+
+def nearIdenticalLogs(size, seed=0):
+	"""Log files where the same messages repeat often, and only about 0.1% of the lines differ"""
+	rand = random.Random(seed)
+	messages = ["INFO request handled in %d ms\n", "DEBUG cache hit for key %d\n", "WARN retrying connection %d\n", "INFO user %d logged in\n"]
+	a = ["2014-01-01 00:%02d:%02d " % divmod(i % 3600, 60) + rand.choice(messages) % rand.randint(0, 100) for i in xrange(size)]
+	b = list(a)
+	for _ in xrange(max(1, size // 1000)):
+		index = rand.randrange(size)
+		b[index] = b[index][:20] + "ERROR something failed\n"
+	return a, b
+
+def heavyJunk(size, seed=0, junkRate=0.5):
+	"""
+	About `junkRate` of the lines are from a handful of very common lines, such as blank lines and braces, which
+	`difflib` treats as junk with `autojunk`. The other lines are unique, with about 1% of them edited.
+	"""
+	rand = random.Random(seed)
+	junk = ["\n", "{\n", "}\n", "\t}\n", "\treturn;\n"]
+	a = [rand.choice(junk) if rand.random() < junkRate else _line(rand) for _ in xrange(size)]
+	b = list(a)
+	for _ in xrange(max(1, size // 100)):
+		index = rand.randrange(len(b))
+		b[index] = rand.choice(junk) if rand.random() < junkRate else _line(rand, "edited")
+	return a, b
+
+WORKLOADS = {
+	"randomEdits":			randomEdits,
+	"blockMoves":			blockMoves,
+	"nearIdenticalLogs":	nearIdenticalLogs,
+	"heavyJunk":			heavyJunk,
+}
@@ -1,10 +1,22 @@
-from Lang.Struct import OrderedSet
+from Lang.Struct import OrderedSet, ConcurrentOrderedSet
+from collections import deque
 import weakref
 
+class _InstanceRef(weakref.ref):
+	"""Hashed by identity, so that instances which are not hashable can be registered too"""
+	__slots__ = ()
+	__hash__ = object.__hash__
+	def __eq__(self, other):
+		return self is other
+	def __ne__(self, other):
+		return self is not other
+
 class RegisteredInstances(object):
 	"""
 	Maintains a record of every created instance of a class. Don't forget to call `super(...).__init__(...)`.
 	
+	Instances can be created, garbage collected and listed by many threads at the same time.
+	
 	http://stackoverflow.com/questions/5189232/how-to-auto-register-a-class-when-its-defined/5189271
 	
 	Examples:
@@ -12,15 +24,28 @@ class RegisteredInstances(object):
 	https://github.com/ask/celery/blob/6b91c7e0f2d9d1c1f16899161977ae0c2662f9fd/celery/registry.py
 	"""
 	
-	_allInstances_weakrefs = []
+	_allInstances_weakrefs = ConcurrentOrderedSet()
+	_deadInstances_weakrefs = deque()
 	
 	def __init__(self):
 		if self not in reversed(self.getAllInstances()):
-			self._allInstances_weakrefs.append(weakref.ref(self, self.__removeInstance))
+			self._allInstances_weakrefs.add(_InstanceRef(self, self.__removeInstance))
 	
 	@classmethod
 	def __removeInstance(cls, instance_weakref):
-		cls._allInstances_weakrefs.remove(instance_weakref)
+		"""
+		Garbage collection can run this in the middle of a change of `_allInstances_weakrefs` by the same thread, so the
+		weakref is only queued here, and removed by the next `__removeDeadInstances`.
+		"""
+		cls._deadInstances_weakrefs.append(instance_weakref)
+	@classmethod
+	def __removeDeadInstances(cls):
+		while len(cls._deadInstances_weakrefs) != 0:
+			try:
+				instance_weakref = cls._deadInstances_weakrefs.popleft()
+			except IndexError:		# taken by another thread
+				break
+			cls._allInstances_weakrefs.discard(instance_weakref)
 	
 	@classmethod
 	def getAllClasses(cls):
@@ -31,4 +56,6 @@ class RegisteredInstances(object):
 	
 	@classmethod
 	def __filter_sameClassAsSelf(cls):
-		return (instance_weakref() for instance_weakref in cls._allInstances_weakrefs if isinstance(instance_weakref(), cls))
+		cls.__removeDeadInstances()
+		instances = (instance_weakref() for instance_weakref in cls._allInstances_weakrefs)
+		return (instance for instance in instances if isinstance(instance, cls))		# dead ones are `None`
@@ -1,8 +1,11 @@
 from Lang.Concurrency import abstract
 from Lang.ClassTools.Patterns import Multiton_OneEquivalentInstance_OnDupReturnExisting
+import _flock
 
 import fcntl
 import errno
+import signal
+import threading
 import tempfile
 from urllib import quote
 from zlib import crc32
@@ -13,7 +16,62 @@ class ForkException(Exception):
 	def __init__(self, *args, **kwargs):
 		Exception.__init__(self, "ERROR: This FCNTL lock was duplicated during a process fork, but the lock did not (and can not) carry over. The lock must be released before the fork, and acquired after the fork.")
 
-class FileLock_ByFCNTL(abstract.Lock, Multiton_OneEquivalentInstance_OnDupReturnExisting):
+class _ForkSafe(object):
+	"""
+	For locks which the kernel doesn't carry over to a forked process. The public methods call `_checkForkSafety` first,
+	which raises `ForkException` if the instance was copied into a forked process while it had the lock. The check
+	compares the pid, which costs a system call; Python 2 has no fork hooks (`os.register_at_fork` is Python 3.7+).
+	"""
+	def _initForkSafety(self):
+		self._pid = os.getpid()
+	
+	def _checkForkSafety(self):
+		pid = os.getpid()
+		if self._pid != pid:
+			if self._slotsAcquiredBySelf > 0:
+				raise ForkException()
+			self._pid = pid
+	
+	def acquire(self, *args, **kwargs):
+		self._checkForkSafety()
+		return super(_ForkSafe, self).acquire(*args, **kwargs)
+	def release(self, *args, **kwargs):
+		self._checkForkSafety()
+		return super(_ForkSafe, self).release(*args, **kwargs)
+	def getSlotsTakenBySelf(self):
+		self._checkForkSafety()
+		return super(_ForkSafe, self).getSlotsTakenBySelf()
+
+class _AlarmTimeout(Exception):
+	pass
+
+def _onAlarm(signum, frame):
+	raise _AlarmTimeout()
+
+def _canUseAlarm():
+	"""
+	@return bool:	`True` if a `SIGALRM` can interrupt a blocking call in this thread. Only the main thread receives signals,
+					and the timer must not already be in use by the program, such as by `signal.alarm`.
+	"""
+	return hasattr(signal, "setitimer") and isinstance(threading.current_thread(), threading._MainThread) and \
+		signal.getitimer(signal.ITIMER_REAL)[0] == 0
+
+def _makeFilePath(lockFolder, lockName, extension):
+	"""@return str:	The path of the file to lock on, which is unique for each `lockName`"""
+	fileName = str(crc32(lockName)) + "=" + quote(lockName, safe="_-+=^%$#@!.,/:;'\"|[]{}()") + extension
+	return os.path.join(lockFolder, fileName)
+
+def _lockNonBlocking(fileno, length=0, start=0):
+	"""@return bool:	`False` if another process has a lock on any of the bytes (by default, the whole file)"""
+	try:
+		fcntl.lockf(fileno, fcntl.LOCK_EX | fcntl.LOCK_NB, length, start)
+	except IOError as err:
+		if err.errno in (errno.EACCES, errno.EAGAIN):
+			return False
+		raise err
+	return True
+
+class FileLock_ByFCNTL(_ForkSafe, abstract.Lock, Multiton_OneEquivalentInstance_OnDupReturnExisting):
 	"""
 	A lock for multiple processes. Only one process is allowed to have the lock at a single time.
 	
@@ -28,17 +86,25 @@ class FileLock_ByFCNTL(abstract.Lock, Multiton_OneEquivalentInstance_OnDupReturn
 	This is implemented by using `lockf` in python, which corresponds to `fcntl` in C:
 	* http://docs.python.org/2/library/fcntl.html#fcntl.lockf
 	* http://oilq.org/fr/node/13344
+	
+	By default, the lock file is opened again for each acquire and removed on release. With `persistent=True`, it's
+	opened once and never removed, which avoids creating and removing files under contention, and the race where two
+	processes each lock a different file for the same name (one which was just removed, and the new one). Where the
+	kernel supports open file description locks (@see `_flock.hasOFDLocks`), each thread opens the file separately, so
+	threads of the same process exclude each other too. Every process must use the same mode for the same `lockName`.
 	"""
-	def __init__(self, lockName, lockFolder=tempfile.gettempdir(), *args, **kwargs):
+	def __init__(self, lockName, lockFolder=tempfile.gettempdir(), persistent=False, *args, **kwargs):
 		super(FileLock_ByFCNTL, self).__init__(*args, **kwargs)
 		self.lockName = lockName
 		self.lockFolder = str(lockFolder)
+		self.persistent = persistent
 		
-		self._pid = os.getpid()
-		self._in_checkForkSafety = False
-		_fileName = str(crc32(self.lockName)) + "=" + quote(self.lockName, safe="_-+=^%$#@!.,/:;'\"|[]{}()") + ".lock"
-		self._filePath = os.path.join(self.lockFolder, _fileName)
-		self._file = None
+		self._initForkSafety()
+		self._filePath = _makeFilePath(self.lockFolder, self.lockName, ".lock")
+		self._file = None				# the file the lock is held through
+		self._probe = (None, None)		# (file opened by `_getProbeFile`, (device, inode) of that file)
+		self._threadFiles = threading.local()		# `persistent` files, @see `_getPersistentFile`
+		self._processFile = None
 	
 	def __str__(self):
 		if self.getSlotsTakenBySelf() == 0:
@@ -47,21 +113,9 @@ class FileLock_ByFCNTL(abstract.Lock, Multiton_OneEquivalentInstance_OnDupReturn
 			return super(FileLock_ByFCNTL, self).__str__() + ", file=" + str(self._file)
 	
 	def __eq__(self, other):
-		self._checkForkSafety()		# because __getattribute__ is not called when special methods are called in new style classes
-		return isinstance(other, self.__class__) and self.lockName == other.lockName and self.lockFolder == other.lockFolder and self._pid == other._pid
-	
-	def __getattribute__(self, name):
-		if name != "_in_checkForkSafety" and not self._in_checkForkSafety:
-			self._in_checkForkSafety = True
-			self._checkForkSafety()
-			self._in_checkForkSafety = False
-		return super(FileLock_ByFCNTL, self).__getattribute__(name)
-	
-	def _checkForkSafety(self):
-		if self._pid != os.getpid():
-			if self.getSlotsTakenBySelf() > 0:
-				raise ForkException()
-			self._pid = os.getpid()
+		self._checkForkSafety()
+		return isinstance(other, self.__class__) and self.lockName == other.lockName and self.lockFolder == other.lockFolder and self._pid == other._pid and \
+			self.persistent == other.persistent
 	
 	def _acquire(self, shouldBlock):
 		"""
@@ -72,37 +126,125 @@ class FileLock_ByFCNTL(abstract.Lock, Multiton_OneEquivalentInstance_OnDupReturn
 		http://www.gossamer-threads.com/lists/python/python/658463?do=post_view_threaded
 		"""
 		# FCNTL locks are not carried over when a process is forked, but there was no lock during the fork, so this is ok - just update the pid
-		self._file = open(self._filePath, "w")
-		if shouldBlock:
-			fcntl.lockf(self._file.fileno(), fcntl.LOCK_EX)
-		else:
+		file_ = self._openLockFile()
+		if not self._lockFile(file_, shouldBlock):
+			return False
+		self._file = file_
+		return True
+	
+	def _acquireWithTimeout(self, timeout):
+		"""
+		Waits in a blocking lock call, which is interrupted by a `SIGALRM` when `timeout` is over, so that the lock is taken
+		as soon as the other process releases it. Where the alarm can't be used (@see `_canUseAlarm`), this polls instead.
+		"""
+		if not _canUseAlarm():
+			return super(FileLock_ByFCNTL, self)._acquireWithTimeout(timeout)
+		file_ = self._openLockFile()
+		oldHandler = signal.signal(signal.SIGALRM, _onAlarm)
+		try:
 			try:
-				fcntl.lockf(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-			except IOError as err:
-				if err.errno in (errno.EACCES, errno.EAGAIN):
-					return False
-				raise err
+				signal.setitimer(signal.ITIMER_REAL, timeout)
+				self._lockFile(file_, shouldBlock=True)
+			finally:
+				signal.setitimer(signal.ITIMER_REAL, 0)
+		except _AlarmTimeout:
+			# the alarm may have gone off just after the lock was taken, so check whether it's held
+			# (taking it again through the same file succeeds)
+			if not self._lockFile(file_, shouldBlock=False):
+				return False
+		finally:
+			signal.signal(signal.SIGALRM, oldHandler)
+		self._file = file_
 		return True
 	
+	def _openLockFile(self):
+		"""@return file:	The lock file, opened for writing, to take the lock through"""
+		if self.persistent:
+			return self._getPersistentFile()
+		return open(self._filePath, "w")
+	
+	def _getPersistentFile(self):
+		"""
+		@return file:	The lock file, opened for appending (so it isn't truncated), once per thread when open file description
+						locks are used, and once per process otherwise. A process can't share the other's files after a fork.
+		"""
+		pid = os.getpid()
+		ofd = _flock.hasOFDLocks()
+		pidAndFile = getattr(self._threadFiles, "pidAndFile", None) if ofd else self._processFile
+		if pidAndFile != None and pidAndFile[0] == pid:
+			return pidAndFile[1]
+		pidAndFile = (pid, open(self._filePath, "a"))
+		if ofd:
+			self._threadFiles.pidAndFile = pidAndFile
+		else:
+			self._processFile = pidAndFile
+		return pidAndFile[1]
+	
+	def _lockFile(self, file_, shouldBlock):
+		"""@return bool:	`False` if `shouldBlock` is `False` and someone else has the lock"""
+		if self.persistent:
+			return _flock.setLock(file_.fileno(), fcntl.F_WRLCK, shouldBlock, ofd=_flock.hasOFDLocks())
+		if shouldBlock:
+			fcntl.lockf(file_.fileno(), fcntl.LOCK_EX)
+			return True
+		return _lockNonBlocking(file_.fileno())
+	
 	def getLockFilePath(self):
 		return self._filePath
 	
 	def getSlotsTakenByAnyone(self):
-		if self.getSlotsTakenBySelf() == 1:		# bypasses filesystem, since the same process (this one) may be able to double acquire a lock since the OS kernel knows its the same process
+		if self.getSlotsTakenBySelf() == 1:		# checks fork safety too. Bypasses the filesystem, since the kernel would let this process take its own lock again.
 			return 1
-		# if not taken by self, then self._file doesn't exist
-		if self._acquire(shouldBlock=False) == True:
-			self._release()
+		if self.persistent:
+			ofd = _flock.hasOFDLocks()
+			return 0 if _flock.getLockHolder(self._getPersistentFile().fileno(), ofd=ofd) == None else 1
+		probeFile = self._getProbeFile()
+		if probeFile == None:		# the file is removed on release, so nobody has the lock
 			return 0
-		return 1
+		return 0 if _flock.getLockHolder(probeFile.fileno()) == None else 1
+	
+	def _getProbeFile(self):
+		"""
+		Only reads are done through this file, so checking the lock doesn't change the filesystem or take the lock from
+		anyone. It's kept open between checks, and opened again if the lock file was replaced (`_release` removes it).
+		This process must not have the lock when this is called, because closing the old file would release it.
+		
+		@return file:	The lock file, opened for reading, or `None` if it doesn't exist
+		"""
+		filePath = self._filePath
+		try:
+			pathStat = os.stat(filePath)
+		except OSError as err:
+			if err.errno != errno.ENOENT:
+				raise err
+			return None
+		probeFile, probeFileId = self._probe
+		if probeFile != None:
+			if probeFileId == (pathStat.st_dev, pathStat.st_ino):
+				return probeFile
+			probeFile.close()
+			self._probe = (None, None)
+		try:
+			probeFile = open(filePath, "r")
+		except IOError as err:
+			if err.errno != errno.ENOENT:
+				raise err
+			return None
+		fileStat = os.fstat(probeFile.fileno())
+		self._probe = (probeFile, (fileStat.st_dev, fileStat.st_ino))
+		return probeFile
 	
 	def _release(self):
 		"""
 		http://docs.python.org/2/library/threading.html#threading.Lock.release
 		"""
+		file_ = self._file
+		self._file = None		# before unlocking, since another thread may take the lock as soon as it's unlocked
+		if self.persistent:
+			_flock.setLock(file_.fileno(), fcntl.F_UNLCK, shouldBlock=False, ofd=_flock.hasOFDLocks())
+			return
 		# fcntl.lockf(self._file, fcntl.LOCK_UN)		# this is not actually needed because the file will be unlocked when it's closed
 		os.remove(self._filePath)
-		self._file.close()
-		self._file = None
+		file_.close()
 
 FileLock = FileLock_ByFCNTL
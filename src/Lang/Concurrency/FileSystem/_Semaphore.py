@@ -0,0 +1,78 @@
+from Lang.Concurrency import abstract
+from Lang.ClassTools.Patterns import Multiton_OneEquivalentInstance_OnDupReturnExisting
+from _Lock import _ForkSafe, _makeFilePath, _lockNonBlocking
+import _flock
+
+import fcntl
+import tempfile
+import threading
+import os
+
+class Semaphore_ByFCNTL(_ForkSafe, abstract.Semaphore, Multiton_OneEquivalentInstance_OnDupReturnExisting):
+	"""
+	A semaphore for multiple processes, which allows up to `maxSlots` processes (or slots taken by the same process) at a
+	single time.
+	
+	Each slot is one byte of the lock file, which is locked with `lockf` while the slot is taken. So like `FileLock_ByFCNTL`,
+	slots are released by the kernel if a process quits without releasing them, and they are not carried over when a
+	process is forked. `getSlotsTakenByAnyone` asks the kernel who holds each byte (`F_GETLK`), without taking anything.
+	
+	The kernel can only wait for one byte at a time, not for whichever slot is released first, so a blocking or timed
+	`acquire` tries every slot again at intervals (@see `LockSemaphore._acquireByPolling`).
+	
+	All processes must use the same `maxSlots` for the same `lockName`. The lock file is not removed when the semaphore is
+	released, because other processes may have it open.
+	"""
+	def __init__(self, lockName, maxSlots, lockFolder=tempfile.gettempdir(), *args, **kwargs):
+		super(Semaphore_ByFCNTL, self).__init__(maxSlots, *args, **kwargs)
+		self.lockName = lockName
+		self.lockFolder = str(lockFolder)
+		
+		self._initForkSafety()
+		self._filePath = _makeFilePath(self.lockFolder, self.lockName, ".sem")
+		self._file = None			# opened when first needed, and kept open: closing any descriptor of the file releases all its locks
+		self._slots = []			# slots taken by this process, in the order they were taken
+		self._threadLock = threading.Lock()
+	
+	def __eq__(self, other):
+		return isinstance(other, self.__class__) and self.lockName == other.lockName and self.lockFolder == other.lockFolder and \
+			self._maxSlots == other._maxSlots
+	
+	def _getFileno(self):
+		if self._file == None:
+			self._file = open(self._filePath, "a")
+		return self._file.fileno()
+	
+	def getLockFilePath(self):
+		return self._filePath
+	
+	def getMaxSlots(self):
+		return self._maxSlots
+	
+	def getSlotsTakenByAnyone(self):
+		self._checkForkSafety()
+		with self._threadLock:
+			fileno = self._getFileno()
+			return sum(1 for slot in xrange(self._maxSlots) if slot in self._slots or _flock.getLockHolder(fileno, slot, 1) != None)
+	
+	def _acquire(self, shouldBlock):
+		"""
+		Tries the free slots starting from a different one in each process, so that processes don't all compete for the
+		first slot.
+		"""
+		if shouldBlock:
+			return self._acquireByPolling(float("inf"))
+		with self._threadLock:
+			fileno = self._getFileno()
+			for i in xrange(self._maxSlots):
+				slot = (self._pid + i) % self._maxSlots
+				if slot not in self._slots and _lockNonBlocking(fileno, 1, slot):
+					self._slots.append(slot)
+					return True
+		return False
+	
+	def _release(self):
+		with self._threadLock:
+			fcntl.lockf(self._file.fileno(), fcntl.LOCK_UN, 1, self._slots.pop())
+
+Semaphore = Semaphore_ByFCNTL
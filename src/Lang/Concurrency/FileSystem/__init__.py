@@ -1 +1,2 @@
 from _Lock import *
+from _Semaphore import *
@@ -0,0 +1,94 @@
+"""
+`fcntl` record locking with a `struct flock`, for what `fcntl.lockf` can't do, such as asking who holds a lock.
+"""
+import fcntl
+import errno
+import os
+import struct
+import sys
+import tempfile
+
+# The fields of `struct flock` are in a different order on the BSDs (including OS X) than on Linux. `off_t` is 64 bits on
+# both, for 64-bit builds and builds with large file support.
+if sys.platform.startswith(("darwin", "freebsd", "openbsd", "netbsd", "dragonfly")):
+	_FORMAT = "qqihh"		# l_start, l_len, l_pid, l_type, l_whence
+	def pack(type_, start=0, length=0, whence=os.SEEK_SET, pid=0):
+		"""@return str:	A `struct flock` for `fcntl.fcntl`. A `length` of `0` means up to the end of the file, however long."""
+		return struct.pack(_FORMAT, start, length, pid, type_, whence)
+	def unpack(data):
+		"""@return tuple:	`(type_, start, length, whence, pid)` of a `struct flock`"""
+		start, length, pid, type_, whence = struct.unpack(_FORMAT, data[:struct.calcsize(_FORMAT)])
+		return type_, start, length, whence, pid
+else:
+	_FORMAT = "hhqqi"		# l_type, l_whence, l_start, l_len, l_pid
+	def pack(type_, start=0, length=0, whence=os.SEEK_SET, pid=0):
+		"""@return str:	A `struct flock` for `fcntl.fcntl`. A `length` of `0` means up to the end of the file, however long."""
+		return struct.pack(_FORMAT, type_, whence, start, length, pid)
+	def unpack(data):
+		"""@return tuple:	`(type_, start, length, whence, pid)` of a `struct flock`"""
+		type_, whence, start, length, pid = struct.unpack(_FORMAT, data[:struct.calcsize(_FORMAT)])
+		return type_, start, length, whence, pid
+
+# Open file description locks belong to an open file (one `open` call) instead of a process, so two descriptors opened
+# separately exclude each other even in the same process. Linux 3.15+ only.
+if sys.platform.startswith("linux"):
+	F_OFD_GETLK = getattr(fcntl, "F_OFD_GETLK", 36)
+	F_OFD_SETLK = getattr(fcntl, "F_OFD_SETLK", 37)
+	F_OFD_SETLKW = getattr(fcntl, "F_OFD_SETLKW", 38)
+else:
+	F_OFD_GETLK = F_OFD_SETLK = F_OFD_SETLKW = None
+
+_hasOFDLocks = None
+
+def hasOFDLocks():
+	"""@return bool:	`True` if the kernel supports open file description locks. Only checked the first time."""
+	global _hasOFDLocks
+	if _hasOFDLocks == None:
+		_hasOFDLocks = False
+		if F_OFD_GETLK != None:
+			file_ = tempfile.TemporaryFile()
+			try:
+				fcntl.fcntl(file_.fileno(), F_OFD_GETLK, pack(fcntl.F_WRLCK))
+				_hasOFDLocks = True
+			except IOError as err:
+				if err.errno != errno.EINVAL:
+					raise err
+			finally:
+				file_.close()
+	return _hasOFDLocks
+
+def setLock(fileno, type_, shouldBlock, ofd, start=0, length=0):
+	"""
+	Takes (`fcntl.F_WRLCK` or `fcntl.F_RDLCK`) or releases (`fcntl.F_UNLCK`) a lock on the bytes from `start` to
+	`start + length` of the file.
+	
+	@param ofd	bool:	Use an open file description lock instead of a process lock. @see `hasOFDLocks`
+	@return bool:		`False` if `shouldBlock` is `False` and someone else holds a conflicting lock
+	"""
+	if ofd:
+		command = F_OFD_SETLKW if shouldBlock else F_OFD_SETLK
+	else:
+		command = fcntl.F_SETLKW if shouldBlock else fcntl.F_SETLK
+	try:
+		fcntl.fcntl(fileno, command, pack(type_, start, length))
+	except IOError as err:
+		if not shouldBlock and err.errno in (errno.EACCES, errno.EAGAIN):
+			return False
+		raise err
+	return True
+
+def getLockHolder(fileno, start=0, length=0, ofd=False):
+	"""
+	Asks the kernel, with `F_GETLK`, whether another process holds a lock on any byte from `start` to `start + length`
+	of the file. Nothing is locked or changed, and the locks of this process are never reported.
+	
+	With `ofd`, this asks with `F_OFD_GETLK` instead, which also reports the locks of other open files in this process,
+	and of open file description locks, whose pid is always `-1`.
+	
+	@return int:	The pid of a process holding a conflicting lock, or `None` if there is none
+	"""
+	command = F_OFD_GETLK if ofd else fcntl.F_GETLK
+	type_, _, _, _, pid = unpack(fcntl.fcntl(fileno, command, pack(fcntl.F_WRLCK, start, length)))
+	if type_ == fcntl.F_UNLCK:
+		return None
+	return pid
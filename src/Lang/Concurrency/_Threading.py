@@ -8,23 +8,40 @@ class _ThreadingAdapter(object):
 # 		print("_ThreadingAdapter.__init__")
 		super(_ThreadingAdapter, self).__init__(*args, **kwargs)
 		self._superclass = self._makeSuperclass()
+		self._slotsTakenByAnyone = 0
+		self._countLock = threading.Lock()		# guards `_slotsTakenByAnyone`
 	@abstractmethod
 	def _makeSuperclass(self):
 		pass
 	def __getattr__(self, name):
 		return getattr(self._superclass, name)
 	
+	def __eq__(self, other):
+		return self is other
+	
+	def getSlotsTakenByAnyone(self):
+		return self._slotsTakenByAnyone
+	def _countAcquired(self, wasAcquired):
+		if wasAcquired:
+			with self._countLock:
+				self._slotsTakenByAnyone += 1
+		return wasAcquired
+	
 	# These must be manually stated here because `@abstractmethod` is not smart enough to use __getattr__
 	def _acquire(self, shouldBlock, *args, **kwargs):
 		"""http://docs.python.org/2/library/threading.html#threading.Lock.acquire"""
-		return self.__getattr__("acquire")(blocking=shouldBlock, *args, **kwargs)
+		return self._countAcquired(self.__getattr__("acquire")(shouldBlock, *args, **kwargs))
 	def _release(self, *args, **kwargs):
 		"""http://docs.python.org/2/library/threading.html#threading.Lock.release"""
+		with self._countLock:
+			self._slotsTakenByAnyone -= 1
 		return self.__getattr__("release")(*args, **kwargs)
 
 class Semaphore(_ThreadingAdapter, abstract.Semaphore):
 	def _makeSuperclass(self):
 		return threading.Semaphore(value=self._maxSlots)
+	def getMaxSlots(self):
+		return self._maxSlots
 
 class Lock(_ThreadingAdapter, abstract.Lock):
 	def _makeSuperclass(self):
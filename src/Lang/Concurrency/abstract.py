@@ -4,6 +4,9 @@ import time
 
 from . import ResourceIsFullException, ResourceAlreadyReleasedException
 
+_MIN_POLL_INTERVAL = 0.0005		# seconds
+_MAX_POLL_INTERVAL = 0.02
+
 class LockSemaphore(object):
 	"""
 	There are multiple ways to use subclasses of this class:
@@ -116,31 +119,44 @@ class LockSemaphore(object):
 			else:				shouldBlock = False
 			
 			wasAcquired = self._acquire(shouldBlock=shouldBlock, *args, **kwargs)
-			if not wasAcquired and exceptionOnNotAcquire:
-				raise ResourceIsFullException()
-			if wasAcquired:
-				self._slotsAcquiredBySelf += 1
-			return wasAcquired
 		else:
-			sleepTime = min(0.1, timeout/10)
-			elapsedTime = 0
-			while True:
-				currentTimeStart = time.clock()
-				if self._acquire(shouldBlock=False, *args, **kwargs) == True:
-					self._slotsAcquiredBySelf += 1
-					return True
-				time.sleep(sleepTime)
-				elapsedTime += time.clock() - currentTimeStart
-				if elapsedTime >= timeout:
-					if exceptionOnNotAcquire:
-						raise ResourceIsFullException()
-					return False
+			wasAcquired = self._acquireWithTimeout(timeout, *args, **kwargs)
+		if not wasAcquired and exceptionOnNotAcquire:
+			raise ResourceIsFullException()
+		if wasAcquired:
+			self._slotsAcquiredBySelf += 1
+		return wasAcquired
 	
 	@abstractmethod
 	def _acquire(self, shouldBlock, *args, **kwargs):
 		"""@see `acquire`"""
 		pass
 	
+	def _acquireWithTimeout(self, timeout, *args, **kwargs):
+		"""
+		Waits at most `timeout` seconds (a positive number) for a slot. Subclasses should override this if the underlying
+		implementation can wait with a timeout itself, so that a slot is taken as soon as it's released.
+		
+		@return bool:	`True` if a slot was acquired
+		"""
+		return self._acquireByPolling(timeout, *args, **kwargs)
+	
+	def _acquireByPolling(self, timeout, *args, **kwargs):
+		"""
+		`_acquireWithTimeout` for implementations which can only try without blocking. The time between tries starts short
+		and doubles up to `_MAX_POLL_INTERVAL`, so a slot which is released soon is noticed soon. Elapsed time is wall time.
+		"""
+		deadline = time.time() + timeout
+		sleepTime = _MIN_POLL_INTERVAL
+		while True:
+			if self._acquire(shouldBlock=False, *args, **kwargs):
+				return True
+			remaining = deadline - time.time()
+			if remaining <= 0:
+				return False
+			time.sleep(min(sleepTime, remaining))
+			sleepTime = min(sleepTime * 2, _MAX_POLL_INTERVAL)
+	
 	def release(self, *args, **kwargs):
 		"""
 		*args and **kwargs are for optional/implementation specific parameters. If using them, there should always be a default value for all parameters.
@@ -0,0 +1,449 @@
+from Lang.ClassTools import vars
+
+from difflib import SequenceMatcher as _SequenceMatcher, Match
+from collections import Hashable, Iterable, Sized
+from itertools import izip
+from bisect import bisect_left, insort
+from array import array
+
+import _engines
+from _interning import InternTable
+from _views import SequenceView
+from _patch import Patch
+
+_PRUNE_MIN_SIZE = 1024		# intern tables with fewer elements than this are never pruned
+
+ALGORITHMS = {
+	"ratcliff":			None,		# Ratcliff/Obershelp, as implemented by `difflib`
+	"myers":			_engines.myers,
+	"hunt-szymanski":	_engines.huntSzymanski,
+}
+
+class SequenceMatcher(_SequenceMatcher, object):
+	"""
+	Improved difflib.SequenceMatcher.
+	
+	Can return non-matching blocks of objects, in addition to matching blocks of objects. It also provides an easier interface.
+	
+	Examples:
+	
+		diff = SequenceMatcher(tuple("aebcdef"), tuple("abbcdgef"))
+		print(list(diff.get_matching_blocks()))
+		print(list(diff.get_mismatching_blocks()))
+		print(list(diff.get_matching_elems()))
+		print(list(diff.get_mismatching_elems()))
+		
+		Prints the following:
+		
+		[BlockMatch(a={index=0,size=1}, b={index=0,size=1}), BlockMatch(a={index=2,size=3}, b={index=2,size=3}), BlockMatch(a={index=5,size=2}, b={index=6,size=2})]
+		[BlockMismatch(a={index=1,size=1}, b={index=1,size=1}), BlockMismatch(a=None, b={index=5,size=1})]
+		[ElemMatch(a=('a',), b=('a',)), ElemMatch(a=('b', 'c', 'd'), b=('b', 'c', 'd')), ElemMatch(a=('e', 'f'), b=('e', 'f'))]
+		[ElemMismatch(a=('e',), b=('b',)), ElemMismatch(a=None, b=('g',))]
+	
+	The algorithm used to find matching blocks can be chosen with the `algorithm` parameter:
+	
+		diff = SequenceMatcher(oldLines, newLines, algorithm="myers")
+	
+	When elements are expensive to hash or compare, such as `FrozenDict` rows, use `intern=True`. Each distinct element
+	is then hashed only once, and the matching runs on integers instead. In this case, `a` and `b` are `array('l')`
+	buffers of integers, but all `*_elems` methods still return the original elements.
+	
+	When `a` stays the same and `b` changes slightly, use `rediff(newB)` or `update_b(edits)` instead of `set_seq2`. Only
+	the region of the matching blocks around the change is recomputed, and the `b2j` index is updated in place.
+	"""
+	def __init__(self, *args, **kwargs):
+		"""
+		@param *args:		2 arguments that specify the 2 things to compare should be passed in here.
+		@param algorithm:	One of the keys in `ALGORITHMS`:
+							"ratcliff" (default) is the algorithm used by `difflib`, which also applies `isjunk` and `autojunk`.
+							"myers" is the linear space O(ND) algorithm, which is best for long, similar sequences.
+							"hunt-szymanski" is best when there are few equal elements between the 2 sides.
+							"myers" and "hunt-szymanski" always find a longest common subsequence and ignore `isjunk` and `autojunk`.
+		@param intern:		If `True`, each distinct element is mapped to an integer first, and both sides are stored as
+							`array('l')` buffers of those integers. `isjunk` is still called with the original elements.
+		"""
+		assert len(args) in (0,2)
+		if len(args) == 2:
+			kwargs["a"] = args[0]
+			kwargs["b"] = args[1]
+		assert "a" in kwargs and "b" in kwargs
+		self.algorithm = kwargs.pop("algorithm", "ratcliff")
+		if self.algorithm not in ALGORITHMS:
+			raise ValueError("Unknown diff algorithm: " + str(self.algorithm))
+		self._internTable = InternTable() if kwargs.pop("intern", False) else None
+		if self._internTable != None and kwargs.get("isjunk") != None:
+			isjunk = kwargs["isjunk"]
+			kwargs["isjunk"] = lambda token: isjunk(self._internTable.elems[token])		# the table is replaced when it's pruned
+		self._cacheHits = 0
+		self._cacheMisses = 0
+		super(SequenceMatcher, self).__init__(**kwargs)
+	
+	def set_seq1(self, a):
+		super(SequenceMatcher, self).set_seq1(self._prepareSide(a))
+		if self._pruneInternTable():
+			self._SequenceMatcher__chain_b()		# `b2j` of `difflib` is keyed by token
+	def set_seq2(self, b):
+		super(SequenceMatcher, self).set_seq2(self._prepareSide(b))
+		self._bIsCopy = self._internTable != None		# an interned side is always a new array
+		if self._pruneInternTable():
+			self._SequenceMatcher__chain_b()
+	
+	def _pruneInternTable(self):
+		"""
+		The intern table keeps every element it has seen, so a matcher which is given many different sequences would grow
+		without bound. Once the table is more than twice as large as `a` and `b` together, it is built again from only the
+		elements of `a` and `b`, and both are converted to the new tokens. Elements returned before keep using the old table.
+		
+		@return bool:	`True` if the table was replaced, in which case `b2j` must be built again
+		"""
+		table = self._internTable
+		if table == None or self.a is None or self.b is None:
+			return False
+		if len(table) < _PRUNE_MIN_SIZE or len(table) <= 2 * (len(self.a) + len(self.b)):
+			return False
+		newTable = InternTable()
+		self.a = newTable.intern(table.decode(self.a))
+		self.b = newTable.intern(table.decode(self.b))
+		self._internTable = newTable
+		return True
+	def _prepareSide(self, side):
+		side = self._checkType(side)
+		if self._internTable != None:
+			side = self._internTable.intern(side)
+		return side
+	def _getSideElems(self, sideName):
+		"""@return iterable:	The original elements of side `a` or `b`, even if they are interned"""
+		side = getattr(self, sideName)
+		if self._internTable != None:
+			return self._internTable.decode(side)
+		return side
+	
+	@classmethod
+	def _checkType(cls, side):
+		"""
+		Iterables which are not sized, such as generators, are read into memory here. Use `stream_mismatching` to diff
+		iterables which are too large to fit in memory.
+		"""
+		assert isinstance(side, Iterable)
+		if not isinstance(side, Sized):		# object must be len-able and subscriptable to be used in diff
+			side = tuple(side)
+		if len(side) == 0:
+			return side
+		containerInstance = side[0]
+		if not isinstance(containerInstance, Hashable):
+			raise Exception("Elements in iterable must be hashable. Ex. use FrozenDict instead of dict, frozenset instead of set, etc.")		
+		return side
+	
+	def __eq__(self, other):
+		if not isinstance(other, _SequenceMatcher):
+			return False
+		if self._internTable == None and getattr(other, "_internTable", None) == None:
+			return self.a == other.a and self.b == other.b
+		otherA, otherB = (other._getSideElems("a"), other._getSideElems("b")) if isinstance(other, SequenceMatcher) else (other.a, other.b)
+		return list(self._getSideElems("a")) == list(otherA) and list(self._getSideElems("b")) == list(otherB)
+	def __ne__(self, other):
+		return not (self == other)
+	
+	def ratio(self):
+		"""
+		Corrects ratio in difflib.SequenceMatcher
+		
+		Before, the ratio function would add the length of `a` and `b` in its formula, but usually the user wants to
+		consider the difference of only one side.
+		"""
+		superRatio = super(SequenceMatcher, self).ratio()
+		return superRatio + ((1 - superRatio) / 2)
+	
+	def _getRawMatchingBlocks(self):
+		"""
+		@return list:	`difflib.Match` triples, ending with the `(len(a), len(b), 0)` sentinel. This is cached in `self.matching_blocks`, the same as in `difflib`.
+		"""
+		if self.matching_blocks is None:
+			la, lb = len(self.a), len(self.b)
+			blocks = self._findMatchingBlocks(0, la, 0, lb)
+			self._cacheMisses += len(blocks)
+			blocks.append((la, lb, 0))
+			self.matching_blocks = map(Match._make, blocks)
+		return self.matching_blocks
+	
+	def _findMatchingBlocks(self, alo, ahi, blo, bhi):
+		"""@return list:	Collapsed `(i, j, size)` triples between `a[alo:ahi]` and `b[blo:bhi]`, without a sentinel"""
+		engine = ALGORITHMS[self.algorithm]
+		if engine != None:
+			return engine(self.a, alo, ahi, self.b, blo, bhi)
+		# same as `difflib.SequenceMatcher.get_matching_blocks`, but limited to a region
+		queue = [(alo, ahi, blo, bhi)]
+		blocks = []
+		while queue:
+			alo, ahi, blo, bhi = queue.pop()
+			i, j, k = x = self.find_longest_match(alo, ahi, blo, bhi)
+			if k:
+				blocks.append(x)
+				if alo < i and blo < j:
+					queue.append((alo, i, blo, j))
+				if i+k < ahi and j+k < bhi:
+					queue.append((i+k, ahi, j+k, bhi))
+		blocks.sort()
+		return _engines._collapseAdjacent(blocks)
+	
+	def getCacheStats(self):
+		"""
+		@return dict:	`{"hits": ..., "misses": ...}`, where hits are matching blocks that were kept by `rediff`/`update_b`, and misses are matching blocks that had to be computed.
+		"""
+		return {"hits": self._cacheHits, "misses": self._cacheMisses}
+	
+	def rediff(self, newB):
+		"""
+		Replaces `b` with `newB`, which is usually a slightly changed version of `b`. The common start and end of `b` and
+		`newB` are found first, and only the region in between is diffed again.
+		
+		@see `update_b`
+		"""
+		newB = self._prepareSide(newB)
+		prefix, suffix = _engines._trimCommon(self.b, 0, len(self.b), newB, 0, len(newB))
+		self._replaceB(prefix, len(self.b) - suffix, newB[prefix:len(newB) - suffix])
+		if self._pruneInternTable():		# the matching blocks are positions, so they are still valid
+			self._SequenceMatcher__chain_b()
+	
+	def update_b(self, edits):
+		"""
+		Changes `b`, and updates the `b2j` index and matching blocks only where they are affected by the changes.
+		Matching blocks outside of the changed regions are kept, and only the regions of `a` and `b` between the kept
+		blocks are diffed again. Because of this, the result can differ from a diff of `a` and the new `b` from scratch.
+		
+		The sequence which was given as `b` is not changed: it is copied to a list before the first edit, unless it is
+		interned. Which elements are treated as
+		popular by `autojunk` is not evaluated again.
+		
+		@param edits:	An iterable of `(j1, j2, newElems)`, which each replace `b[j1:j2]` with `newElems`. The indices refer to `b` before any edits are made, and the edits must not overlap.
+		"""
+		edits = sorted(edits, key=lambda edit: (edit[0], edit[1]))
+		for (_, j2, _), (nextJ1, _, _) in izip(edits, edits[1:]):
+			if nextJ1 < j2:
+				raise ValueError("Edits overlap")
+		for j1, j2, newElems in reversed(edits):		# from the end, so that indices of the other edits stay the same
+			if not 0 <= j1 <= j2 <= len(self.b):
+				raise IndexError("Edit is out of range of b")
+			self._replaceB(j1, j2, self._prepareSide(newElems))
+		if self._pruneInternTable():
+			self._SequenceMatcher__chain_b()
+	
+	def _getBJunkSets(self):
+		"""@return tuple:	`(junk, popular)` sets of elements which are not in `b2j`, as stored by `difflib` in this python version"""
+		if hasattr(self, "bjunk"):
+			return self.bjunk, self.bpopular
+		return self.isbjunk.__self__, self.isbpopular.__self__
+	
+	def _updateB2j(self, j1, j2, newElems):
+		b2j = self.b2j
+		for elem in set(self.b[j1:j2]):
+			indices = b2j.get(elem)
+			if indices:
+				del indices[bisect_left(indices, j1):bisect_left(indices, j2)]
+				if len(indices) == 0:
+					del b2j[elem]
+		delta = len(newElems) - (j2 - j1)
+		if delta != 0:
+			for indices in b2j.itervalues():
+				for k in xrange(bisect_left(indices, j2), len(indices)):
+					indices[k] += delta
+		junk, popular = self._getBJunkSets()
+		for j, elem in enumerate(newElems, j1):
+			if elem in junk or elem in popular:
+				continue
+			if self.isjunk and self.isjunk(elem):
+				junk.add(elem)
+				continue
+			insort(b2j.setdefault(elem, []), j)
+	
+	def _replaceB(self, j1, j2, newElems):
+		"""Replaces `b[j1:j2]` with `newElems`, which must already be prepared by `_prepareSide`"""
+		if not self._bIsCopy:		# the caller's sequence must not be changed
+			self.b = self.b[:] if isinstance(self.b, (list, array)) else list(self.b)
+			self._bIsCopy = True
+		self._updateB2j(j1, j2, newElems)
+		self.b[j1:j2] = newElems
+		self.fullbcount = None
+		self.opcodes = None
+		if self.matching_blocks is None:
+			return
+		
+		delta = len(newElems) - (j2 - j1)
+		before, after = [], []
+		for i, j, size in self.matching_blocks[:-1]:
+			if j + size <= j1:
+				before.append((i, j, size))
+			elif j >= j2:
+				after.append((i, j + delta, size))
+			else:		# keep the parts of the block outside of the edit
+				if j < j1:
+					before.append((i, j, j1 - j))
+				if j + size > j2:
+					after.append((i + j2 - j, j2 + delta, j + size - j2))
+		alo, blo = (before[-1][0] + before[-1][2], before[-1][1] + before[-1][2]) if before else (0, 0)
+		ahi, bhi = (after[0][0], after[0][1]) if after else (len(self.a), len(self.b))
+		newBlocks = self._findMatchingBlocks(alo, ahi, blo, bhi)
+		self._cacheHits += len(before) + len(after)
+		self._cacheMisses += len(newBlocks)
+		blocks = _engines._collapseAdjacent(before + newBlocks + after)
+		blocks.append((len(self.a), len(self.b), 0))
+		self.matching_blocks = map(Match._make, blocks)
+	
+	def get_matching_blocks(self):
+		# avoid a bug where subsequent calls to this function return a regular tuple instead of a named tuple
+		for block in self._getRawMatchingBlocks():
+			block = _BlockMatch(*block)
+			if block.size != 0:
+				yield block
+	
+	def _get_mismatching_blocks_diffSingleSide(self, currentBlock, lastBlock, sideName):
+		if lastBlock != None:
+			diffStart = getattr(lastBlock, sideName).index + lastBlock.size
+		else:
+			diffStart = 0
+		
+		if currentBlock != None:
+			diffLen = getattr(currentBlock, sideName).index - diffStart
+		else:
+			diffLen = len(getattr(self, sideName)) - diffStart
+		
+		if diffLen == 0:
+			return None
+		return _BlockSide(diffStart, diffLen)
+	
+	def _get_mismatching_blocks_yieldIfNotNone(self, currentMatch, lastMatch):
+		blockSideA = self._get_mismatching_blocks_diffSingleSide(currentMatch, lastMatch, "a")
+		blockSideB = self._get_mismatching_blocks_diffSingleSide(currentMatch, lastMatch, "b")
+		if not (blockSideA == None == blockSideB):
+			yield _BlockMismatch(blockSideA, blockSideB)
+	
+	def get_mismatching_blocks(self):
+		lastMatch = None
+		for currentMatch in self.get_matching_blocks():
+			if currentMatch.size != 0:
+				for i in self._get_mismatching_blocks_yieldIfNotNone(currentMatch, lastMatch):
+					yield i
+			lastMatch = currentMatch
+		for i in self._get_mismatching_blocks_yieldIfNotNone(None, lastMatch):		# also when nothing matches at all
+			yield i
+	
+	@classmethod
+	def _sideToElems(cls, side, sequence, decode):
+		if side == None:
+			return _ElemsBlockSide(None, None)
+		return _ElemsBlockSide(side, SequenceView(sequence, side.index, side.index + side.size, decode))
+	
+	def _getElems(self, getBlocksFunc):
+		decode = self._internTable.elems.__getitem__ if self._internTable != None else None
+		for block in getBlocksFunc():
+			yield self._sideToElems(block.a, self.a, decode), self._sideToElems(block.b, self.b, decode)
+	
+	def get_matching_elems(self):
+		"""
+		The elements are returned as `SequenceView` objects, which are indexable views into `a` and `b` that don't copy
+		any elements.
+		"""
+		return [_ElemMatch(blockElemsPairA.elems, blockElemsPairB.elems) for blockElemsPairA, blockElemsPairB in self._getElems(self.get_matching_blocks)]
+	def get_matching_elems_useOnce(self):
+		"""
+		Generators will be returned which can only be iterated over once.
+		"""
+		for blockElemsPairA, blockElemsPairB in self._getElems(self.get_matching_blocks):
+			yield _ElemMatch(_iterOrNone(blockElemsPairA.elems), _iterOrNone(blockElemsPairB.elems))
+	def get_mismatching_elems(self):
+		"""
+		The elements are returned as `SequenceView` objects, which are indexable views into `a` and `b` that don't copy
+		any elements.
+		"""
+		return [_ElemMismatch(blockElemsPairA.elems, blockElemsPairB.elems) for blockElemsPairA, blockElemsPairB in self._getElems(self.get_mismatching_blocks)]
+	def get_mismatching_elems_useOnce(self):
+		"""
+		Generators will be returned which can only be iterated over once.
+		"""
+		for blockElemsPairA, blockElemsPairB in self._getElems(self.get_mismatching_blocks):
+			yield _ElemMismatch(_iterOrNone(blockElemsPairA.elems), _iterOrNone(blockElemsPairB.elems))
+	
+	def get_matching(self):
+		for blockElemsPairA, blockElemsPairB in self._getElems(self.get_matching_blocks):
+			yield _ElemBlockMatch(blockElemsPairA, blockElemsPairB)
+	def get_mismatching(self):
+		for blockElemsPairA, blockElemsPairB in self._getElems(self.get_mismatching_blocks):
+			yield _ElemBlockMismatch(blockElemsPairA, blockElemsPairB)
+	
+	def get_patch(self, includePayload=True):
+		"""
+		@param includePayload:	If `True`, the deleted and inserted elements are stored in the patch, so that it can be
+								applied to `a`. Otherwise the patch only holds the ops, which is enough to invert it or
+								to find which indices changed.
+		@return Patch:			A compact edit script which turns `a` into `b`, which can be saved with `to_bytes()`.
+		"""
+		decode = self._internTable.elems.__getitem__ if self._internTable != None else None
+		a = SequenceView(self.a, 0, len(self.a), decode)
+		b = SequenceView(self.b, 0, len(self.b), decode)
+		blocks = [(block.a.index, block.b.index, block.size) for block in self.get_matching_blocks()]
+		return Patch.fromBlocks(blocks, a, b, includePayload)
+
+
+class _BlockSide(object):
+	__slots__ = ("index", "size")
+	def __init__(self, index, size):
+		self.index = index
+		self.size = size
+	def __str__(self):
+		return "BlockSide(index=" + str(self.index) + ",size=" + str(self.size) + ")"
+	def __repr__(self):
+		return str(self)
+class _ElemsBlockSide(object):
+	"""
+	`elems` attribute is a `SequenceView` of the elements in the block
+	@see _BlockSide
+	"""
+	__slots__ = ("block", "elems")
+	def __init__(self, block, elems):
+		self.block = block
+		self.elems = elems
+	def __getattr__(self, name):
+		return getattr(self.block, name)
+	def __str__(self):
+		return "ElemsBlockSide(block=" + str(self.block) + ", elems=" + str(self.elems) + ")"
+	def __repr__(self):
+		return str(self)
+
+def _iterOrNone(elems):
+	return iter(elems) if elems is not None else None
+
+class _TwoSide(object):
+	__slots__ = ("a", "b")
+	def __init__(self, a, b):
+		self.a = a
+		self.b = b
+	def __str__(self):
+		attrs = ", ".join((key + "=" + str(getattr(self, key)) for key in vars(self.__class__)))
+		return self.__class__.__name__.strip("_") + "(" + attrs + ")"
+	def __repr__(self):
+		return str(self)
+
+class _Block(_TwoSide):
+	pass
+class _BlockMatch(_Block):
+	def __init__(self, indexA, indexB, size):
+		super(_BlockMatch, self).__init__(_BlockSide(indexA, size), _BlockSide(indexB, size))
+	def __getattr__(self, name):
+		if name == "size":
+			return self.a.size
+		raise AttributeError
+	def __getitem__(self, index):	# emulates tuple access for backwards compatibility in difflib
+		return (self.a.index, self.b.index, self.a.size)[index]
+class _BlockMismatch(_Block):
+	def __init__(self, blockSideA, blockSideB):
+		super(_BlockMismatch, self).__init__(blockSideA, blockSideB)
+
+class _ElemMatch(_TwoSide):
+	pass
+class _ElemMismatch(_TwoSide):
+	pass
+class _ElemBlockMatch(_TwoSide):
+	pass
+class _ElemBlockMismatch(_TwoSide):
+	pass
+
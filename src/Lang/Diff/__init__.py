@@ -0,0 +1,6 @@
+from _SequenceMatcher import SequenceMatcher, ALGORITHMS
+from _patch import Patch
+from _streaming import stream_mismatching
+from _merge import merge3
+from _batch import diff_many
+from _close import CloseMatchIndex, find_close
@@ -0,0 +1,71 @@
+from __future__ import division
+from _SequenceMatcher import SequenceMatcher
+
+from itertools import imap
+from multiprocessing import Pool
+
+def _diffPair(task):
+	"""
+	Runs in a worker process.
+	
+	@return tuple:	`(index, blocks)`, where `blocks` is a tuple of `(i, j, size)` matching blocks, or `None` if the pair was skipped because of `cutoff`
+	"""
+	index, a, b, identicalSize, cutoff, matcherKwargs = task
+	if identicalSize != None:
+		return index, ((0, 0, identicalSize),) if identicalSize != 0 else ()
+	diff = SequenceMatcher(a, b, **matcherKwargs)
+	# `quick_ratio` is an upper bound of the `difflib` ratio, which is converted the same way as `SequenceMatcher.ratio`
+	if cutoff != None and diff.quick_ratio() < 2 * cutoff - 1:
+		return index, None
+	return index, tuple((block.a.index, block.b.index, block.size) for block in diff.get_matching_blocks())
+
+def _makeTasks(pairs, skipIdentical, cutoff, matcherKwargs):
+	for index, (a, b) in enumerate(pairs):
+		if skipIdentical and len(a) == len(b) and a == b:		# don't send the elements to a worker at all
+			yield index, None, None, len(a), cutoff, matcherKwargs
+		else:
+			yield index, a, b, None, cutoff, matcherKwargs
+
+def diff_many(pairs, workers=None, ordered=True, skipIdentical=True, cutoff=None, chunksize=1, **matcherKwargs):
+	"""
+	Diffs many pairs of sequences in parallel, in a pool of processes.
+	
+	Results are sent back from the workers as tuples of matching blocks instead of `SequenceMatcher` instances, which
+	are much cheaper to pickle. Mismatching blocks are the gaps between the matching blocks.
+	
+	Example:
+	
+		pairs = ((open(old).readlines(), open(new).readlines()) for old, new in filePaths)
+		for index, blocks in diff_many(pairs, workers=8, cutoff=0.9):
+			...
+	
+	@param pairs:			An iterable of `(a, b)` pairs of sequences. Everything in them must be picklable.
+	@param workers:			Number of worker processes. `None` uses the number of CPUs. `1` diffs in the current process, without a pool.
+	@param ordered:			If `True`, results are yielded in the same order as `pairs`. If `False`, results are yielded as soon as they are done.
+	@param skipIdentical:	If `True`, pairs whose sides are equal are not diffed at all, and their elements are not sent to a worker.
+	@param cutoff:			If given, pairs whose `quick_ratio` shows that their `ratio()` must be below `cutoff` are not fully diffed.
+	@param chunksize:		@see `multiprocessing.Pool.imap`
+	@param matcherKwargs:	Passed to `SequenceMatcher`, such as `algorithm` or `intern`. They must be picklable.
+	
+	@return generator:		`(index, blocks)` tuples, where `index` is the position of the pair in `pairs` and `blocks` is a tuple of `(i, j, size)` matching blocks, or `None` if the pair was skipped because of `cutoff`.
+	"""
+	tasks = _makeTasks(pairs, skipIdentical, cutoff, matcherKwargs)
+	if workers == 1:
+		for result in imap(_diffPair, tasks):
+			yield result
+		return
+	
+	pool = Pool(workers)
+	try:
+		if ordered:
+			results = pool.imap(_diffPair, tasks, chunksize)
+		else:
+			results = pool.imap_unordered(_diffPair, tasks, chunksize)
+		for result in results:
+			yield result
+		pool.close()
+	except:
+		pool.terminate()
+		raise
+	finally:
+		pool.join()
@@ -0,0 +1,130 @@
+from __future__ import division
+from _SequenceMatcher import SequenceMatcher
+
+from heapq import nlargest
+
+_EPSILON = 1e-9		# bounds are compared with some tolerance, so that floating point error never rejects a real match
+
+def _grams(sequence, gramSize):
+	"""@return dict:	gram --> number of times it occurs in `sequence`"""
+	if not isinstance(sequence, (basestring, tuple)):
+		sequence = tuple(sequence)		# so that slices are hashable
+	counts = {}
+	for start in xrange(len(sequence) - gramSize + 1):
+		gram = sequence[start:start + gramSize]
+		counts[gram] = counts.get(gram, 0) + 1
+	return counts
+
+class CloseMatchIndex(object):
+	"""
+	An index of candidate sequences, for finding the ones that are similar to a target sequence, such as for fuzzy
+	de-duplication. Similarity is measured by `SequenceMatcher.ratio()`.
+	
+	Most candidates are rejected without diffing them, by a cascade of cheaper upper bounds of the ratio:
+	
+	1. `real_quick_ratio`, by only looking at candidates in a range of lengths (a length-bucket index)
+	2. A q-gram count filter, by counting the n-grams a candidate shares with the target (an inverted n-gram index)
+	3. `quick_ratio`
+	4. `ratio`, which is the only step that diffs
+	
+	Example:
+	
+		index = CloseMatchIndex(names)
+		for name in names:
+			duplicates = index.find_close(name, cutoff=0.9, n=None)
+	"""
+	def __init__(self, candidates, gramSize=2, **matcherKwargs):
+		"""
+		@param candidates:		Sequences to index, such as strings.
+		@param gramSize:		Size of the n-grams in the inverted index.
+		@param matcherKwargs:	Passed to `SequenceMatcher`, such as `algorithm`.
+		"""
+		if gramSize < 1:
+			raise ValueError("gramSize must be at least 1")
+		self._candidates = list(candidates)
+		self._gramSize = gramSize
+		self._matcherKwargs = matcherKwargs
+		self._lengthBuckets = {}		# length --> candidate ids
+		self._gramIndex = {}			# gram --> [(candidate id, count), ...]
+		for id_, candidate in enumerate(self._candidates):
+			self._lengthBuckets.setdefault(len(candidate), []).append(id_)
+			for gram, count in _grams(candidate, gramSize).iteritems():
+				self._gramIndex.setdefault(gram, []).append((id_, count))
+	
+	def __len__(self):
+		return len(self._candidates)
+	
+	def _lengthRange(self, targetLength, rawCutoff):
+		"""
+		Lengths of candidates which can pass `real_quick_ratio`, which is `2*min(la, lb) / (la + lb)`.
+		"""
+		if rawCutoff <= 0:
+			return 0, max(self._lengthBuckets) if self._lengthBuckets else 0
+		low = int(targetLength * rawCutoff / (2 - rawCutoff))
+		high = int(targetLength * (2 - rawCutoff) / rawCutoff) + 1
+		return low, high
+	
+	def _sharedGrams(self, target):
+		"""@return dict:	candidate id --> number of n-grams shared with `target`"""
+		shared = {}
+		for gram, targetCount in _grams(target, self._gramSize).iteritems():
+			for id_, count in self._gramIndex.get(gram, ()):
+				shared[id_] = shared.get(id_, 0) + min(targetCount, count)
+		return shared
+	
+	def find_close(self, target, cutoff=0.6, n=3):
+		"""
+		@param cutoff:	Candidates with a `SequenceMatcher.ratio()` below this are ignored.
+		@param n:		Maximum number of candidates to return, or `None` for all of them.
+		
+		@return list:	The candidates that are close enough to `target`, most similar first.
+		"""
+		if not 0 <= cutoff <= 1:
+			raise ValueError("cutoff must be in [0.0, 1.0]")
+		if n != None and n <= 0:
+			raise ValueError("n must be > 0 or None")
+		rawCutoff = 2 * cutoff - 1		# `SequenceMatcher.ratio()` is `(1 + rawRatio) / 2`, where `rawRatio` is the ratio used by `difflib`
+		targetLength = len(target)
+		gramSize = self._gramSize
+		sharedGrams = self._sharedGrams(target)
+		
+		matcher = SequenceMatcher(target, target, **self._matcherKwargs)		# `b2j` of the target is only built once
+		scored = []
+		low, high = self._lengthRange(targetLength, rawCutoff)
+		for length in xrange(low, high + 1):
+			ids = self._lengthBuckets.get(length)
+			if not ids:
+				continue
+			total = targetLength + length
+			if total == 0:
+				for id_ in ids:
+					scored.append((1.0, -id_))
+				continue
+			if 2 * min(targetLength, length) / total < rawCutoff - _EPSILON:		# real_quick_ratio
+				continue
+			# Every inserted or deleted element destroys at most `gramSize` of the n-grams in the target, and
+			# `total * (1 - rawRatio)` elements are inserted or deleted, so this many n-grams must still be shared.
+			requiredGrams = (targetLength - gramSize + 1) - gramSize * total * (1 - rawCutoff) - _EPSILON
+			for id_ in ids:
+				if requiredGrams > 0 and sharedGrams.get(id_, 0) < requiredGrams:
+					continue
+				matcher.set_seq1(self._candidates[id_])
+				if matcher.quick_ratio() < rawCutoff - _EPSILON:
+					continue
+				ratio = matcher.ratio()
+				if ratio >= cutoff:
+					scored.append((ratio, -id_))		# ties are broken by order in the index
+		if n == None:
+			scored.sort(reverse=True)
+		else:
+			scored = nlargest(n, scored)
+		return [self._candidates[-negativeId] for _, negativeId in scored]
+
+def find_close(target, candidates, cutoff=0.6, n=3, **kwargs):
+	"""
+	Like `difflib.get_close_matches`, but uses the ratio of `SequenceMatcher`, and skips most candidates without diffing
+	them. To search the same candidates many times, use `CloseMatchIndex` directly, so that the index is only built once.
+	
+	@see `CloseMatchIndex.find_close`
+	"""
+	return CloseMatchIndex(candidates, **kwargs).find_close(target, cutoff, n)
@@ -0,0 +1,175 @@
+"""
+Alternative matching engines for `SequenceMatcher`.
+
+Every engine has the signature `engine(a, alo, ahi, b, blo, bhi)` and returns a list of `(i, j, size)` triples for the
+matching blocks between `a[alo:ahi]` and `b[blo:bhi]`. The triples use absolute indices, are in increasing order, and
+adjacent blocks are already collapsed together, which is the same format that `difflib` uses internally.
+
+Both engines compute a longest common subsequence, so unlike the Ratcliff/Obershelp algorithm in `difflib`, there is
+no junk heuristic and no worst case quadratic time on long sequences with few differences.
+"""
+
+from bisect import bisect_left
+
+def _trimCommon(a, alo, ahi, b, blo, bhi):
+	"""@return tuple:	`(prefixSize, suffixSize)` of the elements that are equal at the start and end of both ranges"""
+	prefix = 0
+	while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+		prefix += 1
+	suffix = 0
+	while alo + prefix < ahi - suffix and blo + prefix < bhi - suffix and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+		suffix += 1
+	return prefix, suffix
+
+def _collapseAdjacent(blocks):
+	collapsed = []
+	i1 = j1 = k1 = 0
+	for i2, j2, k2 in blocks:
+		if k1 and i1 + k1 == i2 and j1 + k1 == j2:
+			k1 += k2
+		else:
+			if k1:
+				collapsed.append((i1, j1, k1))
+			i1, j1, k1 = i2, j2, k2
+	if k1:
+		collapsed.append((i1, j1, k1))
+	return collapsed
+
+def _pairsToBlocks(pairs):
+	"""Converts ordered `(i, j)` pairs of single matching elements into collapsed `(i, j, size)` blocks"""
+	return _collapseAdjacent((i, j, 1) for i, j in pairs)
+
+def _myersSplit(a, alo, ahi, b, blo, bhi):
+	"""
+	Finds the middle of the shortest edit script between the 2 ranges, using the linear space variant of the
+	algorithm in "An O(ND) Difference Algorithm and Its Variations" (Myers, 1986).
+	
+	The range must not have a common prefix or suffix.
+	
+	@return tuple:	`(x, y)` offsets from `alo` and `blo` where the edit script can be split in 2, or `None` if the 2 ranges have nothing in common
+	"""
+	n = ahi - alo
+	m = bhi - blo
+	maxD = (n + m + 1) // 2
+	vOffset = maxD
+	vLength = 2 * maxD + 2
+	v1 = [-1] * vLength
+	v2 = [-1] * vLength
+	v1[vOffset + 1] = 0
+	v2[vOffset + 1] = 0
+	delta = n - m
+	front = (delta % 2 != 0)	# if the total number of edits is odd, the forward path will collide with the reverse path
+	# offsets for the start and end of the k loops, which prevent mapping of space beyond the grid
+	k1start = k1end = k2start = k2end = 0
+	for d in xrange(maxD):
+		for k1 in xrange(-d + k1start, d + 1 - k1end, 2):
+			k1Offset = vOffset + k1
+			if k1 == -d or (k1 != d and v1[k1Offset - 1] < v1[k1Offset + 1]):
+				x1 = v1[k1Offset + 1]
+			else:
+				x1 = v1[k1Offset - 1] + 1
+			y1 = x1 - k1
+			while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+				x1 += 1
+				y1 += 1
+			v1[k1Offset] = x1
+			if x1 > n:
+				k1end += 2
+			elif y1 > m:
+				k1start += 2
+			elif front:
+				k2Offset = vOffset + delta - k1
+				if 0 <= k2Offset < vLength and v2[k2Offset] != -1 and x1 >= n - v2[k2Offset]:
+					return x1, y1
+		for k2 in xrange(-d + k2start, d + 1 - k2end, 2):
+			k2Offset = vOffset + k2
+			if k2 == -d or (k2 != d and v2[k2Offset - 1] < v2[k2Offset + 1]):
+				x2 = v2[k2Offset + 1]
+			else:
+				x2 = v2[k2Offset - 1] + 1
+			y2 = x2 - k2
+			while x2 < n and y2 < m and a[ahi - x2 - 1] == b[bhi - y2 - 1]:
+				x2 += 1
+				y2 += 1
+			v2[k2Offset] = x2
+			if x2 > n:
+				k2end += 2
+			elif y2 > m:
+				k2start += 2
+			elif not front:
+				k1Offset = vOffset + delta - k2
+				if 0 <= k1Offset < vLength and v1[k1Offset] != -1:
+					x1 = v1[k1Offset]
+					if x1 >= n - x2:
+						return x1, vOffset + x1 - k1Offset
+	return None
+
+def myers(a, alo, ahi, b, blo, bhi):
+	"""
+	Linear space Myers O(ND) engine, where D is the number of differences. Best when both sides are long but similar.
+	
+	Memory use is O(len(a) + len(b)) regardless of how different the 2 sides are.
+	"""
+	blocks = []
+	stack = [(alo, ahi, blo, bhi)]		# explicit stack instead of recursion; matching blocks are pushed as 3-tuples
+	while stack:
+		item = stack.pop()
+		if len(item) == 3:
+			blocks.append(item)
+			continue
+		alo, ahi, blo, bhi = item
+		prefix, suffix = _trimCommon(a, alo, ahi, b, blo, bhi)
+		# items are pushed in reverse order, so they will be popped in increasing order
+		if suffix:
+			stack.append((ahi - suffix, bhi - suffix, suffix))
+		innerAlo, innerAhi, innerBlo, innerBhi = alo + prefix, ahi - suffix, blo + prefix, bhi - suffix
+		if innerAlo < innerAhi and innerBlo < innerBhi:
+			split = _myersSplit(a, innerAlo, innerAhi, b, innerBlo, innerBhi)
+			if split in ((0, 0), (innerAhi - innerAlo, innerBhi - innerBlo)):	# can't be divided any further, so solve it exactly
+				for block in reversed(huntSzymanski(a, innerAlo, innerAhi, b, innerBlo, innerBhi)):
+					stack.append(block)
+			elif split != None:
+				x, y = split
+				stack.append((innerAlo + x, innerAhi, innerBlo + y, innerBhi))
+				stack.append((innerAlo, innerAlo + x, innerBlo, innerBlo + y))
+		if prefix:
+			stack.append((alo, blo, prefix))
+	return _collapseAdjacent(blocks)
+
+def huntSzymanski(a, alo, ahi, b, blo, bhi):
+	"""
+	Hunt-Szymanski engine, which runs in O((r + n) log n) time, where r is the number of pairs of equal elements between
+	the 2 sides. Best when matches are sparse, such as when most elements are unique.
+	"""
+	prefix, suffix = _trimCommon(a, alo, ahi, b, blo, bhi)
+	blocks = []
+	if prefix:
+		blocks.append((alo, blo, prefix))
+	innerAlo, innerAhi, innerBlo, innerBhi = alo + prefix, ahi - suffix, blo + prefix, bhi - suffix
+	
+	positions = {}		# elem --> indices in `b`, in descending order
+	for j in xrange(innerBhi - 1, innerBlo - 1, -1):
+		positions.setdefault(b[j], []).append(j)
+	thresholds = []		# thresholds[k] is the smallest index in `b` that ends a common subsequence of length k+1
+	links = []			# links[k] is the last `(i, j, previousLink)` of that common subsequence
+	for i in xrange(innerAlo, innerAhi):
+		for j in positions.get(a[i], ()):
+			k = bisect_left(thresholds, j)
+			if k == len(thresholds):
+				thresholds.append(j)
+				links.append((i, j, links[k - 1] if k else None))
+			elif j < thresholds[k]:
+				thresholds[k] = j
+				links[k] = (i, j, links[k - 1] if k else None)
+	
+	pairs = []
+	link = links[-1] if links else None
+	while link != None:
+		pairs.append(link[:2])
+		link = link[2]
+	pairs.reverse()
+	blocks.extend(_pairsToBlocks(pairs))
+	
+	if suffix:
+		blocks.append((ahi - suffix, bhi - suffix, suffix))
+	return _collapseAdjacent(blocks)
@@ -0,0 +1,36 @@
+from array import array
+from itertools import imap
+
+class InternTable(object):
+	"""
+	Maps each distinct element to a small integer (a token), so that sequences can be stored and compared as compact
+	arrays of integers. Each distinct element is hashed once when it is interned, instead of every time it is compared.
+	
+	The same table should be used for both sides of a diff, so that equal elements get equal tokens.
+	"""
+	__slots__ = ("_tokens", "elems")
+	
+	def __init__(self):
+		self._tokens = {}		# elem --> token
+		self.elems = []			# token --> elem
+	
+	def __len__(self):
+		return len(self.elems)
+	
+	def intern(self, sequence):
+		"""@return array:	An `array('l')` of the tokens for each element in `sequence`"""
+		tokens = self._tokens
+		elems = self.elems
+		interned = array("l")
+		append = interned.append
+		for elem in sequence:
+			token = tokens.get(elem)
+			if token is None:
+				token = tokens[elem] = len(elems)
+				elems.append(elem)
+			append(token)
+		return interned
+	
+	def decode(self, tokens):
+		"""@return iterator:	The original elements for the given tokens"""
+		return imap(self.elems.__getitem__, tokens)
@@ -0,0 +1,107 @@
+from _SequenceMatcher import SequenceMatcher
+from _views import SequenceView
+
+def _syncRegions(oursBlocks, theirsBlocks, baseLength, oursLength, theirsLength):
+	"""
+	Sync regions are the ranges of `base` which are unchanged on both sides.
+	
+	@param oursBlocks, theirsBlocks:	`(sideIndex, baseIndex, size)` matching blocks of each side against `base`
+	@return list:						`(baseStart, baseEnd, oursStart, theirsStart)` tuples, ending with an empty region at the end of all 3 sequences
+	"""
+	regions = []
+	oursIter, theirsIter = iter(oursBlocks), iter(theirsBlocks)
+	ours, theirs = next(oursIter, None), next(theirsIter, None)
+	while ours != None and theirs != None:
+		oursStart, oursBase, oursSize = ours
+		theirsStart, theirsBase, theirsSize = theirs
+		start = max(oursBase, theirsBase)
+		end = min(oursBase + oursSize, theirsBase + theirsSize)
+		if start < end:
+			regions.append((start, end, oursStart + (start - oursBase), theirsStart + (start - theirsBase)))
+		if oursBase + oursSize < theirsBase + theirsSize:
+			ours = next(oursIter, None)
+		else:
+			theirs = next(theirsIter, None)
+	regions.append((baseLength, baseLength, oursLength, theirsLength))
+	return regions
+
+def merge3(base, ours, theirs, **matcherKwargs):
+	"""
+	Three-way merge of 2 changed versions of `base`, like `diff3`.
+	
+	`base` is used as the second sequence of a single `SequenceMatcher`, so its `b2j` index is only built once, and
+	`ours` and `theirs` are diffed against it in turn. Regions of `base` which are unchanged on both sides are used as
+	anchors, and each gap between 2 anchors is either taken from the side which changed it, or is a conflict if both
+	sides changed it differently.
+	
+	Example:
+	
+		hunks = merge3(upstreamOld, userEdited, upstreamNew)
+		if not any(hunk.isConflict for hunk in hunks):
+			merged = [elem for hunk in hunks for elem in hunk.elems]
+	
+	@param matcherKwargs:	Passed to `SequenceMatcher`, such as `algorithm` or `intern`.
+	
+	@return list:	Hunks in order. Clean hunks have `isConflict=False`, `elems` and `source`, which is one of "base" (unchanged),
+					"ours", "theirs" or "both" (both sides made the same change). `elems` is empty if that side deleted the
+					region. Conflict hunks have `isConflict=True` and `base`, `ours` and `theirs` elements. All elements
+					are `SequenceView` objects.
+	"""
+	matcher = SequenceMatcher(ours, base, **matcherKwargs)
+	oursBlocks = [(block.a.index, block.b.index, block.size) for block in matcher.get_matching_blocks()]
+	ours, base = matcher.a, matcher.b		# these are interned already, if `intern` was used
+	oursTable = matcher._internTable
+	matcher.set_seq1(theirs)
+	theirsBlocks = [(block.a.index, block.b.index, block.size) for block in matcher.get_matching_blocks()]
+	theirs, base = matcher.a, matcher.b
+	if matcher._internTable is not oursTable:		# pruned, so `ours` must be converted to the new tokens too
+		ours = matcher._internTable.intern(oursTable.decode(ours))
+	decode = matcher._internTable.elems.__getitem__ if matcher._internTable != None else None
+	
+	hunks = []
+	baseIndex = oursIndex = theirsIndex = 0
+	for baseStart, baseEnd, oursStart, theirsStart in _syncRegions(oursBlocks, theirsBlocks, len(base), len(ours), len(theirs)):
+		if oursStart > oursIndex or theirsStart > theirsIndex or baseStart > baseIndex:
+			# as tuples, because the sides can be different types of sequences, and a list is never equal to a tuple
+			baseGap = tuple(base[baseIndex:baseStart])
+			oursGap = tuple(ours[oursIndex:oursStart])
+			theirsGap = tuple(theirs[theirsIndex:theirsStart])
+			oursChanged = oursGap != baseGap
+			theirsChanged = theirsGap != baseGap
+			if oursChanged and theirsChanged and oursGap != theirsGap:
+				hunks.append(_ConflictHunk(SequenceView(base, baseIndex, baseStart, decode), SequenceView(ours, oursIndex, oursStart, decode),
+										SequenceView(theirs, theirsIndex, theirsStart, decode)))
+			elif oursChanged and theirsChanged:
+				hunks.append(_CleanHunk(SequenceView(ours, oursIndex, oursStart, decode), "both"))
+			elif oursChanged:
+				hunks.append(_CleanHunk(SequenceView(ours, oursIndex, oursStart, decode), "ours"))
+			elif theirsChanged:
+				hunks.append(_CleanHunk(SequenceView(theirs, theirsIndex, theirsStart, decode), "theirs"))
+		if baseEnd > baseStart:
+			hunks.append(_CleanHunk(SequenceView(base, baseStart, baseEnd, decode), "base"))
+		baseIndex = baseEnd
+		oursIndex = oursStart + (baseEnd - baseStart)
+		theirsIndex = theirsStart + (baseEnd - baseStart)
+	return hunks
+
+class _CleanHunk(object):
+	__slots__ = ("elems", "source")
+	isConflict = False
+	def __init__(self, elems, source):
+		self.elems = elems
+		self.source = source
+	def __str__(self):
+		return "CleanHunk(source=" + self.source + ", elems=" + str(self.elems) + ")"
+	def __repr__(self):
+		return str(self)
+class _ConflictHunk(object):
+	__slots__ = ("base", "ours", "theirs")
+	isConflict = True
+	def __init__(self, base, ours, theirs):
+		self.base = base
+		self.ours = ours
+		self.theirs = theirs
+	def __str__(self):
+		return "ConflictHunk(base=" + str(self.base) + ", ours=" + str(self.ours) + ", theirs=" + str(self.theirs) + ")"
+	def __repr__(self):
+		return str(self)
@@ -0,0 +1,331 @@
+from array import array
+import cPickle as pickle
+import struct
+import sys
+
+_MAGIC = "LDP1"
+_HEADER = struct.Struct("<4sBqqq")		# magic, flags, len(a), len(b), number of ops
+_FLAG_PAYLOAD = 1
+_FLAG_PICKLED = 2		# the payload is pickled instead of encoded with `_encodeElems`
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_MAX_DEPTH = 32		# of tuples and lists nested in the payload
+
+class Patch(object):
+	"""
+	A compact edit script which turns `a` into `b`.
+	
+	Ops are stored in a single flat array of integers, 4 per op: `(op, aIndex, bIndex, size)`, where `op` is one of
+	`EQUAL`, `DELETE` or `INSERT`, and `aIndex` and `bIndex` are the positions in `a` and `b` where the op starts. A
+	replaced region is a `DELETE` followed by an `INSERT`. The ops are stored as C longs, so on platforms where those are
+	32 bits, both sequences must be shorter than 2 ** 31.
+	
+	The payload is optional. It holds the elements of every `DELETE` and `INSERT` op, in op order, and is needed to
+	`apply` a patch which inserts anything. Without it, a patch is only a few integers per block.
+	
+	Example:
+	
+		patch = SequenceMatcher(old, new).get_patch()
+		with open("cache", "wb") as f:
+			f.write(patch.to_bytes())
+		...
+		new = Patch.from_bytes(data).apply(old)
+	"""
+	EQUAL = 0
+	DELETE = 1
+	INSERT = 2
+	
+	__slots__ = ("_ops", "_payload", "aLength", "bLength")
+	
+	def __init__(self, ops, aLength, bLength, payload=None):
+		"""
+		Use `SequenceMatcher.get_patch()` or `Patch.from_bytes()` instead of calling this directly.
+		
+		@param ops:			Flat iterable of integers, 4 per op: `(op, aIndex, bIndex, size)`
+		@param payload:		List of the elements of all `DELETE` and `INSERT` ops, in op order, or `None`
+		"""
+		self._ops = ops if isinstance(ops, array) else array("l", ops)
+		if len(self._ops) % 4 != 0:
+			raise ValueError("ops must have 4 integers per op")
+		self._payload = payload
+		self.aLength = aLength
+		self.bLength = bLength
+	
+	@classmethod
+	def fromBlocks(cls, blocks, a, b, includePayload=True):
+		"""
+		@param blocks:	`(i, j, size)` matching blocks in increasing order, such as from `SequenceMatcher.get_matching_blocks()`
+		@param a, b:	Indexable sequences of the 2 sides. Only used if `includePayload` is `True`.
+		"""
+		ops = array("l")
+		payload = [] if includePayload else None
+		i = j = 0
+		for blockI, blockJ, size in list(blocks) + [(len(a), len(b), 0)]:
+			if blockI > i:
+				ops.extend((cls.DELETE, i, j, blockI - i))
+				if includePayload:
+					payload.extend(a[index] for index in xrange(i, blockI))
+			if blockJ > j:
+				ops.extend((cls.INSERT, blockI, j, blockJ - j))
+				if includePayload:
+					payload.extend(b[index] for index in xrange(j, blockJ))
+			if size:
+				ops.extend((cls.EQUAL, blockI, blockJ, size))
+			i, j = blockI + size, blockJ + size
+		return cls(ops, len(a), len(b), payload)
+	
+	def __len__(self):
+		"""@return int:	Number of ops"""
+		return len(self._ops) // 4
+	def __iter__(self):
+		"""@return generator:	`(op, aIndex, bIndex, size)` tuples"""
+		ops = self._ops
+		for start in xrange(0, len(ops), 4):
+			yield tuple(ops[start:start + 4])
+	
+	@property
+	def hasPayload(self):
+		return self._payload != None
+	
+	def __eq__(self, other):
+		if not isinstance(other, Patch):
+			return False
+		return self._ops == other._ops and self.aLength == other.aLength and self.bLength == other.bLength and self._payload == other._payload
+	def __ne__(self, other):
+		return not (self == other)
+	def __str__(self):
+		return "Patch(ops=" + str(list(self)) + ", aLength=" + str(self.aLength) + ", bLength=" + str(self.bLength) + ", hasPayload=" + str(self.hasPayload) + ")"
+	def __repr__(self):
+		return str(self)
+	def __reduce__(self):
+		return (_unpickle, (self.to_bytes(),))
+	
+	def to_bytes(self):
+		"""
+		The ops are packed as little-endian 64 bit integers. The payload, if any, follows them. If it only holds `None`,
+		`bool`, `int`, `long`, `float`, `str`, `unicode`, and tuples and lists of those, it is encoded in a simple format
+		which `from_bytes` can read safely. Otherwise, such as for `FrozenDict` rows, it is pickled.
+		
+		@return str
+		"""
+		flags = _FLAG_PAYLOAD if self.hasPayload else 0
+		payloadData = ""
+		if self.hasPayload:
+			try:
+				parts = []
+				_encodeElems(self._payload, parts)
+				payloadData = "".join(parts)
+			except TypeError:
+				payloadData = pickle.dumps(self._payload, pickle.HIGHEST_PROTOCOL)
+				flags |= _FLAG_PICKLED
+		return "".join((_HEADER.pack(_MAGIC, flags, self.aLength, self.bLength, len(self)), struct.pack("<%dq" % len(self._ops), *self._ops), payloadData))
+	@classmethod
+	def from_bytes(cls, data, allowPickle=False):
+		"""
+		The header, ops and payload are checked, so a damaged patch raises `ValueError` instead of failing later in
+		`apply`. Unless `allowPickle` is `True`, this is safe for data from any source.
+		
+		@param allowPickle:	Loading a pickled payload can run any code, so only allow it for data from a trusted source.
+		@raise ValueError:	If `data` is not a valid patch, or if its payload is pickled and `allowPickle` is `False`.
+		@see `to_bytes`
+		"""
+		data = str(data)
+		if len(data) < _HEADER.size:
+			raise ValueError("Not a patch: too short")
+		magic, flags, aLength, bLength, numOps = _HEADER.unpack_from(data)
+		if magic != _MAGIC:
+			raise ValueError("Not a patch: bad header")
+		if flags & ~(_FLAG_PAYLOAD | _FLAG_PICKLED) or aLength < 0 or bLength < 0 or numOps < 0:
+			raise ValueError("Not a patch: bad header")
+		if aLength > sys.maxint or bLength > sys.maxint:
+			raise ValueError("Patch is too large for this platform")
+		opsEnd = _HEADER.size + numOps * 4 * 8
+		if len(data) < opsEnd:
+			raise ValueError("Not a patch: truncated ops")
+		ops = struct.unpack_from("<%dq" % (numOps * 4), data, _HEADER.size)
+		payloadSize = _checkOps(ops, aLength, bLength)		# so every value fits in the array
+		payload = None
+		if flags & _FLAG_PAYLOAD:
+			if flags & _FLAG_PICKLED:
+				if not allowPickle:
+					raise ValueError("Patch payload is pickled, which is only loaded with allowPickle=True")
+				try:
+					payload = pickle.loads(data[opsEnd:])
+				except Exception:
+					raise ValueError("Not a patch: bad payload")
+				if not isinstance(payload, list) or len(payload) != payloadSize:
+					raise ValueError("Not a patch: bad payload")
+			else:
+				payload, end = _decodeElems(data, opsEnd, payloadSize)
+				if end != len(data):
+					raise ValueError("Not a patch: bad payload")
+		elif len(data) > opsEnd:
+			raise ValueError("Not a patch: unexpected data after the ops")
+		return cls(array("l", ops), aLength, bLength, payload)
+	
+	def apply(self, a):
+		"""
+		Rebuilds `b` from `a`. Strings and tuples are rebuilt as the same type, and anything else as a list.
+		
+		@raise ValueError:	If `a` has a different length than the `a` the patch was made from, or if the patch inserts elements but has no payload.
+		"""
+		if len(a) != self.aLength:
+			raise ValueError("Patch was made for a sequence of length " + str(self.aLength) + ", not " + str(len(a)))
+		payload = self._payload
+		payloadIndex = 0
+		b = []
+		for op, aIndex, _, size in self:
+			if op == self.EQUAL:
+				b.extend(a[aIndex:aIndex + size])
+			elif op == self.DELETE:
+				payloadIndex += size if payload != None else 0
+			else:
+				if payload == None:
+					raise ValueError("Patch has no payload, so it can't insert elements")
+				b.extend(payload[payloadIndex:payloadIndex + size])
+				payloadIndex += size
+		if isinstance(a, basestring):
+			return a[:0].join(b)
+		if isinstance(a, tuple):
+			return tuple(b)
+		return b
+	
+	def invert(self):
+		"""
+		@return Patch:	A patch which turns `b` back into `a`. The payload is only kept if this patch has one.
+		"""
+		payload = self._payload
+		ops = array("l")
+		newPayload = [] if payload != None else None
+		payloadIndex = 0
+		deletes, inserts = [], []		# replaced region: ops of the inverted patch, with their payload
+		allOps = list(self) + [(self.EQUAL, self.aLength, self.bLength, 0)]
+		for op, aIndex, bIndex, size in allOps:
+			elems = payload[payloadIndex:payloadIndex + size] if payload != None and op != self.EQUAL else None
+			if op != self.EQUAL:
+				payloadIndex += size
+				(inserts if op == self.DELETE else deletes).append((size, elems))
+				continue
+			if deletes or inserts:
+				# the inverted region starts where this one ended on the other side
+				newA = bIndex - sum(size_ for size_, _ in deletes)
+				newB = aIndex - sum(size_ for size_, _ in inserts)
+				for newOp, parts in ((self.DELETE, deletes), (self.INSERT, inserts)):
+					for size_, elems_ in parts:
+						ops.extend((newOp, newA, newB, size_))
+						if newOp == self.DELETE:
+							newA += size_
+						else:
+							newB += size_
+						if newPayload != None:
+							newPayload.extend(elems_)
+				deletes, inserts = [], []
+			if size:
+				ops.extend((self.EQUAL, bIndex, aIndex, size))
+		return Patch(ops, self.bLength, self.aLength, newPayload)
+
+def _checkOps(ops, aLength, bLength):
+	"""
+	Checks that the ops cover all of `a` and `b` in order, as `Patch.fromBlocks` makes them.
+	
+	@return int:	Number of elements the payload must have
+	@raise ValueError:	If they don't
+	"""
+	i = j = payloadSize = 0
+	for start in xrange(0, len(ops), 4):
+		op, aIndex, bIndex, size = ops[start:start + 4]
+		if op not in (Patch.EQUAL, Patch.DELETE, Patch.INSERT) or size <= 0 or (aIndex, bIndex) != (i, j):
+			raise ValueError("Not a patch: bad op at " + str(start // 4))
+		if op != Patch.INSERT:
+			i += size
+		if op != Patch.DELETE:
+			j += size
+		if op != Patch.EQUAL:
+			payloadSize += size
+	if (i, j) != (aLength, bLength):
+		raise ValueError("Not a patch: ops don't cover both sides")
+	return payloadSize
+
+def _encodeElems(elems, parts, depth=0):
+	"""
+	Appends the encoding of each element to `parts`: a type tag, followed by the value, or by the length and the data or
+	elements.
+	
+	@raise TypeError:	If an element has a type which isn't supported
+	"""
+	if depth > _MAX_DEPTH:
+		raise TypeError("Payload is nested too deeply")
+	for elem in elems:
+		type_ = type(elem)
+		if elem is None:
+			parts.append("N")
+		elif type_ is bool:
+			parts.append("T" if elem else "F")
+		elif (type_ is int or type_ is long) and -(1 << 63) <= elem < (1 << 63):
+			parts.append(("i" if type_ is int else "I") + _INT.pack(elem))
+		elif type_ is long:
+			data = str(elem)
+			parts.append("L" + _INT.pack(len(data)) + data)
+		elif type_ is float:
+			parts.append("f" + _FLOAT.pack(elem))
+		elif type_ is str:
+			parts.append("s" + _INT.pack(len(elem)) + elem)
+		elif type_ is unicode:
+			data = elem.encode("utf-8")
+			parts.append("u" + _INT.pack(len(data)) + data)
+		elif type_ is tuple or type_ is list:
+			parts.append(("t" if type_ is tuple else "l") + _INT.pack(len(elem)))
+			_encodeElems(elem, parts, depth + 1)
+		else:
+			raise TypeError("Can't encode " + type_.__name__)
+
+def _decodeElems(data, pos, count, depth=0):
+	"""
+	Reads `count` elements written by `_encodeElems`, starting at `pos`. Every length is checked against the data left.
+	
+	@return tuple:	`(elems, pos)`, where `elems` is a list and `pos` is the index after the last element
+	@raise ValueError:	If the data is damaged
+	"""
+	if depth > _MAX_DEPTH or count > len(data) - pos:		# every element takes at least a byte
+		raise ValueError("Not a patch: bad payload")
+	elems = []
+	for _ in xrange(count):
+		if pos >= len(data):
+			raise ValueError("Not a patch: bad payload")
+		tag = data[pos]
+		pos += 1
+		if tag == "N":
+			elems.append(None)
+		elif tag == "T" or tag == "F":
+			elems.append(tag == "T")
+		elif tag == "f":
+			if len(data) - pos < _FLOAT.size:
+				raise ValueError("Not a patch: bad payload")
+			elems.append(_FLOAT.unpack_from(data, pos)[0])
+			pos += _FLOAT.size
+		elif tag in ("i", "I", "L", "s", "u", "t", "l"):
+			if len(data) - pos < _INT.size:
+				raise ValueError("Not a patch: bad payload")
+			value, = _INT.unpack_from(data, pos)
+			pos += _INT.size
+			if tag == "i" or tag == "I":
+				elems.append(int(value) if tag == "i" else long(value))
+			elif tag == "t" or tag == "l":
+				items, pos = _decodeElems(data, pos, value, depth + 1)
+				elems.append(tuple(items) if tag == "t" else items)
+			else:
+				if value < 0 or value > len(data) - pos:
+					raise ValueError("Not a patch: bad payload")
+				chunk = data[pos:pos + value]
+				pos += value
+				try:
+					elems.append(long(chunk) if tag == "L" else chunk.decode("utf-8") if tag == "u" else chunk)
+				except ValueError:		# UnicodeDecodeError is a ValueError too
+					raise ValueError("Not a patch: bad payload")
+		else:
+			raise ValueError("Not a patch: bad payload")
+	return elems, pos
+
+def _unpickle(data):
+	"""Bound class methods can't be pickled in Python 2. Unpickling is already trusted, so the payload can be pickled too."""
+	return Patch.from_bytes(data, allowPickle=True)
@@ -0,0 +1,121 @@
+from _SequenceMatcher import SequenceMatcher, _BlockSide, _ElemsBlockSide, _ElemBlockMismatch
+
+from bisect import bisect_left
+from itertools import islice
+
+def _fillWindow(buffer_, iterator, windowSize):
+	"""@return bool:	`True` if `iterator` is exhausted"""
+	wanted = windowSize - len(buffer_)
+	buffer_.extend(islice(iterator, wanted))
+	return len(buffer_) < windowSize
+
+def _uniqueAnchors(a, b):
+	"""
+	Patience diff anchors: elements which occur exactly once in both `a` and `b`, reduced to the longest sequence of them
+	which is in the same order on both sides.
+	
+	@return list:	`(i, j)` pairs in increasing order
+	"""
+	countsA = {}
+	for elem in a:
+		countsA[elem] = countsA.get(elem, 0) + 1
+	indicesB = {}
+	for j, elem in enumerate(b):
+		if countsA.get(elem) == 1:
+			indicesB[elem] = j if elem not in indicesB else None		# `None` marks elements that are not unique in `b`
+	pairs = [(i, indicesB[elem]) for i, elem in enumerate(a) if indicesB.get(elem) != None]
+	
+	# longest increasing subsequence of the `j` indices, by patience sorting
+	pileTops = []		# j of the top card on each pile
+	pileLinks = []		# (pairIndex, link to top of previous pile) of the top card on each pile
+	for pairIndex, (_, j) in enumerate(pairs):
+		pile = bisect_left(pileTops, j)
+		link = (pairIndex, pileLinks[pile - 1] if pile else None)
+		if pile == len(pileTops):
+			pileTops.append(j)
+			pileLinks.append(link)
+		else:
+			pileTops[pile] = j
+			pileLinks[pile] = link
+	anchors = []
+	link = pileLinks[-1] if pileLinks else None
+	while link != None:
+		anchors.append(pairs[link[0]])
+		link = link[1]
+	anchors.reverse()
+	return anchors
+
+def _mismatch(a, aStart, aEnd, b, bStart, bEnd, offsetA, offsetB):
+	sideA = _ElemsBlockSide(_BlockSide(offsetA + aStart, aEnd - aStart), tuple(a[aStart:aEnd])) if aEnd > aStart else _ElemsBlockSide(None, None)
+	sideB = _ElemsBlockSide(_BlockSide(offsetB + bStart, bEnd - bStart), tuple(b[bStart:bEnd])) if bEnd > bStart else _ElemsBlockSide(None, None)
+	return _ElemBlockMismatch(sideA, sideB)
+
+def _diffGap(a, aStart, aEnd, b, bStart, bEnd, offsetA, offsetB, algorithm):
+	if aStart == aEnd and bStart == bEnd:
+		return
+	if aStart == aEnd or bStart == bEnd:
+		yield _mismatch(a, aStart, aEnd, b, bStart, bEnd, offsetA, offsetB)
+		return
+	diff = SequenceMatcher(tuple(a[aStart:aEnd]), tuple(b[bStart:bEnd]), algorithm=algorithm)
+	for block in diff.get_mismatching_blocks():
+		blockA, blockB = block.a, block.b
+		yield _mismatch(a, aStart + blockA.index if blockA != None else aStart, aStart + blockA.index + blockA.size if blockA != None else aStart,
+						b, bStart + blockB.index if blockB != None else bStart, bStart + blockB.index + blockB.size if blockB != None else bStart,
+						offsetA, offsetB)
+
+def stream_mismatching(a, b, windowSize=10000, algorithm="ratcliff"):
+	"""
+	Diffs 2 iterables which may be too large to fit in memory, such as the lines of 2 very large files.
+	
+	At most `windowSize` elements of each side are held in memory at once. Inside each window, elements which occur
+	exactly once on both sides are used as anchors (as in "patience diff"), and the gaps between anchors are diffed with
+	`SequenceMatcher`. Everything up to the last anchor is then reported and dropped from the window, and the window is
+	refilled from the iterables.
+	
+	If a window has no anchors, everything up to the end of the last matching block in the window is reported instead.
+	Because of this, a long run of differences can be reported as several consecutive mismatches of at most `windowSize`
+	elements each, instead of a single mismatch.
+	
+	@param a, b:		Any iterables of hashable elements, including generators.
+	@param windowSize:	The maximum number of elements of each side to hold in memory.
+	@param algorithm:	@see `SequenceMatcher.__init__`
+	
+	@return generator:	`ElemBlockMismatch` objects, the same as `SequenceMatcher.get_mismatching()`, except that `elems` are tuples.
+	"""
+	if windowSize < 1:
+		raise ValueError("windowSize must be at least 1")
+	iterA, iterB = iter(a), iter(b)
+	windowA, windowB = [], []
+	offsetA = offsetB = 0		# index of the first element of each window in the whole iterable
+	while True:
+		exhaustedA = _fillWindow(windowA, iterA, windowSize)
+		exhaustedB = _fillWindow(windowB, iterB, windowSize)
+		if len(windowA) == 0 and len(windowB) == 0:
+			return
+		
+		anchors = _uniqueAnchors(windowA, windowB)
+		if exhaustedA and exhaustedB:
+			endA, endB = len(windowA), len(windowB)
+		elif len(anchors) != 0:
+			endA, endB = anchors[-1][0] + 1, anchors[-1][1] + 1
+		elif len(windowA) == 0 or len(windowB) == 0:
+			endA, endB = len(windowA), len(windowB)
+		else:
+			blocks = list(SequenceMatcher(tuple(windowA), tuple(windowB), algorithm=algorithm).get_matching_blocks())
+			if len(blocks) != 0:
+				endA, endB = blocks[-1].a.index + blocks[-1].size, blocks[-1].b.index + blocks[-1].size
+			else:
+				endA, endB = len(windowA), len(windowB)
+		
+		gapStartA = gapStartB = 0
+		for i, j in anchors:
+			for mismatch in _diffGap(windowA, gapStartA, i, windowB, gapStartB, j, offsetA, offsetB, algorithm):
+				yield mismatch
+			gapStartA, gapStartB = i + 1, j + 1
+		for mismatch in _diffGap(windowA, gapStartA, endA, windowB, gapStartB, endB, offsetA, offsetB, algorithm):
+			yield mismatch
+		
+		del windowA[:endA]
+		del windowB[:endB]
+		offsetA += endA
+		offsetB += endB
@@ -0,0 +1,60 @@
+from itertools import izip
+
+class SequenceView(object):
+	"""
+	A read-only view of `sequence[start:stop]`, which doesn't copy any elements. Creating a view is O(1), no matter how
+	many elements it covers.
+	
+	Supports `len`, indexing, slicing (which returns another view), iteration, and comparison with tuples, lists and
+	other views, so it can be used in most places where a tuple was used before. Like a tuple, it is never equal to a
+	string, even one with the same characters, because it hashes like a tuple. Elements are read from the underlying sequence when
+	they are accessed, so the view sees any later changes to it.
+	
+	If `decode` is given, it is called on each element of `sequence` before it is returned, such as to map interned
+	tokens back to the original elements.
+	"""
+	__slots__ = ("_sequence", "_start", "_stop", "_decode")
+	
+	def __init__(self, sequence, start, stop, decode=None):
+		self._sequence = sequence
+		self._start = start
+		self._stop = stop
+		self._decode = decode
+	
+	def __len__(self):
+		return self._stop - self._start
+	
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(len(self))
+			if step != 1:
+				return tuple(self)[index]
+			return SequenceView(self._sequence, self._start + start, self._start + max(start, stop), self._decode)
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("SequenceView index out of range")
+		elem = self._sequence[self._start + index]
+		return self._decode(elem) if self._decode != None else elem
+	
+	def __iter__(self):
+		sequence, decode = self._sequence, self._decode
+		for index in xrange(self._start, self._stop):
+			yield decode(sequence[index]) if decode != None else sequence[index]
+	
+	def __eq__(self, other):
+		if not isinstance(other, (tuple, list, SequenceView)):
+			return NotImplemented
+		if len(self) != len(other):
+			return False
+		return all(elemA == elemB for elemA, elemB in izip(self, other))
+	def __ne__(self, other):
+		equal = self.__eq__(other)
+		return equal if equal is NotImplemented else not equal
+	def __hash__(self):
+		return hash(tuple(self))		# equal to a tuple of the same elements, so it also hashes like one
+	
+	def __str__(self):
+		return str(tuple(self))
+	def __repr__(self):
+		return repr(tuple(self))
@@ -1,4 +1,4 @@
-from Lang.Struct import OrderedSet
+from Lang.Struct import ConcurrentOrderedSet
 import sys
 
 class EventReceiver(object):
@@ -27,7 +27,7 @@ class EventProxy(EventReceiver):
 		@param errorOnMethodNotFound	bool:	If `True`, it is an error when a receiver doesn't implement a method. If `False`, that receiver is simply skipped. Note that if the special method `notifyException` is not implemented, no error will be raised from this class.
 		"""
 		self.errorOnMethodNotFound = errorOnMethodNotFound
-		self._receivers = OrderedSet()
+		self._receivers = ConcurrentOrderedSet()
 		self._tieInExceptHook()
 	
 	def _tieInExceptHook(self):
@@ -1,29 +1,245 @@
-class LIFOstack(object):
-	"""Standard LIFO stack based on a list."""
-	def __init__(self):
-		self._list = []
-	def push(self, item):
-		self._list.append(item)
+"""
+Stacks and queues which share the same interface: `push(item)`, `pop()` for the next item, `peek(index=1)` to look at
+the next item without removing it, and `len`.
+"""
+from abc import ABCMeta
+from collections import deque
+from itertools import count
+import heapq
+
+class _LIFOstackMethods(object):
+	"""Methods shared by `LIFOstack` and `_RingLIFOstack`, which only need `_asList`"""
+	__slots__ = ()
+	
+	def __eq__(self, other):
+		if isinstance(other, LIFOstack):
+			return self._asList() == other._asList()
+		return False
+	def __ne__(self, other):
+		return not (self == other)
+	
+	def __str__(self):
+		return str(self._asList())
+	def __repr__(self):
+		return repr(self._asList())
+
+class LIFOstack(_LIFOstackMethods):
+	"""
+	Standard LIFO stack based on a list.
+	
+	`push` and `pop` are the `append` and `pop` methods of the list itself, so they cost no more than using a list.
+	
+	If `capacity` is given, the stack is a ring buffer of that size instead: when it is full, pushing an item drops the
+	item at the bottom of the stack. Pushing never allocates memory in this mode. Only `LIFOstack` itself has this mode,
+	so subclasses may take any constructor arguments.
+	"""
+	__metaclass__ = ABCMeta		# so that the ring buffer stack, which doesn't share the slots of this one, is an instance too
+	__slots__ = ("_list", "push", "pop")
+	
+	def __new__(cls, *args, **kwargs):
+		if cls is LIFOstack and (args[0] if args else kwargs.get("capacity")) is not None:
+			stack = object.__new__(_RingLIFOstack)
+			stack.__init__(*args, **kwargs)		# not called by `LIFOstack(...)`, since it's not a subclass
+			return stack
+		return object.__new__(cls)
+	
+	def __init__(self, capacity=None):
+		self._setList([])
+	def _setList(self, list_):
+		self._list = list_
+		# set through the slots, so that methods named `push` or `pop` in a subclass aren't hidden by these
+		LIFOstack.push.__set__(self, list_.append)
+		LIFOstack.pop.__set__(self, list_.pop)
+	
+	def __getstate__(self):
+		"""`push` and `pop` are bound to the list, so they must be bound again to the list of a copy"""
+		return (list(self._list), getattr(self, "__dict__", None))		# subclasses without `__slots__` have a `__dict__`
+	def __setstate__(self, state):
+		self._setList(state[0])
+		if state[1]:
+			self.__dict__.update(state[1])
+	
 	def peek(self, index=1):
 		return self._list[-index]
 	
-	def pop(self, *args, **kwargs):
-		return self._list.pop(*args, **kwargs)
-	def __getitem__(self, *args, **kwargs):
-		return self._list.__getitem__(*args, **kwargs)
-	def __setitem__(self, *args, **kwargs):
-		return self._list.__setitem__(*args, **kwargs)
-	def __len__(self, *args, **kwargs):
+	def _asList(self):
+		"""@return list:	The items, from the bottom of the stack to the top"""
+		return self._list
+	
+	def __getitem__(self, index):
+		return self._list[index]
+	def __setitem__(self, index, item):
+		self._list[index] = item
+	def __len__(self):
 		return len(self._list)
+
+class _RingLIFOstack(_LIFOstackMethods):
+	"""`LIFOstack` with a fixed capacity. @see `LIFOstack`"""
+	__slots__ = ("capacity", "_items", "_top", "_size")
+	
+	def __init__(self, capacity):
+		if capacity < 1:
+			raise ValueError("capacity must be at least 1")
+		self.capacity = capacity
+		self._setItems([])
+	def _setItems(self, items):
+		"""Replaces all items, keeping only the top `capacity` of them"""
+		items = items[-self.capacity:]
+		self._items = items + [None] * (self.capacity - len(items))
+		self._top = len(items) - 1		# slot of the top item
+		self._size = len(items)
+	
+	def __getstate__(self):
+		return (self.capacity, self._asList())
+	def __setstate__(self, state):
+		self.capacity = state[0]
+		self._setItems(state[1])
+	
+	def push(self, item):
+		top = self._top + 1
+		if top == self.capacity:
+			top = 0
+		self._items[top] = item
+		self._top = top
+		if self._size != self.capacity:
+			self._size += 1
+	
+	def pop(self):
+		if self._size == 0:
+			raise IndexError("pop from empty stack")
+		top = self._top
+		item = self._items[top]
+		self._items[top] = None		# don't keep the item alive
+		self._top = top - 1 if top != 0 else self.capacity - 1
+		self._size -= 1
+		return item
+	
+	def peek(self, index=1):
+		if 0 < index <= self._size:
+			return self._items[self._top - index + 1]		# a negative list index wraps around the ring
+		return self[-index]
+	
+	def _slot(self, index):
+		if not isinstance(index, (int, long)):
+			raise TypeError("stack indices must be integers or slices")
+		if index < 0:
+			index += self._size
+		if index < 0 or index >= self._size:
+			raise IndexError("stack index out of range")
+		return (self._top - self._size + 1 + index) % self.capacity
+	
+	def _asList(self):
+		return [self._items[self._slot(index)] for index in xrange(self._size)]
+	
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self._asList()[index]
+		return self._items[self._slot(index)]
+	def __setitem__(self, index, item):
+		if isinstance(index, slice):		# like a list, but only the top `capacity` items are kept
+			items = self._asList()
+			items[index] = item
+			self._setItems(items)
+			return
+		self._items[self._slot(index)] = item
+	def __len__(self):
+		return self._size
+
+LIFOstack.register(_RingLIFOstack)
+
+class FIFOqueue(object):
+	"""
+	Standard FIFO queue based on a `collections.deque`. `push` adds an item at the back, and `pop` removes the item at the
+	front. Indexing starts at the front.
+	
+	If `capacity` is given, pushing an item onto a full queue drops the item at the front.
+	"""
+	__slots__ = ("_deque", "push", "pop")
+	
+	def __init__(self, capacity=None):
+		self._setDeque(deque(maxlen=capacity))
+	def _setDeque(self, deque_):
+		self._deque = deque_
+		self.push = deque_.append
+		self.pop = deque_.popleft
+	
+	def __getstate__(self):
+		"""@see `LIFOstack.__getstate__`"""
+		return (list(self._deque), self._deque.maxlen)
+	def __setstate__(self, state):
+		self._setDeque(deque(*state))
+	
+	def peek(self, index=1):
+		return self._deque[index - 1]
+	
+	def __getitem__(self, index):
+		return self._deque[index]
+	def __setitem__(self, index, item):
+		self._deque[index] = item
+	def __len__(self):
+		return len(self._deque)
 	
 	def __eq__(self, other):
-		if isinstance(other, LIFOstack):
-			return self._list == other._list
+		if isinstance(other, FIFOqueue):
+			return self._deque == other._deque
+		return False
+	def __ne__(self, other):
+		return not (self == other)
+	
+	def __str__(self):
+		return str(list(self._deque))
+	def __repr__(self):
+		return repr(list(self._deque))
+
+class PriorityQueue(object):
+	"""
+	Priority queue based on a binary heap. `pop` removes the smallest item, or the item with the smallest `key(item)` if
+	`key` is given. Items with equal priority are popped in the order they were pushed.
+	"""
+	__slots__ = ("_heap", "_key", "_counter")
+	
+	def __init__(self, key=None):
+		self._heap = []			# (priority, order pushed, item)
+		self._key = key
+		self._counter = count()
+	
+	def __getstate__(self):
+		return (list(self._heap), self._key, next(self._counter))		# skipping a number of the counter doesn't change the order
+	def __setstate__(self, state):
+		self._heap, self._key, nextCount = state
+		self._counter = count(nextCount)
+	
+	def push(self, item):
+		heapq.heappush(self._heap, (item if self._key is None else self._key(item), next(self._counter), item))
+	
+	def pop(self):
+		if len(self._heap) == 0:
+			raise IndexError("pop from empty priority queue")
+		return heapq.heappop(self._heap)[2]
+	
+	def peek(self, index=1):
+		"""@return:	The item which `pop` would return after `index - 1` other pops. O(1) for the next item, O(n log index) otherwise."""
+		if index < 1 or index > len(self._heap):
+			raise IndexError("priority queue index out of range")
+		if index == 1:
+			return self._heap[0][2]
+		return heapq.nsmallest(index, self._heap)[-1][2]
+	
+	def __len__(self):
+		return len(self._heap)
+	
+	def _asList(self):
+		"""@return list:	The items, in the order they would be popped"""
+		return [entry[2] for entry in sorted(self._heap)]
+	
+	def __eq__(self, other):
+		if isinstance(other, PriorityQueue):
+			return self._asList() == other._asList()
 		return False
 	def __ne__(self, other):
 		return not (self == other)
 	
-	def __str__(self, *args, **kwargs):
-		return self._list.__str__(*args, **kwargs)
-	def __repr__(self, *args, **kwargs):
-		return self._list.__repr__(*args, **kwargs)
+	def __str__(self):
+		return str(self._asList())
+	def __repr__(self):
+		return repr(self._asList())
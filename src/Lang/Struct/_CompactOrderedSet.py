@@ -0,0 +1,168 @@
+from _OrderedSet import AbstractOrderedSet, OrderedSetView
+
+_TOMBSTONE = object()		# marks the slot of a discarded key, until the next compaction
+_MIN_COMPACT = 16			# don't bother compacting fewer tombstones than this
+
+class CompactOrderedSet(AbstractOrderedSet):
+	"""
+	An `OrderedSet` which uses much less memory per element, for sets with millions of elements.
+	
+	Insertion order is kept in a plain list of keys, and a dict maps each key to its slot in that list. There are no
+	`Link` objects or weak references. Discarded keys leave a tombstone in their slot, and the list is compacted once
+	tombstones take up half of it, so `add`, `discard`, `pop` and `replace` are O(1) (amortized).
+	
+	Compared to `OrderedSet`:
+	
+	- `insertBefore`, `insertAt` and `insertMultiBefore` are O(n), because the slots of the keys after the insertion
+	  point move
+	- `__getitem__` and `index` are O(1) if nothing was discarded since the last compaction, and O(n) otherwise
+	"""
+	def __init__(self, iterable=None):
+		self.__keys = []			# keys in order, with `_TOMBSTONE` in the slots of discarded keys
+		self.__slots = {}			# key --> slot in self.__keys
+		self.__tombstones = 0
+		if iterable is not None:
+			keys, slots = self.__keys, self.__slots
+			for key in iterable:
+				if key not in slots:
+					slots[key] = len(keys)
+					keys.append(key)
+	
+	def _compact(self):
+		"""Removes all tombstones, so that slots are the same as indices"""
+		if self.__tombstones == 0:
+			return
+		self.__keys = keys = [key for key in self.__keys if key is not _TOMBSTONE]
+		slots = self.__slots
+		for slot, key in enumerate(keys):
+			slots[key] = slot
+		self.__tombstones = 0
+	
+	def _getPositiveIndex(self, index):
+		if not isinstance(index, (int, long)):
+			raise TypeError("Incorrect index type for OrderedSet")
+		if index < 0:
+			index = len(self) + index
+		if index >= len(self) or index < 0:
+			raise KeyError("Index out of range")
+		return index
+	
+	def __getitem__(self, indexOrSlice):
+		if isinstance(indexOrSlice, slice):
+			return OrderedSetView(self, indexOrSlice)
+		self._compact()
+		return self.__keys[self._getPositiveIndex(indexOrSlice)]
+	
+	def _iterSlice(self, start, stop, step):
+		self._compact()
+		keys = self.__keys
+		for index in xrange(start, stop, step):
+			yield keys[index]
+	
+	def __setitem__(self, indexOrSlice, value):
+		if isinstance(indexOrSlice, slice):
+			return self._setSlice(indexOrSlice, value)
+		self.replace(self[indexOrSlice], value)
+	
+	def __delitem__(self, indexOrSlice):
+		if isinstance(indexOrSlice, slice):
+			return self._delSlice(indexOrSlice)
+		return self.discard(self[indexOrSlice])
+	
+	def index(self, elem):
+		if elem not in self.__slots:
+			raise ValueError(str(elem) + " is not in OrderedList")
+		self._compact()
+		return self.__slots[elem]
+	
+	def replace(self, oldElem, newElem):
+		"""Puts `newElem` in the place of `oldElem`, in O(1)"""
+		if oldElem not in self.__slots:
+			raise ValueError(str(oldElem) + " is not in OrderedList")
+		if oldElem == newElem:
+			return
+		self.discard(newElem)
+		slot = self.__slots.pop(oldElem)
+		self.__keys[slot] = newElem
+		self.__slots[newElem] = slot
+	
+	def insertBefore(self, newElemBefore, oldElemAfter, updateOnExist):
+		"""
+		Inserts newElemBefore into the current position of oldElemAfter. oldElemAfter will then come after newElemBefore.
+		
+		@return bool:	`True` if inserted, `False` if not inserted because it already exists and `updateOnExist` is `False`.
+		"""
+		if oldElemAfter not in self.__slots:
+			raise KeyError(oldElemAfter)
+		if newElemBefore in self.__slots:
+			if not updateOnExist:
+				return False
+			if newElemBefore == oldElemAfter:		# already in place
+				return True
+			self.discard(newElemBefore)
+		self._compact()
+		slot = self.__slots[oldElemAfter]
+		keys, slots = self.__keys, self.__slots
+		keys.insert(slot, newElemBefore)
+		for movedSlot in xrange(slot, len(keys)):
+			slots[keys[movedSlot]] = movedSlot
+		return True
+	
+	def insertMultiBefore(self, newElemsBefore, oldElemAfter, updateOnExist):
+		"""
+		@return bool:	`True` if all elements were inserted, `False` otherwise.
+		"""
+		if oldElemAfter not in self.__slots:
+			raise ValueError("oldElemAfter not in OrderedSet")
+		allInserted = True
+		for newElemBefore in reversed(newElemsBefore):
+			wasInserted = self.insertBefore(newElemBefore, oldElemAfter, updateOnExist)
+			allInserted = allInserted and wasInserted
+			if wasInserted:
+				oldElemAfter = newElemBefore
+		return allInserted
+	
+	def add(self, elem, updateOnExist=False):
+		"""Same as `append`"""
+		if elem in self.__slots:
+			if not updateOnExist:
+				return False
+			self.discard(elem)
+		self.__slots[elem] = len(self.__keys)
+		self.__keys.append(elem)
+		return True
+	
+	def discard(self, elem):
+		if elem not in self.__slots:
+			return
+		keys = self.__keys
+		keys[self.__slots.pop(elem)] = _TOMBSTONE
+		self.__tombstones += 1
+		while len(keys) != 0 and keys[-1] is _TOMBSTONE:		# so that the last key is never a tombstone
+			keys.pop()
+			self.__tombstones -= 1
+		if self.__tombstones >= _MIN_COMPACT and self.__tombstones * 2 >= len(keys):
+			self._compact()
+	
+	def pop(self):
+		if len(self) == 0:
+			raise KeyError("set is empty")
+		elem = self.__keys[-1]
+		self.discard(elem)
+		return elem
+	
+	def __contains__(self, elem):
+		return elem in self.__slots
+	
+	def __iter__(self):
+		for key in self.__keys:
+			if key is not _TOMBSTONE:
+				yield key
+	
+	def __reversed__(self):
+		for key in reversed(self.__keys):
+			if key is not _TOMBSTONE:
+				yield key
+	
+	def __len__(self):
+		return len(self.__slots)
@@ -0,0 +1,116 @@
+from _OrderedSet import AbstractOrderedSet, OrderedSetView, OrderedSet
+
+import threading
+
+def _locked(name):
+	"""Makes a method which calls the method `name` of the inner set while holding the lock, then drops the snapshot"""
+	def method(self, *args, **kwargs):
+		args = [self._ownElems(arg) for arg in args]
+		kwargs = dict((key, self._ownElems(arg)) for key, arg in kwargs.iteritems())
+		with self._lock:
+			self._changing = True
+			try:
+				return getattr(self._set, name)(*args, **kwargs)
+			finally:
+				self._changing = False
+				self._snapshot = None
+	method.__name__ = name
+	method.__doc__ = getattr(OrderedSet, name).__doc__
+	return method
+
+class ConcurrentOrderedSet(AbstractOrderedSet):
+	"""
+	A thread-safe ordered set, for registries which many threads change and iterate over at the same time.
+	
+	Every change holds a lock while it changes an inner ordered set. Reads don't take the lock: iteration, indexing and
+	slicing use a tuple snapshot of the elements, which is built once after a change and then shared by all readers until
+	the next change. So iterating never sees a half-finished change, and never fails because another thread changed the
+	set in the meantime. Membership tests and `len` use the inner set directly, so they are always current.
+	
+	Building the snapshot is O(n), so this is best for sets which are read more often than they are changed.
+	
+	There is one lock per set rather than one per element or region: a change of `OrderedSet` relinks the neighbouring
+	elements, and `IndexedOrderedSet` updates the block index, so no part of the inner set can be changed independently
+	of the rest. Since readers never take the lock, it is only contended by concurrent changes.
+	"""
+	def __init__(self, iterable=None, setClass=OrderedSet):
+		"""
+		@param setClass	class:	The ordered set class which holds the elements, such as `IndexedOrderedSet` for large sets.
+		"""
+		self._lock = threading.RLock()		# reentrant, in case reading the arguments of a change reads this set
+		self._set = setClass()
+		self._snapshot = None		# tuple of the elements, or `None` after a change
+		self._changing = False
+		if iterable is not None:
+			self.extend(iterable)
+	
+	def snapshot(self):
+		"""
+		@return tuple:	The elements of the set. It isn't changed by later changes of the set.
+		"""
+		snapshot = self._snapshot
+		if snapshot is None:
+			with self._lock:
+				snapshot = self._snapshot
+				if snapshot is None:
+					snapshot = tuple(self._set)
+					if not self._changing:		# else it's read in the middle of a change, so it must not be shared
+						self._snapshot = snapshot
+		return snapshot
+	
+	def _ownElems(self, arg):
+		"""
+		@return:	A snapshot of `arg` if it is this set or a view of it, so that the inner set isn't read while it is
+					being changed, else `arg`
+		"""
+		if arg is self:
+			return self.snapshot()
+		if isinstance(arg, OrderedSetView) and arg._set is self:
+			return tuple(arg)
+		return arg
+	
+	add = _locked("add")
+	discard = _locked("discard")
+	pop = _locked("pop")
+	replace = _locked("replace")
+	insertAt = _locked("insertAt")
+	insertBefore = _locked("insertBefore")
+	insertMultiBefore = _locked("insertMultiBefore")
+	extend = _locked("extend")
+	update = _locked("update")
+	difference_update = _locked("difference_update")
+	clear = _locked("clear")
+	__setitem__ = _locked("__setitem__")
+	__delitem__ = _locked("__delitem__")
+	
+	def __getitem__(self, indexOrSlice):
+		if isinstance(indexOrSlice, slice):
+			return OrderedSetView(self, indexOrSlice)
+		if not isinstance(indexOrSlice, (int, long)):
+			raise TypeError("Incorrect index type for OrderedSet")
+		try:
+			return self.snapshot()[indexOrSlice]
+		except IndexError:
+			raise KeyError("Index out of range")
+	
+	def _iterSlice(self, start, stop, step):
+		snapshot = self.snapshot()
+		return (snapshot[index] for index in xrange(start, stop, step) if index < len(snapshot))
+	
+	def index(self, elem):
+		try:
+			return self.snapshot().index(elem)
+		except ValueError:
+			raise ValueError(str(elem) + " is not in OrderedList")
+	
+	def __contains__(self, elem):
+		return elem in self._set
+	
+	def __iter__(self):
+		return iter(self.snapshot())
+	
+	def __reversed__(self):
+		return reversed(self.snapshot())
+	
+	def __len__(self):
+		return len(self._set)
@@ -1,9 +1,21 @@
-import copy
+from _hashing import freeze, needsFreezing, itemsHash, finalHash
+
+import threading
+import weakref
+
+def _freeze(value, lazy, intern):
+	"""@see `_hashing.freeze`. Nested dicts are converted to `FrozenDict` the same way as the dict they are in."""
+	if intern:
+		return freeze(value, FrozenDict.interned)
+	return freeze(value, lambda dict_: FrozenDict._make((dict_,), {}, lazy))
 
 class FrozenDict(dict):
 	"""
 	An immutable, hashable dictionary.
 	
+	Nested dicts are converted to `FrozenDict`, lists and tuples to tuples, sets to frozensets and bytearrays to bytes. Use `FrozenDict.lazy(...)` to convert them
+	only when they are accessed, or `FrozenDict.interned(...)` to share one instance between equal dictionaries.
+	
 	Based on:
 	http://code.activestate.com/recipes/414283/
 	"""
@@ -15,41 +27,162 @@ class FrozenDict(dict):
 	__delitem__ = __setitem__ = clear = _blocked_attribute
 	pop = popitem = setdefault = update = _blocked_attribute
 	
+	__slots__ = ("_cached_hash", "_interned", "__weakref__")
+	_internTable = {}		# hash --> list of `KeyedRef`s to the interned FrozenDicts with that hash, since different dicts can have the same hash
+	_internLock = threading.RLock()		# reentrant, because an interned dict can be garbage collected while the lock is held
+	
 	def __new__(cls, *args, **kw):
+		return cls._make(args, kw, lazy=False)
+	
+	def __init__(self, *args, **kw):
+		pass
+	
+	@classmethod
+	def _make(cls, args, kw, lazy, intern=False):
+		if lazy:
+			cls = _LazyFrozenDict
 		new = dict.__new__(cls)
+		dict.__init__(new, *args, **kw)
+		if lazy:
+			new._unfrozen = set(key for key, value in dict.iteritems(new) if needsFreezing(value))
+			return new
+		for key in [key for key, value in dict.iteritems(new) if needsFreezing(value)]:
+			dict.__setitem__(new, key, _freeze(dict.__getitem__(new, key), lazy, intern))
+		try:
+			new._cached_hash = finalHash(itemsHash(dict.iteritems(new)))
+		except TypeError:		# not hashable, so `__hash__` will raise
+			pass
+		return new
+	
+	@classmethod
+	def lazy(cls, *args, **kw):
+		"""
+		Same as `FrozenDict(...)`, except that nested dicts and lists are converted the first time they are accessed, instead
+		of all at once. This is faster when only part of a large document is read.
 		
-		args_ = []
-		for arg in args:
-			if isinstance(arg, dict):
-				arg = copy.copy(arg)
-				for k, v in arg.items():
-					if isinstance(v, dict):
-						arg[k] = FrozenDict(v)
-					elif isinstance(v, list):
-						v_ = list()
-						for elm in v:
-							if isinstance(elm, dict):
-								v_.append(FrozenDict(elm))
-							else:
-								v_.append(elm)
-						arg[k] = tuple(v_)
-				args_.append(arg)
-			else:
-				args_.append(arg)
+		Nested values aren't copied, so they must not be changed afterwards. C code which reads the dict directly, such as
+		`dict(lazy)`, `{}.update(lazy)` or `f(**lazy)`, doesn't convert them either, and gets the original mutable values.
+		Use `lazy.copy()` to get a `dict` of converted values.
+		"""
+		return cls._make(args, kw, lazy=True)
+	
+	@classmethod
+	def interned(cls, *args, **kw):
+		"""
+		Same as `FrozenDict(...)`, except that if an equal interned `FrozenDict` already exists, that instance is returned
+		instead. Nested dicts are interned too, so repeated sub-documents share one instance, and comparing interned
+		instances is an identity check. Interned instances are only kept while they are used elsewhere.
 		
-		dict.__init__(new, *args_, **kw)
+		All values must be hashable, after converting nested dicts and lists.
+		"""
+		new = cls._make(args, kw, lazy=False, intern=True)
+		hash_ = hash(new)
+		with FrozenDict._internLock:
+			refs = FrozenDict._internTable.get(hash_, [])
+			for ref in tuple(refs):		# a copy, since garbage collection can remove from it
+				existing = ref()
+				if existing is not None and type(existing) is cls and dict.__eq__(existing, new):
+					return existing
+			new._interned = True
+			refs.append(weakref.KeyedRef(new, _forgetInterned, hash_))
+			FrozenDict._internTable[hash_] = refs		# again, in case it was removed when it became empty
 		return new
 	
-	def __init__(self, *args, **kw):
+	def _freezeAll(self):
+		"""Converts any nested values which haven't been converted yet"""
 		pass
 	
 	def __hash__(self):
 		try:
 			return self._cached_hash
 		except AttributeError:
-			self._cached_hash = hash(frozenset(self.items()))
+			self._cached_hash = finalHash(itemsHash(self.iteritems()))
 			return self._cached_hash
 	
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if isinstance(other, FrozenDict):
+			# equal interned dicts of the same class are the same instance
+			if type(self) is type(other) and getattr(self, "_interned", False) and getattr(other, "_interned", False):
+				return False
+			selfHash, otherHash = getattr(self, "_cached_hash", None), getattr(other, "_cached_hash", None)
+			if selfHash is not None and otherHash is not None and selfHash != otherHash:
+				return False
+			other._freezeAll()
+		self._freezeAll()
+		return dict.__eq__(self, other)
+	def __ne__(self, other):
+		return not (self == other)
+	
 	def __repr__(self):
-		return self.__class__.__name__ + "(" + dict.__repr__(self) + ")"
+		self._freezeAll()
+		name = FrozenDict.__name__ if type(self) is _LazyFrozenDict else self.__class__.__name__
+		return name + "(" + dict.__repr__(self) + ")"
+	
+	def __reduce__(self):
+		"""
+		The default pickling of dict subclasses sets the items one at a time, which a `FrozenDict` doesn't allow, and
+		protocols 0 and 1 can't pickle `__slots__` at all. Lazy dicts are unpickled as `FrozenDict`, and interned ones
+		are interned again.
+		"""
+		self._freezeAll()
+		cls = FrozenDict if type(self) is _LazyFrozenDict else self.__class__
+		return (_unpickle, (cls, dict(self), getattr(self, "_interned", False)))
 
+def _unpickle(cls, items, interned):
+	"""Bound class methods can't be pickled in Python 2"""
+	return cls.interned(items) if interned else cls(items)
+
+def _forgetInterned(ref):
+	"""Removes the `KeyedRef` of an interned `FrozenDict` which was garbage collected"""
+	with FrozenDict._internLock:
+		refs = FrozenDict._internTable.get(ref.key)
+		if refs is None:
+			return
+		refs[:] = [otherRef for otherRef in refs if otherRef is not ref]
+		if len(refs) == 0:
+			del FrozenDict._internTable[ref.key]
+
+class _LazyFrozenDict(FrozenDict):
+	"""
+	A `FrozenDict` with some nested values which haven't been converted yet. They are converted when accessed, or by
+	methods which need all of them.
+	"""
+	__slots__ = ("_unfrozen",)
+	
+	def _freezeValue(self, key, value):
+		value = _freeze(value, lazy=True, intern=False)
+		dict.__setitem__(self, key, value)
+		self._unfrozen.discard(key)
+		return value
+	
+	def _freezeAll(self):
+		for key in list(self._unfrozen):
+			self._freezeValue(key, dict.__getitem__(self, key))
+	
+	def __getitem__(self, key):
+		value = dict.__getitem__(self, key)
+		if key in self._unfrozen:
+			return self._freezeValue(key, value)
+		return value
+	
+	def get(self, key, default=None):
+		if key in self:
+			return self[key]
+		return default
+	
+	def _frozenFirst(method):
+		def wrapper(self, *args):
+			self._freezeAll()
+			return method(self, *args)
+		wrapper.__name__ = method.__name__
+		return wrapper
+	values = _frozenFirst(dict.values)
+	itervalues = _frozenFirst(dict.itervalues)
+	viewvalues = _frozenFirst(dict.viewvalues)
+	items = _frozenFirst(dict.items)
+	iteritems = _frozenFirst(dict.iteritems)
+	viewitems = _frozenFirst(dict.viewitems)
+	copy = _frozenFirst(dict.copy)
+	del _frozenFirst
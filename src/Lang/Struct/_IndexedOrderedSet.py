@@ -0,0 +1,284 @@
+from _OrderedSet import AbstractOrderedSet, OrderedSetView
+
+from itertools import islice
+
+_BLOCK_SIZE = 256		# blocks are split in half when they grow to twice this size, and merged when they shrink below half of it
+
+class _Block(object):
+	__slots__ = ("keys", "position")
+	def __init__(self, keys, position):
+		self.keys = keys
+		self.position = position		# index of this block in `IndexedOrderedSet._blocks`
+
+class _FenwickTree(object):
+	"""Prefix sums of block sizes, for finding the block which holds a given index in O(log(number of blocks))"""
+	__slots__ = ("_tree",)
+	
+	def __init__(self, sizes):
+		tree = [0] + list(sizes)
+		for i in xrange(1, len(tree)):
+			parent = i + (i & -i)
+			if parent < len(tree):
+				tree[parent] += tree[i]
+		self._tree = tree
+	
+	def add(self, position, delta):
+		tree = self._tree
+		i = position + 1
+		while i < len(tree):
+			tree[i] += delta
+			i += i & -i
+	
+	def prefix(self, position):
+		"""@return int:	Sum of the sizes of the blocks before `position`"""
+		tree = self._tree
+		total = 0
+		i = position
+		while i > 0:
+			total += tree[i]
+			i -= i & -i
+		return total
+	
+	def find(self, index):
+		"""@return tuple:	`(position, offset)` of the block which holds `index`, and of `index` inside that block"""
+		tree = self._tree
+		position = 0
+		step = 1
+		while step * 2 < len(tree):
+			step *= 2
+		while step > 0:
+			if position + step < len(tree) and tree[position + step] <= index:
+				position += step
+				index -= tree[position]
+			step //= 2
+		return position, index
+
+class IndexedOrderedSet(AbstractOrderedSet):
+	"""
+	An `OrderedSet` with fast positional access, for large sets which are indexed often.
+	
+	Elements are kept in a list of blocks of a few hundred elements each, and a Fenwick tree of the block sizes finds the
+	block which holds any index in O(log n). A block which shrinks below half the block size is merged with its neighbour,
+	so deleting many elements doesn't leave behind many small blocks. A map of elements to their blocks keeps membership
+	tests O(1).
+	
+	Compared to `OrderedSet`:
+	
+	- `__getitem__`, `__setitem__`, `__delitem__`, `index`, `insertAt` and `insertBefore` are O(log n) instead of O(n)
+	  (plus a scan of a single block)
+	- slicing is O(log n + k), where k is the size of the slice
+	- slice assignment and slice deletion move or remove the k elements one at a time, so they are O(k log n) plus a scan
+	  of a single block per element. Each time a block is split, merged or removed, the Fenwick tree is rebuilt in
+	  O(number of blocks)
+	- `add`, `discard` and iteration are about as fast, and each element uses much less memory
+	"""
+	def __init__(self, iterable=None):
+		self.__map = {}			# key --> _Block
+		self.__blocks = []
+		if iterable is not None:
+			keys = []
+			for key in iterable:
+				if key not in self.__map:
+					self.__map[key] = None
+					keys.append(key)
+			for start in xrange(0, len(keys), _BLOCK_SIZE):
+				block = _Block(keys[start:start + _BLOCK_SIZE], len(self.__blocks))
+				self.__blocks.append(block)
+				for key in block.keys:
+					self.__map[key] = block
+		self.__sizes = _FenwickTree(len(block.keys) for block in self.__blocks)
+	
+	def _reindexBlocks(self, start=0):
+		"""Called after blocks are added or removed"""
+		for position in xrange(start, len(self.__blocks)):
+			self.__blocks[position].position = position
+		self.__sizes = _FenwickTree(len(block.keys) for block in self.__blocks)
+	
+	def _getPositiveIndex(self, index):
+		if not isinstance(index, (int, long)):
+			raise TypeError("Incorrect index type for OrderedSet")
+		if index < 0:
+			index = len(self) + index
+		if index >= len(self) or index < 0:
+			raise KeyError("Index out of range")
+		return index
+	
+	def _insertKey(self, index, key):
+		"""Inserts `key`, which must not be in the set, so that it will be at `index`"""
+		blocks = self.__blocks
+		if len(blocks) == 0:
+			blocks.append(_Block([], 0))
+			self.__sizes = _FenwickTree((0,))
+		if index == len(self):
+			block, offset = blocks[-1], len(blocks[-1].keys)
+		else:
+			position, offset = self.__sizes.find(index)
+			block = blocks[position]
+		block.keys.insert(offset, key)
+		self.__map[key] = block
+		if len(block.keys) >= 2 * _BLOCK_SIZE:
+			newBlock = _Block(block.keys[_BLOCK_SIZE:], block.position + 1)
+			del block.keys[_BLOCK_SIZE:]
+			for movedKey in newBlock.keys:
+				self.__map[movedKey] = newBlock
+			blocks.insert(newBlock.position, newBlock)
+			self._reindexBlocks(newBlock.position)
+		else:
+			self.__sizes.add(block.position, 1)
+	
+	def _locate(self, elem):
+		"""@return tuple:	`(block, offset)`"""
+		block = self.__map[elem]
+		return block, block.keys.index(elem)
+	
+	def __getitem__(self, indexOrSlice):
+		if isinstance(indexOrSlice, slice):
+			return OrderedSetView(self, indexOrSlice)
+		position, offset = self.__sizes.find(self._getPositiveIndex(indexOrSlice))
+		return self.__blocks[position].keys[offset]
+	
+	def _iterSlice(self, start, stop, step):
+		"""O(log n + k) if `step` is 1, where k is the number of elements in the slice, and O(k log n) otherwise"""
+		if step == 1:
+			return self._iterRange(start, stop)
+		return (self[index] for index in xrange(start, stop, step))
+	
+	def _iterRange(self, start, stop):
+		"""Iterates over the elements from index `start` up to `stop`, in O(log n + (stop - start))"""
+		if start >= stop:
+			return
+		position, offset = self.__sizes.find(start)
+		remaining = stop - start
+		for block in islice(self.__blocks, position, None):
+			for key in islice(block.keys, offset, offset + remaining):
+				yield key
+				remaining -= 1
+			if remaining == 0:
+				return
+			offset = 0
+	
+	def __setitem__(self, indexOrSlice, value):
+		if isinstance(indexOrSlice, slice):
+			return self._setSlice(indexOrSlice, value)
+		self.replace(self[indexOrSlice], value)
+	
+	def __delitem__(self, indexOrSlice):
+		if isinstance(indexOrSlice, slice):
+			return self._delSlice(indexOrSlice)
+		return self.discard(self[indexOrSlice])
+	
+	def index(self, elem):
+		if elem not in self.__map:
+			raise ValueError(str(elem) + " is not in OrderedList")
+		block, offset = self._locate(elem)
+		return self.__sizes.prefix(block.position) + offset
+	
+	def replace(self, oldElem, newElem):
+		if oldElem not in self.__map:
+			raise ValueError(str(oldElem) + " is not in OrderedList")
+		if oldElem == newElem:
+			return
+		self.insertBefore(newElem, oldElem, updateOnExist=True)
+		self.discard(oldElem)
+	
+	def insertBefore(self, newElemBefore, oldElemAfter, updateOnExist):
+		"""
+		Inserts newElemBefore into the current position of oldElemAfter. oldElemAfter will then come after newElemBefore.
+		
+		@return bool:	`True` if inserted, `False` if not inserted because it already exists and `updateOnExist` is `False`.
+		"""
+		if oldElemAfter not in self.__map:
+			raise KeyError(oldElemAfter)
+		if newElemBefore in self.__map:
+			if not updateOnExist:
+				return False
+			if newElemBefore == oldElemAfter:		# already in place
+				return True
+			self.discard(newElemBefore)
+		self._insertKey(self.index(oldElemAfter), newElemBefore)
+		return True
+	
+	def insertMultiBefore(self, newElemsBefore, oldElemAfter, updateOnExist):
+		"""
+		@return bool:	`True` if all elements were inserted, `False` otherwise.
+		"""
+		if oldElemAfter not in self.__map:
+			raise ValueError("oldElemAfter not in OrderedSet")
+		allInserted = True
+		for newElemBefore in reversed(newElemsBefore):
+			wasInserted = self.insertBefore(newElemBefore, oldElemAfter, updateOnExist)
+			allInserted = allInserted and wasInserted
+			if wasInserted:
+				oldElemAfter = newElemBefore
+		return allInserted
+	
+	def add(self, elem, updateOnExist=False):
+		"""Same as `append`"""
+		if elem in self.__map:
+			if not updateOnExist:
+				return False
+			self.discard(elem)
+		self._insertKey(len(self), elem)
+		return True
+	
+	def discard(self, elem):
+		if elem not in self.__map:
+			return
+		block, offset = self._locate(elem)
+		del self.__map[elem]
+		del block.keys[offset]
+		if len(block.keys) < _BLOCK_SIZE // 2 and len(self.__blocks) > 1:
+			self._mergeBlock(block)
+		elif len(block.keys) == 0:
+			del self.__blocks[block.position]
+			self._reindexBlocks(block.position)
+		else:
+			self.__sizes.add(block.position, -1)
+	
+	def _mergeBlock(self, block):
+		"""
+		Merges an underfull `block` with its neighbour. If the merged block would have to be split again right away, the
+		elements are shared evenly between the two blocks instead.
+		"""
+		blocks = self.__blocks
+		if block.position + 1 < len(blocks):
+			left, right = block, blocks[block.position + 1]
+		else:
+			left, right = blocks[block.position - 1], block
+		keys = left.keys + right.keys
+		if len(keys) < 2 * _BLOCK_SIZE:
+			for key in right.keys:
+				self.__map[key] = left
+			left.keys = keys
+			del blocks[right.position]
+		else:
+			half = len(keys) // 2
+			left.keys, right.keys = keys[:half], keys[half:]
+			for key in left.keys:
+				self.__map[key] = left
+			for key in right.keys:
+				self.__map[key] = right
+		self._reindexBlocks(left.position)
+	
+	def pop(self):
+		if len(self) == 0:
+			raise KeyError("set is empty")
+		elem = self.__blocks[-1].keys[-1]
+		self.discard(elem)
+		return elem
+	
+	def __contains__(self, elem):
+		return elem in self.__map
+	
+	def __iter__(self):
+		for block in self.__blocks:
+			for key in block.keys:
+				yield key
+	
+	def __reversed__(self):
+		for block in reversed(self.__blocks):
+			for key in reversed(block.keys):
+				yield key
+	
+	def __len__(self):
+		return len(self.__map)
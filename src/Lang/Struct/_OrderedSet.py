@@ -1,7 +1,9 @@
 # Taken from http://code.activestate.com/recipes/576696/ (r5)
 # Modified by Jesse Cowles
 
+from abc import abstractmethod
 import collections
+from itertools import izip
 from weakref import proxy
 
 class Link(object):
@@ -9,34 +11,236 @@ class Link(object):
 	def __init__(self, key=None):
 		self.key = key
 
-class OrderedSet(collections.MutableSet):
+def _setNext(link, nextLink, root):
+	"""
+	`next` references are strong, so that iteration doesn't go through weakref proxies, except for the one from the
+	root, which would make the list a reference cycle.
+	"""
+	link.next = proxy(nextLink) if link is root and nextLink is not root else nextLink
+
+class AbstractOrderedSet(collections.MutableSet):
+	"""
+	Methods shared by all ordered set classes. Subclasses must implement the abstract methods of `MutableSet`, plus
+	`__getitem__`, `insertBefore`, `insertMultiBefore`, `replace`, `add` with an `updateOnExist` parameter, and
+	`_iterSlice`.
+	"""
+	@abstractmethod
+	def _iterSlice(self, start, stop, step):
+		"""
+		Iterates over the elements at `xrange(start, stop, step)`. The arguments must already be normalized, such as by
+		`slice.indices`.
+		"""
+		pass
+	
+	def _setSlice(self, slice_, values):
+		"""
+		Same as slice assignment in a `list`. Elements of `values` which are already in the set are moved to the slice.
+		"""
+		start, stop, step = slice_.indices(len(self))
+		values = list(values)
+		if step != 1:
+			oldElems = list(self._iterSlice(start, stop, step))
+			if len(values) != len(oldElems):
+				raise ValueError("attempt to assign sequence of size " + str(len(values)) + " to extended slice of size " + str(len(oldElems)))
+			for oldElem, newElem in izip(oldElems, values):
+				if oldElem != newElem:
+					self.replace(oldElem, newElem)
+			return
+		stop = max(start, stop)
+		newElems = set(values)
+		anchor = next((elem for elem in self._iterSlice(stop, len(self), 1) if elem not in newElems), _NO_ANCHOR)
+		self.difference_update(list(self._iterSlice(start, stop, 1)))
+		if len(values) == 0:
+			return
+		if anchor is _NO_ANCHOR:
+			self.difference_update(values)
+			self.extend(values)
+		else:
+			self.insertMultiBefore(values, anchor, updateOnExist=True)
+	
+	def _delSlice(self, slice_):
+		self.difference_update(list(self._iterSlice(*slice_.indices(len(self)))))
+	
+	def insertAt(self, index, newElem, updateOnExist=True):
+		if index < len(self):
+			return self.insertBefore(newElem, self[index], updateOnExist=updateOnExist)
+		else:
+			return self.add(newElem, updateOnExist=updateOnExist)
+	
+	def append(self, elem, updateOnExist=False):
+		"""
+		If elem is not in the OrderedSet, append elem to the OrderedSet. Same as `add`.
+		
+		@param updateOnExist	bool:	If elem is already in the OrderedSet and this is `False`, do nothing. If this is `True`, the old element is removed and the new one is appended.
+		
+		@return bool: `True` if new elem was inserted, `False` if not inserted because it already exists and `updateOnExist` is `False`.
+		"""
+		return self.add(elem, updateOnExist=updateOnExist)
+	
+	def extend(self, iterable, updateOnExist=False):
+		"""
+		Appends each element of `iterable` in order, the same as calling `add` for each of them.
+		
+		@param updateOnExist	bool:	@see `append`. If an element occurs more than once in `iterable`, its first occurrence wins if this is `False`, and its last occurrence wins if this is `True`.
+		"""
+		add = self.add
+		for elem in iterable:
+			add(elem, updateOnExist)
+	
+	def update(self, *iterables):
+		"""Same as `set.update`. Elements are appended in order, and elements which are already in the set don't move."""
+		for iterable in iterables:
+			self.extend(iterable)
+	
+	def difference_update(self, *iterables):
+		"""Same as `set.difference_update`"""
+		for iterable in iterables:
+			if iterable is self:
+				iterable = list(iterable)
+			for elem in iterable:
+				self.discard(elem)
+	
+	def union(self, *iterables):
+		"""@return:	A new set of the same class, with the elements of this set, followed by the new elements of each iterable in order"""
+		new = self.__class__(self)
+		new.update(*iterables)
+		return new
+	
+	def intersection(self, *iterables):
+		"""@return:	A new set of the same class, with the elements of this set which are in all of `iterables`, in the same order"""
+		others = [iterable if isinstance(iterable, (collections.Set, collections.Mapping)) else set(iterable) for iterable in iterables]
+		return self.__class__(elem for elem in self if all(elem in other for other in others))
+	
+	def __ior__(self, iterable):
+		self.extend(iterable)
+		return self
+	def __isub__(self, iterable):
+		self.difference_update(iterable)
+		return self
+	
+	def __repr__(self):
+		"""
+		Same format as OrderedDict.
+		For the empty set, it returns: `OrderedSet()`
+		Otherwise, it returns the values inside square brackets: `OrderedSet(["a", "b", "c"])`
+		"""
+		if len(self) == 0:
+			return self.__class__.__name__ + "()"
+		return self.__class__.__name__ + "([" + ", ".join(repr(elem) for elem in self) + "])"
+	
+	def __eq__(self, other):
+		if isinstance(other, (AbstractOrderedSet, OrderedSetView)):
+			return len(self) == len(other) and all(elemA == elemB for elemA, elemB in izip(self, other))
+		return not self.isdisjoint(other)
+
+_NO_ANCHOR = object()
+
+class OrderedSetView(collections.Set):
+	"""
+	A read-only view of a slice of an ordered set, which is what slicing an ordered set returns. No elements are copied:
+	iterating over the view walks the slice of the set directly, so it always shows the current elements of the set.
+	
+	Supports iteration, `reversed`, `len`, `in`, indexing, slicing (which returns another view) and comparison. Use
+	`copy()` to get a new set with the elements of the view.
+	
+	`in` and indexing use `index` and `__getitem__` of the viewed set, so on a plain `OrderedSet` they are O(n), like
+	iterating to that position. Use an `IndexedOrderedSet` for views which are read by position often.
+	"""
+	__slots__ = ("_set", "_slice")
+	
+	def __init__(self, set_, slice_):
+		self._set = set_
+		self._slice = slice_
+	
+	def _indices(self):
+		return self._slice.indices(len(self._set))
+	
+	def __len__(self):
+		return len(xrange(*self._indices()))
+	def __iter__(self):
+		return self._set._iterSlice(*self._indices())
+	def __reversed__(self):
+		start, stop, step = self._indices()
+		count = len(xrange(start, stop, step))
+		last = start + (count - 1) * step
+		return self._set._iterSlice(last, last - count * step, -step)
+	
+	def __contains__(self, elem):
+		if elem not in self._set:
+			return False
+		index = self._set.index(elem)
+		start, stop, step = self._indices()
+		if step > 0:
+			return start <= index < stop and (index - start) % step == 0
+		return stop < index <= start and (start - index) % -step == 0
+	
+	def __getitem__(self, indexOrSlice):
+		start, stop, step = self._indices()
+		if isinstance(indexOrSlice, slice):
+			subStart, subStop, subStep = indexOrSlice.indices(len(self))
+			count = len(xrange(subStart, subStop, subStep))
+			if count == 0:
+				return OrderedSetView(self._set, slice(0, 0))
+			newStart = start + subStart * step
+			newStop = newStart + count * step * subStep
+			return OrderedSetView(self._set, slice(newStart, newStop if newStop >= 0 else None, step * subStep))
+		try:
+			return self._set[xrange(start, stop, step)[indexOrSlice]]
+		except IndexError:
+			raise KeyError("Index out of range")
+	
+	def copy(self):
+		"""@return:	A new set of the same class as the viewed set, with the elements of this view"""
+		return self._set.__class__(self)
+	def _from_iterable(self, iterable):
+		"""Used by the operators of `collections.Set`, such as `&`"""
+		return self._set.__class__(iterable)
+	
+	def __eq__(self, other):
+		if isinstance(other, (AbstractOrderedSet, OrderedSetView)):
+			return len(self) == len(other) and all(elemA == elemB for elemA, elemB in izip(self, other))
+		return collections.Set.__eq__(self, other)
+	def __ne__(self, other):
+		return not (self == other)
+	__hash__ = None
+	
+	def __repr__(self):
+		return self.__class__.__name__ + "(" + str(list(self)) + ")"
+
+class OrderedSet(AbstractOrderedSet):
 	"""
 	A set that remembers the order elements were added.
 	Functions in `collections.MutableSet` are supported, such as `|=` (union/`__ior__`), etc.
-	*** NOTE THAT SLICE NOTATION IS STILL BEING IMPLEMENTED ***
+	Slicing returns an `OrderedSetView`. Slice assignment and deletion work the same as in a `list`.
 	
 	The internal self.__map dictionary maps keys to links in a doubly linked list.
 	The circular doubly linked list starts and ends with a sentinel element.
 	The sentinel element never gets deleted (this simplifies the algorithm).
-	The prev/next links are weakref proxies (to prevent circular references). Individual links are kept alive by
-	the hard reference in self.__map. Those hard references disappear when a key is deleted from an OrderedSet.
+	The prev links, and the next link of the sentinel, are weakref proxies (to prevent circular references). Individual
+	links are kept alive by the hard reference in self.__map. Those hard references disappear when a key is deleted from
+	an OrderedSet.
+	
+	Like a `dict`, iterating over the set raises `RuntimeError` if the set is changed during the iteration.
 	"""
 	
 	def __init__(self, iterable=None):
 		self.__root = root = Link()		 # sentinel node for doubly linked list
 		root.prev = root.next = root
 		self.__map = {}					 # key --> link
+		self.__changes = [0]			 # [times links were added or removed], a list so iterators can check it cheaply
 		if iterable is not None:
-			self |= iterable
+			self.extend(iterable)
 	
 	def __setitem__(self, indexOrSlice, value):
 		if isinstance(indexOrSlice, slice):
-			raise NotImplementedError
+			return self._setSlice(indexOrSlice, value)
 		else:	# replace mode with single - same as python standard library
 			return self._replace(self._getLink_byIndex(indexOrSlice), value)
 	
-	def __delitem__(self, index):
-		return self.discard(self[index])
+	def __delitem__(self, indexOrSlice):
+		if isinstance(indexOrSlice, slice):
+			return self._delSlice(indexOrSlice)
+		return self.discard(self[indexOrSlice])
 	
 	def _replace(self, link, newElem):
 		self._insertBefore_link(newElem, link, updateOnExist=True)
@@ -48,7 +252,7 @@ class OrderedSet(collections.MutableSet):
 	
 	def __getitem__(self, indexOrSlice):
 		if isinstance(indexOrSlice, slice):
-			return OrderedSet(link.key for link in self._iterLinks(indexOrSlice))
+			return OrderedSetView(self, indexOrSlice)
 		else:
 			return self._getLink_byIndex(indexOrSlice).key
 	def index(self, elem):
@@ -58,41 +262,28 @@ class OrderedSet(collections.MutableSet):
 			if elem == link_key:
 				return i
 	
-	def _iterLinks(self, slice_):
-		if isinstance(slice_, slice):
-			if slice_.start == slice_.stop == 0:
-				raise StopIteration()
-			slice_ = self._convertSlice(slice_)
-			nextLink = self._getLink_byIndex(slice_.start)
-			betweenStep = 0		# if betweenStep, don't yield; 0 == False, > 0 == True
-			iterAll_step = max(1, min(-1, slice_.step))	#   = -1 if negative step, +1 if positive step
-			iterAll_stop = slice_.stop - slice_.start + iterAll_step		# + iterAll_step because range stops 1 short of last number
-			for _ in range(0, iterAll_stop, iterAll_step):
-				if betweenStep == 0:
-					yield nextLink
-				betweenStep %= abs(slice_.step)
-				if slice_.step > 0:	nextLink = nextLink.next
-				else:				nextLink = nextLink.prev
-		else:
-			raise TypeError("Incorrect index type for OrderedSet")
-	
-	def _convertSlice(self, slice_):
+	def _iterSlice(self, start, stop, step):
 		"""
-		Does 2 things:
-		- Converts slice indices from negative to positive.
-		- Converts from standard slice indices (as used in other python data types, where indices are
-		representative of the gaps between elements) to indices that correspond to elements.
+		Walks the linked list from the element at `start`, which is found from whichever end of the list is closer, so
+		this is O(min(start, n - start) + k), where k is the number of elements in the slice.
 		"""
-		return slice(self._getPositiveIndex(slice_.start) if slice_.start != None else 0,
-					 self._getPositiveIndex(self._getPositiveIndex(slice_.stop, checkLen=False) - 1),
-					 slice_.step if slice_.step != None else 1)
+		count = len(xrange(start, stop, step))
+		if count == 0:
+			return
+		link = self._getLink_byIndex(start)
+		distance = abs(step)
+		for i in xrange(count):
+			if i != 0:
+				for _ in xrange(distance):
+					link = link.next if step > 0 else link.prev
+			yield link.key
 	
-	def _getPositiveIndex(self, index, checkLen=True):
-		if not isinstance(index, int):
+	def _getPositiveIndex(self, index):
+		if not isinstance(index, (int, long)):
 			raise TypeError("Incorrect index type for OrderedSet")
 		if index < 0:
 			index = len(self) + index	# convert to positive index
-		if checkLen and (index >= len(self) or index < 0):
+		if index >= len(self) or index < 0:
 			raise KeyError("Index out of range")
 		return index
 	
@@ -113,17 +304,18 @@ class OrderedSet(collections.MutableSet):
 					return curr
 				curr = curr.prev
 	
-	def insertAt(self, index, newElem, updateOnExist=True):
-		if index < len(self):
-			return self.insertBefore(newElem, self[index], updateOnExist=updateOnExist)
-		else:
-			return self.add(newElem, updateOnExist=updateOnExist)
-		
 	def insertBefore(self, newElemBefore, oldElemAfter, updateOnExist):
 		"""See _insertBefore_link(...) method."""
 		return self._insertBefore_link(newElemBefore, self.__map[oldElemAfter], updateOnExist)
 	
 	def insertMultiBefore(self, newElemsBefore, oldElemAfter, updateOnExist):
+		"""
+		Inserts all of `newElemsBefore`, in order, before `oldElemAfter`.
+		
+		@param updateOnExist	bool:	If `True`, elements which are already in the set are moved. If an element occurs more than once in `newElemsBefore`, its first occurrence wins.
+										If `False`, elements which are already in the set are skipped. If an element occurs more than once in `newElemsBefore`, its last occurrence wins.
+		@return bool:	`True` if all elements were inserted, `False` otherwise.
+		"""
 		if oldElemAfter not in self.__map:
 			raise ValueError("oldElemAfter not in OrderedSet")
 		return self._insertBefore_links(newElemsBefore, self.__map[oldElemAfter], updateOnExist)
@@ -151,45 +343,115 @@ class OrderedSet(collections.MutableSet):
 		
 		self.__map[newElemBefore] = link = Link(newElemBefore)
 		link.prev, link.next = oldLinkAfter.prev, oldLinkAfter
-		link.prev.next = oldLinkAfter.prev = proxy(link)
+		_setNext(link.prev, link, self.__root)
+		oldLinkAfter.prev = proxy(link)
+		self.__changes[0] += 1
 		return True
 	
 	def _insertBefore_links(self, newElemsBefore, oldLinkAfter, updateOnExist):
 		"""
+		Builds a chain of new links, then splices the whole chain in before `oldLinkAfter` at once.
+		
 		Returns True if all links were inserted, False otherwise.
 		"""
-		allInserted = True
-		for newElemBefore in reversed(newElemsBefore):
-			wasInserted = self._insertBefore_link(newElemBefore, oldLinkAfter, updateOnExist)
-			allInserted = allInserted and wasInserted
-			if wasInserted:
-				oldLinkAfter = self.__map[newElemBefore]
-		return allInserted
+		map_ = self.__map
+		newElemsBefore = list(newElemsBefore)
+		if updateOnExist and oldLinkAfter.key in newElemsBefore:
+			# the anchor itself is moved, so the elements can't be spliced in as one chain before it
+			for elem in reversed(newElemsBefore):
+				if elem != oldLinkAfter.key:
+					self._insertBefore_link(elem, oldLinkAfter, updateOnExist)
+				oldLinkAfter = map_[elem]
+			return True
+		seen = set()
+		chain = []
+		if updateOnExist:
+			for elem in newElemsBefore:
+				if elem not in seen:
+					seen.add(elem)
+					chain.append(elem)
+			for elem in chain:
+				self.discard(elem)
+		else:
+			for elem in reversed(newElemsBefore):
+				if elem not in seen and elem not in map_:
+					seen.add(elem)
+					chain.append(elem)
+			chain.reverse()
+		if len(chain) != 0:
+			self._spliceBefore(chain, oldLinkAfter)
+		return updateOnExist or len(chain) == len(newElemsBefore)
 	
-	def add(self, elem, updateOnExist=False):
-		"""Same as `append`"""
-		return self._insertBefore_link(elem, self.__root, updateOnExist=updateOnExist)
+	def _spliceBefore(self, elems, oldLinkAfter):
+		"""Links the elements of `elems` which aren't in the set yet into a chain, and inserts it before `oldLinkAfter`"""
+		map_ = self.__map
+		root = self.__root
+		prevLink = oldLinkAfter.prev
+		changesCell = self.__changes
+		try:
+			for elem in elems:
+				if elem in map_:
+					continue
+				map_[elem] = link = Link(elem)
+				link.prev = prevLink
+				_setNext(prevLink, link, root)
+				prevLink = proxy(link)
+				changesCell[0] += 1		# before `elems` is read again, in case it iterates over this set
+		finally:		# keep the list consistent, even if `elems` raises
+			_setNext(prevLink, oldLinkAfter, root)
+			oldLinkAfter.prev = prevLink
 	
-	def append(self, elem, updateOnExist=False):
+	def extend(self, iterable, updateOnExist=False):
 		"""
-		If elem is not in the OrderedSet, append elem to the OrderedSet. Same as `add`.
-		
-		@param updateOnExist	bool:	If elem is already in the OrderedSet and this is `False`, do nothing. If this is `True`, the old element is removed and the new one is appended.
+		Appends each element of `iterable` in order, in a single pass which links the new elements directly.
 		
-		@return bool: `True` if new elem was inserted, `False` if not inserted because it already exists and `updateOnExist` is `False`.
+		@see `AbstractOrderedSet.extend`
 		"""
+		map_ = self.__map
+		root = self.__root
+		if updateOnExist:
+			discard = self.discard
+			changesCell = self.__changes
+			for elem in iterable:
+				if elem in map_:
+					discard(elem)
+				map_[elem] = link = Link(elem)
+				link.prev, link.next = root.prev, root
+				_setNext(link.prev, link, root)
+				root.prev = proxy(link)
+				changesCell[0] += 1
+		else:
+			self._spliceBefore(iterable, root)
+	
+	def difference_update(self, *iterables):
+		map_ = self.__map
+		root = self.__root
+		changesCell = self.__changes
+		for iterable in iterables:
+			if iterable is self:
+				iterable = list(iterable)
+			for elem in iterable:
+				link = map_.pop(elem, None)
+				if link is not None:
+					_setNext(link.prev, link.next, root)
+					link.next.prev = link.prev
+					changesCell[0] += 1
+	
+	def add(self, elem, updateOnExist=False):
+		"""Same as `append`"""
 		return self._insertBefore_link(elem, self.__root, updateOnExist=updateOnExist)
 	
 	def discard(self, elem):
 		if elem in self.__map:		
 			link = self.__map.pop(elem)
-			link.prev.next = link.next
+			_setNext(link.prev, link.next, self.__root)
 			link.next.prev = link.prev
+			self.__changes[0] += 1
 	
 	def pop(self):
 		if len(self) == 0:
 			raise KeyError("set is empty")
-		elem = next(reversed(self)) if len(self) > 1 else next(iter(self))
+		elem = self.__root.prev.key
 		self.discard(elem)
 		return elem
 	
@@ -198,28 +460,27 @@ class OrderedSet(collections.MutableSet):
 	
 	def __iter__(self):
 		"""Traverse the linked list in order."""
-		for link in self._iterLinks(slice(0, len(self))):
+		root = self.__root
+		changesCell = self.__changes
+		changes = changesCell[0]
+		link = root.next
+		while link is not root:		# links point to the root itself, never to a proxy of it
 			yield link.key
+			if changesCell[0] != changes:
+				raise RuntimeError("OrderedSet changed during iteration")
+			link = link.next
 	
 	def __reversed__(self):
 		"""Traverse the linked list in reverse order."""
-		for link in self._iterLinks(slice(len(self)-1, 0, -1)):
+		root = self.__root
+		changesCell = self.__changes
+		changes = changesCell[0]
+		link = root.prev
+		while link is not root:
 			yield link.key
+			if changesCell[0] != changes:
+				raise RuntimeError("OrderedSet changed during iteration")
+			link = link.prev
 	
-	def __repr__(self):
-		"""
-		Same format as OrderedDict.
-		For the empty set, it returns: `OrderedSet()`
-		Otherwise, it returns the values inside square brackets: `OrderedSet(["a", "b", "c"])`
-		"""
-		if len(self) == 0:
-			return self.__class__.__name__ + "()"
-		return self.__class__.__name__ + "(" + str(list(self)) + ")"
-
 	def __len__(self):
 		return len(self.__map)
-	
-	def __eq__(self, other):
-		if isinstance(other, OrderedSet):
-			return len(self) == len(other) and list(self) == list(other)
-		return not self.isdisjoint(other)
@@ -0,0 +1,309 @@
+from _hashing import freeze, itemHash, itemsHash, finalHash
+
+import collections
+
+_BITS = 5						# hash bits used by each level of the trie
+_HASH_BITS = 32					# hash bits used in total. Keys whose hashes share these bits go in a `_CollisionNode`.
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+_NODE = object()				# in place of a key in `_BitmapNode.array`, when the value is a child node
+_MISSING = object()
+
+def _hashKey(key):
+	return hash(key) & _HASH_MASK
+
+def _bit(hash_, shift):
+	return 1 << ((hash_ >> shift) & 31)
+
+def _popcount(bitmap):
+	return bin(bitmap).count("1")
+
+def _freeze(value):
+	"""@see `_hashing.freeze`"""
+	return freeze(value, PersistentFrozenDict)
+
+class _BitmapNode(object):
+	"""
+	A level of the trie. `bitmap` has a bit set for each of the 32 slots of this level which is used, and `array` holds a
+	key and value for each used slot, in order. If the key is `_NODE`, the value is the child node for that slot.
+	
+	Nodes are never changed once they are made, so unchanged nodes are shared between dicts.
+	"""
+	__slots__ = ("bitmap", "array")
+	
+	def __init__(self, bitmap, array):
+		self.bitmap = bitmap
+		self.array = array
+	
+	def find(self, shift, hash_, key, default):
+		bit = _bit(hash_, shift)
+		if not self.bitmap & bit:
+			return default
+		i = 2 * _popcount(self.bitmap & (bit - 1))
+		storedKey, value = self.array[i], self.array[i + 1]
+		if storedKey is _NODE:
+			return value.find(shift + _BITS, hash_, key, default)
+		if storedKey is key or storedKey == key:
+			return value
+		return default
+	
+	def assoc(self, shift, hash_, key, value):
+		"""
+		@return tuple:	`(node, oldValue)`, where `node` is `self` if nothing changed, and `oldValue` is `_MISSING` if `key` was added
+		"""
+		bit = _bit(hash_, shift)
+		array = self.array
+		i = 2 * _popcount(self.bitmap & (bit - 1))
+		if not self.bitmap & bit:
+			return _BitmapNode(self.bitmap | bit, array[:i] + (key, value) + array[i:]), _MISSING
+		storedKey, storedValue = array[i], array[i + 1]
+		if storedKey is _NODE:
+			child, oldValue = storedValue.assoc(shift + _BITS, hash_, key, value)
+			if child is storedValue:
+				return self, oldValue
+			return _BitmapNode(self.bitmap, array[:i + 1] + (child,) + array[i + 2:]), oldValue
+		if storedKey is key or storedKey == key:
+			if storedValue is value:
+				return self, storedValue
+			return _BitmapNode(self.bitmap, array[:i + 1] + (value,) + array[i + 2:]), storedValue
+		child = _makeNode(shift + _BITS, storedKey, storedValue, hash_, key, value)
+		return _BitmapNode(self.bitmap, array[:i] + (_NODE, child) + array[i + 2:]), _MISSING
+	
+	def without(self, shift, hash_, key):
+		"""@return:	The node without `key`, `self` if `key` isn't in it, or `None` if it would be empty"""
+		bit = _bit(hash_, shift)
+		if not self.bitmap & bit:
+			return self
+		array = self.array
+		i = 2 * _popcount(self.bitmap & (bit - 1))
+		storedKey, storedValue = array[i], array[i + 1]
+		if storedKey is _NODE:
+			child = storedValue.without(shift + _BITS, hash_, key)
+			if child is storedValue:
+				return self
+			if child is not None:
+				if len(child.array) == 2 and child.array[0] is not _NODE:		# pull a single item up, so the trie stays shallow
+					return _BitmapNode(self.bitmap, array[:i] + child.array + array[i + 2:])
+				return _BitmapNode(self.bitmap, array[:i + 1] + (child,) + array[i + 2:])
+		elif not (storedKey is key or storedKey == key):
+			return self
+		if self.bitmap == bit:
+			return None
+		return _BitmapNode(self.bitmap ^ bit, array[:i] + array[i + 2:])
+	
+	def iterItems(self):
+		array = self.array
+		for i in xrange(0, len(array), 2):
+			if array[i] is _NODE:
+				for item in array[i + 1].iterItems():
+					yield item
+			else:
+				yield array[i], array[i + 1]
+
+class _CollisionNode(object):
+	"""Holds keys whose hashes are the same, as a flat tuple of keys and values"""
+	__slots__ = ("hash", "array")
+	
+	def __init__(self, hash_, array):
+		self.hash = hash_
+		self.array = array
+	
+	def _indexOf(self, key):
+		array = self.array
+		for i in xrange(0, len(array), 2):
+			if array[i] is key or array[i] == key:
+				return i
+		return -1
+	
+	def find(self, shift, hash_, key, default):
+		if hash_ != self.hash:
+			return default
+		i = self._indexOf(key)
+		return default if i == -1 else self.array[i + 1]
+	
+	def assoc(self, shift, hash_, key, value):
+		if hash_ != self.hash:
+			return _BitmapNode(_bit(self.hash, shift), (_NODE, self)).assoc(shift, hash_, key, value)
+		i = self._indexOf(key)
+		if i == -1:
+			return _CollisionNode(self.hash, self.array + (key, value)), _MISSING
+		if self.array[i + 1] is value:
+			return self, value
+		return _CollisionNode(self.hash, self.array[:i + 1] + (value,) + self.array[i + 2:]), self.array[i + 1]
+	
+	def without(self, shift, hash_, key):
+		i = self._indexOf(key) if hash_ == self.hash else -1
+		if i == -1:
+			return self
+		array = self.array[:i] + self.array[i + 2:]
+		if len(array) == 2:
+			return _BitmapNode(_bit(self.hash, shift), array)
+		return _CollisionNode(self.hash, array)
+	
+	def iterItems(self):
+		array = self.array
+		for i in xrange(0, len(array), 2):
+			yield array[i], array[i + 1]
+
+def _makeNode(shift, key1, value1, hash2, key2, value2):
+	"""@return:	A node holding both items, whose keys are different"""
+	hash1 = _hashKey(key1)
+	if hash1 == hash2:
+		return _CollisionNode(hash1, (key1, value1, key2, value2))
+	node = _BitmapNode(_bit(hash1, shift), (key1, value1))
+	return node.assoc(shift, hash2, key2, value2)[0]
+
+def _build(entries, shift):
+	"""Builds a node directly from a list of `(hash, key, value)`, whose keys are all different"""
+	if shift >= _HASH_BITS:
+		return _CollisionNode(entries[0][0], tuple(elem for _, key, value in entries for elem in (key, value)))
+	buckets = collections.defaultdict(list)
+	for entry in entries:
+		buckets[(entry[0] >> shift) & 31].append(entry)
+	bitmap = 0
+	array = []
+	for index in sorted(buckets):
+		bucket = buckets[index]
+		bitmap |= 1 << index
+		if len(bucket) == 1:
+			array += bucket[0][1:]
+		else:
+			array += (_NODE, _build(bucket, shift + _BITS))
+	return _BitmapNode(bitmap, tuple(array))
+
+class PersistentFrozenDict(collections.Mapping):
+	"""
+	An immutable, hashable dictionary, which is cheap to derive changed versions from.
+	
+	Items are kept in a hash array mapped trie. `set`, `delete` and `update` return a new `PersistentFrozenDict`, which
+	shares every part of the trie that didn't change with the original, so each changed key only costs O(log n) time and
+	memory. The hash is computed while the dict is built, and kept up to date by each change, instead of being computed
+	from all the items again.
+	
+	Like `FrozenDict`, nested containers are converted to hashable ones, with dicts converted to `PersistentFrozenDict`.
+	"""
+	def __init__(self, *args, **kw):
+		entries = []
+		total = 0
+		for key, value in dict(*args, **kw).iteritems():
+			value = _freeze(value)
+			entries.append((_hashKey(key), key, value))
+			if total is not None:
+				try:
+					total ^= itemHash(key, value)
+				except TypeError:		# not hashable, so `__hash__` will raise
+					total = None
+		self._len = len(entries)
+		self._root = None if len(entries) == 0 else _build(entries, 0)
+		self._itemsHash = total
+	
+	@classmethod
+	def _fromRoot(cls, root, len_, total):
+		new = cls.__new__(cls)
+		new._root = root
+		new._len = len_
+		new._itemsHash = total
+		return new
+	
+	def __getitem__(self, key):
+		if self._root is None:
+			raise KeyError(key)
+		value = self._root.find(0, _hashKey(key), key, _MISSING)
+		if value is _MISSING:
+			raise KeyError(key)
+		return value
+	
+	def get(self, key, default=None):
+		if self._root is None:
+			return default
+		return self._root.find(0, _hashKey(key), key, default)
+	
+	def __contains__(self, key):
+		return self._root is not None and self._root.find(0, _hashKey(key), key, _MISSING) is not _MISSING
+	
+	def __len__(self):
+		return self._len
+	
+	def iteritems(self):
+		if self._root is None:
+			return iter(())
+		return self._root.iterItems()
+	def iterkeys(self):
+		return (key for key, _ in self.iteritems())
+	def itervalues(self):
+		return (value for _, value in self.iteritems())
+	__iter__ = iterkeys
+	
+	def items(self):
+		return list(self.iteritems())
+	def keys(self):
+		return list(self.iterkeys())
+	def values(self):
+		return list(self.itervalues())
+	
+	def set(self, key, value):
+		"""@return PersistentFrozenDict:	A copy of this dict where `key` maps to `value`"""
+		value = _freeze(value)
+		hash_ = _hashKey(key)
+		if self._root is None:
+			root, oldValue = _BitmapNode(_bit(hash_, 0), (key, value)), _MISSING
+		else:
+			root, oldValue = self._root.assoc(0, hash_, key, value)
+			if root is self._root:
+				return self
+		total = self._itemsHash
+		if total is not None:
+			try:
+				if oldValue is not _MISSING:
+					total ^= itemHash(key, oldValue)
+				total ^= itemHash(key, value)
+			except TypeError:		# the new value isn't hashable, so neither is the new dict
+				total = None
+		return self._fromRoot(root, self._len + (oldValue is _MISSING), total)
+	
+	def delete(self, key):
+		"""@return PersistentFrozenDict:	A copy of this dict without `key`. Raises `KeyError` if `key` isn't in this dict."""
+		oldValue = self.get(key, _MISSING)
+		if oldValue is _MISSING:
+			raise KeyError(key)
+		root = self._root.without(0, _hashKey(key), key)
+		total = self._itemsHash
+		if total is not None:
+			total ^= itemHash(key, oldValue)
+		return self._fromRoot(root, self._len - 1, total)
+	
+	def update(self, *args, **kw):
+		"""@return PersistentFrozenDict:	A copy of this dict with the items of `args` and `kw` set, the same as `dict.update`"""
+		new = self
+		for key, value in dict(*args, **kw).iteritems():
+			new = new.set(key, value)
+		return new
+	
+	def __hash__(self):
+		if self._itemsHash is None:
+			self._itemsHash = itemsHash(self.iteritems())
+		return finalHash(self._itemsHash)
+	
+	def __eq__(self, other):
+		if self is other:
+			return True
+		if not isinstance(other, collections.Mapping) or len(self) != len(other):
+			return False
+		if isinstance(other, PersistentFrozenDict):
+			if self._root is other._root:
+				return True
+			if self._itemsHash is not None and other._itemsHash is not None and self._itemsHash != other._itemsHash:
+				return False
+		for key, value in self.iteritems():
+			otherValue = other.get(key, _MISSING)
+			if otherValue is _MISSING or not (otherValue is value or otherValue == value):
+				return False
+		return True
+	def __ne__(self, other):
+		return not (self == other)
+	
+	def __reduce__(self):
+		return (self.__class__, (dict(self.iteritems()),))
+	
+	def __repr__(self):
+		return self.__class__.__name__ + "(" + repr(dict(self.iteritems())) + ")"
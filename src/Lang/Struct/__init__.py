@@ -1,7 +1,11 @@
 import _weakref as weakref
-from _OrderedSet import OrderedSet
+from _OrderedSet import OrderedSet, AbstractOrderedSet, OrderedSetView
+from _IndexedOrderedSet import IndexedOrderedSet
+from _CompactOrderedSet import CompactOrderedSet
+from _ConcurrentOrderedSet import ConcurrentOrderedSet
 from _FrozenDict import FrozenDict
-from QueueStacks import LIFOstack
+from _PersistentFrozenDict import PersistentFrozenDict
+from QueueStacks import LIFOstack, FIFOqueue, PriorityQueue
 
 try:
 	from collections import OrderedDict
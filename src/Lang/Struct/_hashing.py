@@ -0,0 +1,53 @@
+"""
+Hashing and freezing shared by the hashable types in `Lang.Struct`.
+
+The hash of a mapping is the XOR of the hashes of its items, so it doesn't depend on their order, it can be computed in
+one pass without a temporary `frozenset`, and it can be updated when one item changes by XOR-ing out the hash of the old
+item and XOR-ing in the hash of the new one. Keys are unique, so equal items never cancel each other out.
+"""
+from itertools import izip
+
+def itemHash(key, value):
+	"""
+	@return int:	The hash of one item of a mapping, to be combined with the others by XOR. The tuple hash mixes the bits
+					of both, so that swapping values between keys changes the result. Raises `TypeError` if either is unhashable.
+	"""
+	return hash((key, value))
+
+def itemsHash(items):
+	"""@return int:	`itemHash` of each `(key, value)` in `items`, combined"""
+	total = 0
+	for key, value in items:
+		total ^= hash((key, value))		# same as `itemHash`, without the call
+	return total
+
+def finalHash(total):
+	"""@return int:	The value for `__hash__` to return, from combined item hashes"""
+	return hash(total)
+
+_CONTAINERS = (dict, list, tuple, set, bytearray)
+
+def needsFreezing(value):
+	"""@return bool:	`True` if `freeze` may return something other than `value`"""
+	return isinstance(value, _CONTAINERS) and not (isinstance(value, dict) and type(value).__hash__ is not None)
+
+def freeze(value, freezeDict):
+	"""
+	Makes a hashable version of `value`, by converting any nested containers: dicts with `freezeDict`, lists and tuples to
+	tuples, sets to frozensets and bytearrays to bytes. Values which don't need converting are returned as they are,
+	including tuples whose elements don't.
+	
+	@param freezeDict	callable:	Converts a dict which isn't hashable, such as the class of the frozen dict.
+	"""
+	if isinstance(value, dict):
+		return value if type(value).__hash__ is not None else freezeDict(value)
+	if isinstance(value, (list, tuple)):
+		frozen = tuple(freeze(elem, freezeDict) if isinstance(elem, _CONTAINERS) else elem for elem in value)
+		if isinstance(value, tuple) and all(frozenElem is elem for frozenElem, elem in izip(frozen, value)):
+			return value
+		return frozen
+	if isinstance(value, set):
+		return frozenset(value)
+	if isinstance(value, bytearray):
+		return bytes(value)
+	return value
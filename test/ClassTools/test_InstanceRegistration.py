@@ -1,4 +1,5 @@
 from Lang.ClassTools.Patterns import RegisteredInstances
+import threading
 import unittest
 
 class Test_InstanceRegistration(unittest.TestCase):
@@ -60,3 +61,35 @@ class Test_InstanceRegistration(unittest.TestCase):
 		
 		self.assertEqual(len(Bar.getAllClasses()), 1)
 		self.assertEqual(Bar.getAllClasses()[0], Bar)
+	
+	def test_unhashable(self):
+		
+		class Foo(RegisteredInstances):
+			__hash__ = None
+		a = Foo()
+		self.assertEqual(Foo.getAllInstances(), [a])
+	
+	def test_threads(self):
+		
+		class Foo(RegisteredInstances):
+			def __init__(self, value):
+				super(Foo, self).__init__()
+				self.value = value
+		kept = []
+		errors = []
+		def create(threadNum):
+			try:
+				for i in xrange(200):
+					instance = Foo((threadNum, i))
+					if i % 2 == 0:
+						kept.append(instance)
+					Foo.getAllInstances()
+			except Exception as e:
+				errors.append(e)
+		threads = [threading.Thread(target=create, args=(threadNum,)) for threadNum in xrange(4)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(errors, [])
+		self.assertEqual(sorted(instance.value for instance in Foo.getAllInstances()), sorted(instance.value for instance in kept))
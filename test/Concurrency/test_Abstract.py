@@ -28,8 +28,6 @@ class Concurrency_LockSemaphore_Abstract(object):
 		self.assertEqual(lockSem.getSlotsTakenByAnyone(), slotsTakenByAnyone)
 		self.assertEqual(lockSem.getSlotsTakenBySelf(), slotsTakenBySelf)
 		self.assertEqual(lockSem.hasAvailableSlot(), numAvailable > 0)
-		self.assertEqual(lockSem.isTakenByAnyone(), (slotsTakenByAnyone >= 1))
-		self.assertEqual(lockSem.isTakenBySelf(), (slotsTakenBySelf >= 1))
 	
 	def testDecorator_basic(self):
 		@self.decoratorFunc(self._lockSemInstance_paramsPreAcquire)
@@ -88,10 +86,12 @@ class Concurrency_Lock(Concurrency_LockSemaphore_Abstract):
 			slotsTakenByAnyone = slotsTakenBySelf
 		self.assertEqual(lockSem.getMaxSlots(), 1)
 		super(Concurrency_Lock, self)._checkStatusFunctions(lockSem, slotsTakenBySelf, slotsTakenByAnyone)
+		self.assertEqual(lockSem.isTakenByAnyone(), (slotsTakenByAnyone >= 1))
+		self.assertEqual(lockSem.isTakenBySelf(), (slotsTakenBySelf >= 1))
 
 class Concurrency_Semaphore(Concurrency_LockSemaphore_Abstract):
 	def setUp(self):
-		super(Concurrency_Lock, self).setUp()
+		super(Concurrency_Semaphore, self).setUp()
 		assert isinstance(self._lockSemInstance_paramsOnAcquire, abstract.Semaphore)
 	
 	decoratorFunc = lambda self, *args, **kwargs: decorators.useSemaphore(*args, **kwargs)
@@ -100,10 +100,43 @@ class Concurrency_Semaphore(Concurrency_LockSemaphore_Abstract):
 		if slotsTakenByAnyone == None:
 			slotsTakenByAnyone = slotsTakenBySelf
 		self.assertTrue(lockSem.getMaxSlots() >= 1)
-		super(Concurrency_Lock, self)._checkStatusFunctions(lockSem, slotsTakenBySelf, slotsTakenByAnyone)
+		super(Concurrency_Semaphore, self)._checkStatusFunctions(lockSem, slotsTakenBySelf, slotsTakenByAnyone)
 	
 	def test_blocking_concurrency(self):
-		assert self._lockSemInstance_paramsOnAcquire.getMaxSlots() > 1
-		with self._lockSemInstance_paramsOnAcquire:
-			with self._lockSemInstance_paramsOnAcquire:
-				time.sleep(0.1)
+		assert self._lockSemInstance_paramsPreAcquire.getMaxSlots() > 1
+		with self._lockSemInstance_paramsPreAcquire:
+			with self._lockSemInstance_paramsPreAcquire:
+				self._checkStatusFunctions(self._lockSemInstance_paramsPreAcquire, 2)
+		self._checkStatusFunctions(self._lockSemInstance_paramsPreAcquire, 0)
+
+class Concurrency_LockSemaphore_TimedMixin(object):
+	"""For implementations which can be held by someone else while the test waits on them"""
+	@abstractmethod
+	def holdElsewhere(self, lockSem, seconds):
+		"""Should take every slot of `lockSem` somewhere other than the test itself, and release them after `seconds`"""
+		pass
+	
+	def _acquireTimed(self, lockSem, timeout):
+		startTime = time.time()
+		wasAcquired = lockSem.acquire(timeout=timeout, exceptionOnNotAcquire=False)
+		return wasAcquired, time.time() - startTime
+	
+	def test_timed_acquireAfterRelease(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		self.holdElsewhere(lockSem, 0.2)
+		wasAcquired, elapsedTime = self._acquireTimed(lockSem, timeout=5)
+		try:
+			self.assertTrue(wasAcquired)
+			self.assertGreaterEqual(elapsedTime, 0.1)
+			self.assertLess(elapsedTime, 1)
+		finally:
+			if wasAcquired:
+				lockSem.release()
+	
+	def test_timed_timeout(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		self.holdElsewhere(lockSem, 1)
+		wasAcquired, elapsedTime = self._acquireTimed(lockSem, timeout=0.2)
+		self.assertFalse(wasAcquired)
+		self.assertGreaterEqual(elapsedTime, 0.19)
+		self.assertLess(elapsedTime, 0.6)		# wall time, even though this process barely used the CPU
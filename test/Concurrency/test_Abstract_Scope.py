@@ -28,7 +28,7 @@ class Concurrency_LockSemaphore_NonProcessDependentMixin(Concurrency_LockSemapho
 	def test_partialBlocking_acquireRelease(self):
 		elapsedTime = self._test_concurrency_wait(timeout=0.1)
 		self.assertGreaterEqual(elapsedTime, 0.1)
-		self.assertLess(0.11)	# allow for some overhead here
+		self.assertLess(elapsedTime, 0.11)	# allow for some overhead here
 	
 	def test_blocking_concurrency_wait(self):
 		self._test_concurrency_wait(timeout=None)
@@ -40,9 +40,9 @@ class Concurrency_LockSemaphore_NonProcessDependentMixin(Concurrency_LockSemapho
 				self._lockSemInstance_paramsOnAcquire.acquire(timeout=None)
 				self._checkStatusFunctions(self._lockSemInstance_paramsOnAcquire, i)
 			time.sleep(0.1)
-			startTime = time.clock()
+			startTime = time.time()
 			self.assertRaises(ResourceIsFullException, self._lockSemInstance_paramsOnAcquire.acquire, timeout=timeout)
-			elapsedTime = time.clock() - startTime
+			elapsedTime = time.time() - startTime
 			self._checkStatusFunctions(self._lockSemInstance_paramsOnAcquire, self._lockSemInstance_paramsOnAcquire.getMaxSlots())
 		finally:
 			for i in range(self._lockSemInstance_paramsOnAcquire.getSlotsTakenByAnyone()-1, 0-1, -1):
@@ -1,11 +1,35 @@
 from Lang.Concurrency import FileSystem
+from Lang.Concurrency.FileSystem import _flock
 from . import test_Abstract, test_Abstract_Scope
 from Lang.Concurrency.Multiprocessing.decorators import processify
 
+import fcntl
 import os
+import signal
+import threading
+import time
 import unittest
 
-class Test_Concurrency_Lock_FileSystem_ByFCNTL(test_Abstract_Scope.Concurrency_LockSemaphore_ProcessDependentMixin,
+class _HoldElsewhere_Process(test_Abstract.Concurrency_LockSemaphore_TimedMixin):
+	def holdElsewhere(self, lockSem, seconds):
+		"""Holds the lock in a child process, because this process taking the lock again would succeed"""
+		readEnd, writeEnd = os.pipe()
+		pid = os.fork()
+		if pid == 0:
+			try:
+				with open(lockSem.getLockFilePath(), "w") as file_:
+					fcntl.lockf(file_.fileno(), fcntl.LOCK_EX)
+					os.write(writeEnd, b"x")
+					time.sleep(seconds)
+			finally:
+				os._exit(0)
+		self.addCleanup(os.waitpid, pid, 0)
+		os.close(writeEnd)
+		os.read(readEnd, 1)
+		os.close(readEnd)
+
+class Test_Concurrency_Lock_FileSystem_ByFCNTL(_HoldElsewhere_Process,
+												test_Abstract_Scope.Concurrency_LockSemaphore_ProcessDependentMixin,
 												test_Abstract.Concurrency_Lock, unittest.TestCase):
 	def tearDown(self):
 		for lock in (self._lockSemInstance_paramsOnAcquire, self._lockSemInstance_paramsPreAcquire):
@@ -37,3 +61,150 @@ class Test_Concurrency_Lock_FileSystem_ByFCNTL(test_Abstract_Scope.Concurrency_L
 			
 			with self.assertRaises(FileSystem.ForkException):	# an exception is thrown when a forked process inherits the file descriptor but not the lock associated with it (OS issue)
 				print(_testSecondInstance(secondInstance))
+	
+	def test_probe_doesNotChangeFile(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		open(lockSem.getLockFilePath(), "w").close()
+		inode = os.stat(lockSem.getLockFilePath()).st_ino
+		for _ in xrange(3):
+			self._checkStatusFunctions(lockSem, 0)
+		self.assertEqual(os.stat(lockSem.getLockFilePath()).st_ino, inode)		# not removed, and not created again
+	
+	def test_probe_followsReplacedFile(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		self.holdElsewhere(lockSem, 0.1)
+		self._checkStatusFunctions(lockSem, 0, 1)
+		deadline = time.time() + 5
+		while lockSem.getSlotsTakenByAnyone() == 1 and time.time() < deadline:
+			time.sleep(0.01)
+		self._checkStatusFunctions(lockSem, 0, 0)
+		os.remove(lockSem.getLockFilePath())
+		self.holdElsewhere(lockSem, 1)		# on a new file, so the one opened by the last check is out of date
+		self._checkStatusFunctions(lockSem, 0, 1)
+	
+	def test_timed_fromOtherThread(self):
+		"""Only the main thread can use the alarm, so other threads poll"""
+		results = []
+		thread = threading.Thread(target=lambda: results.append((self.test_timed_acquireAfterRelease(), self.test_timed_timeout())))
+		thread.start()
+		thread.join()
+		self.assertEqual(len(results), 1)
+	
+	def test_timed_keepsOtherAlarm(self):
+		signal.setitimer(signal.ITIMER_REAL, 10)
+		try:
+			self.test_timed_acquireAfterRelease()
+			self.assertGreater(signal.getitimer(signal.ITIMER_REAL)[0], 5)
+		finally:
+			signal.setitimer(signal.ITIMER_REAL, 0)
+
+class Test_Concurrency_Semaphore_FileSystem_ByFCNTL(_HoldElsewhere_Process, test_Abstract_Scope.Concurrency_LockSemaphore_ProcessDependentMixin,
+													test_Abstract.Concurrency_Semaphore, unittest.TestCase):
+	"""The lock files are kept, because instances which are still open would be left locking a removed file"""
+	def getInstance_paramsOnAcquire(self):
+		return FileSystem.Semaphore_ByFCNTL(self.__class__.__name__, maxSlots=3)
+	def getInstance_paramsPreAcquire(self):
+		return FileSystem.Semaphore_ByFCNTL(self.__class__.__name__ + " #2", maxSlots=3, timeout=None, exceptionOnNotAcquire=True)
+	
+	def test_slotsTakenByOtherProcess(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		readEnd, writeEnd = os.pipe()
+		doneReadEnd, doneWriteEnd = os.pipe()
+		pid = os.fork()
+		if pid == 0:
+			try:
+				self.getInstance_paramsOnAcquire().acquire(timeout=0)
+				os.write(writeEnd, b"x")
+				os.read(doneReadEnd, 1)
+			finally:
+				os._exit(0)
+		try:
+			os.read(readEnd, 1)
+			self._checkStatusFunctions(lockSem, 0, 1)
+			lockSem.acquire(timeout=0)
+			lockSem.acquire(timeout=0)
+			self._checkStatusFunctions(lockSem, 2, 3)
+			self.assertFalse(lockSem.acquire(timeout=0, exceptionOnNotAcquire=False))
+			lockSem.release()
+			self._checkStatusFunctions(lockSem, 1, 2)
+			lockSem.release()
+		finally:
+			os.write(doneWriteEnd, b"x")
+			os.waitpid(pid, 0)
+			for fd in (readEnd, writeEnd, doneReadEnd, doneWriteEnd):
+				os.close(fd)
+		self._checkStatusFunctions(lockSem, 0)
+	
+	def test_acquireDuringForkNotAllowed(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		@processify
+		def getSlotsTakenInChild(lockSem):
+			return lockSem.getSlotsTakenByAnyone()
+		self.assertEqual(getSlotsTakenInChild(lockSem), 0)
+		lockSem.acquire(timeout=0)
+		try:
+			with self.assertRaises(FileSystem.ForkException):
+				getSlotsTakenInChild(lockSem)
+		finally:
+			lockSem.release()
+
+class Test_Concurrency_Lock_FileSystem_ByFCNTL_Persistent(Test_Concurrency_Lock_FileSystem_ByFCNTL):
+	def tearDown(self):
+		pass		# the lock files are kept, because the instances keep them open
+	
+	def getInstance_paramsOnAcquire(self):
+		return FileSystem.FileLock_ByFCNTL(self.__class__.__name__, persistent=True)
+	def getInstance_paramsPreAcquire(self):
+		return FileSystem.FileLock_ByFCNTL(self.__class__.__name__ + " #2", persistent=True, timeout=None, exceptionOnNotAcquire=True)
+	
+	@unittest.skip("the lock file is never removed in persistent mode")
+	def test_probe_followsReplacedFile(self):
+		pass
+	
+	def test_persistent_notEqualToDefaultMode(self):
+		self.assertNotEqual(self._lockSemInstance_paramsOnAcquire, FileSystem.FileLock_ByFCNTL(self.__class__.__name__))
+	
+	def test_persistent_releaseKeepsFile(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		lockSem.acquire(timeout=0)
+		inode = os.stat(lockSem.getLockFilePath()).st_ino
+		lockSem.release()
+		lockSem.acquire(timeout=0)
+		lockSem.release()
+		self.assertEqual(os.stat(lockSem.getLockFilePath()).st_ino, inode)
+	
+	@unittest.skipUnless(_flock.hasOFDLocks(), "needs open file description locks")
+	def test_persistent_threadsExcludeEachOther(self):
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		results = []
+		lockSem.acquire(timeout=0)
+		try:
+			thread = threading.Thread(target=lambda: results.append(lockSem._acquire(shouldBlock=False)))
+			thread.start()
+			thread.join()
+		finally:
+			lockSem.release()
+		self.assertEqual(results, [False])
+	
+	def test_persistent_forkDoesNotShareFile(self):
+		"""A forked process which used the file opened before the fork would share open file description locks"""
+		lockSem = self._lockSemInstance_paramsOnAcquire
+		lockSem.acquire(timeout=0)
+		lockSem.release()
+		readEnd, writeEnd = os.pipe()
+		pid = os.fork()
+		if pid == 0:
+			try:
+				os.read(readEnd, 1)
+				exitCode = 1 if lockSem.acquire(timeout=0, exceptionOnNotAcquire=False) else 0
+			finally:
+				os._exit(exitCode)
+		lockSem.acquire(timeout=0)
+		try:
+			os.write(writeEnd, b"x")
+			_, status = os.waitpid(pid, 0)
+		finally:
+			lockSem.release()
+			os.close(readEnd)
+			os.close(writeEnd)
+		self.assertEqual(os.WEXITSTATUS(status), 0)
@@ -0,0 +1,30 @@
+from Lang.Concurrency import Threading
+from . import test_Abstract
+
+import threading
+import time
+import unittest
+
+class Test_Concurrency_Lock_Threading(test_Abstract.Concurrency_LockSemaphore_TimedMixin, test_Abstract.Concurrency_Lock,
+									unittest.TestCase):
+	def getInstance_paramsOnAcquire(self):
+		return Threading.Lock()
+	def getInstance_paramsPreAcquire(self):
+		return Threading.Lock(timeout=None, exceptionOnNotAcquire=True)
+	
+	def holdElsewhere(self, lockSem, seconds):
+		held = threading.Event()
+		def hold():
+			lockSem.acquire(timeout=None)
+			held.set()
+			time.sleep(seconds)
+			lockSem.release()
+		thread = threading.Thread(target=hold)
+		thread.start()
+		self.addCleanup(thread.join)
+		held.wait()
+	
+	def test_equals(self):
+		"""Each instance is a different lock"""
+		self.assertEqual(self._lockSemInstance_paramsOnAcquire, self._lockSemInstance_paramsOnAcquire)
+		self.assertNotEqual(self._lockSemInstance_paramsOnAcquire, self.getInstance_paramsOnAcquire())
@@ -1,5 +1,6 @@
 from __future__ import division
 from Lang.Diff import SequenceMatcher
+from Lang.Diff._views import SequenceView
 from types import GeneratorType
 import unittest
 
@@ -32,8 +33,8 @@ class Test_SequenceMatcher(unittest.TestCase):
 		self.assertIsInstance(diff.get_matching_elems(), list)
 		elems = diff.get_matching_elems()
 		self.assertEqual(len(elems), 1)
-		self.assertIsInstance(elems[0].a, tuple)
-		self.assertIsInstance(elems[0].b, tuple)
+		self.assertIsInstance(elems[0].a, SequenceView)
+		self.assertIsInstance(elems[0].b, SequenceView)
 		self.assertEqual(elems[0].a, tuple("abcdef"))
 		self.assertEqual(elems[0].b, tuple("abcdef"))
 		
@@ -89,8 +90,8 @@ class Test_SequenceMatcher(unittest.TestCase):
 		elems = diff.get_matching_elems()
 		self.assertEqual(len(elems), 2)
 		
-		self.assertIsInstance(elems[0].a, tuple)
-		self.assertIsInstance(elems[0].b, tuple)
+		self.assertIsInstance(elems[0].a, SequenceView)
+		self.assertIsInstance(elems[0].b, SequenceView)
 		self.assertEqual(elems[0].a, tuple("c"))
 		self.assertEqual(elems[0].b, tuple("c"))
 		self.assertEqual(elems[1].a, tuple("ef"))
@@ -119,3 +120,10 @@ class Test_SequenceMatcher(unittest.TestCase):
 		self.assertIsInstance(diff.get_mismatching_elems_useOnce(), GeneratorType)
 		elems = [i for i in diff.get_mismatching_elems_useOnce()]
 		self.assertEqual(len(elems), 3)
+	
+	def test_nothingMatches(self):
+		diff = SequenceMatcher(a="abc", b="xy")
+		blocks = list(diff.get_mismatching_blocks())
+		self.assertEqual(len(blocks), 1)
+		self.assertEqual((blocks[0].a.index, blocks[0].a.size), (0, 3))
+		self.assertEqual((blocks[0].b.index, blocks[0].b.size), (0, 2))
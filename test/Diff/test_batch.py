@@ -0,0 +1,43 @@
+from Lang.Diff import SequenceMatcher, diff_many
+
+import random
+import unittest
+
+class Test_DiffMany(unittest.TestCase):
+	def _makePairs(self):
+		rand = random.Random(0)
+		pairs = []
+		for _ in range(20):
+			a = tuple(rand.randint(0, 9) for _ in range(rand.randint(0, 50)))
+			b = tuple(rand.randint(0, 9) for _ in range(rand.randint(0, 50)))
+			pairs.append((a, b))
+		pairs.append((tuple("abc"), tuple("abc")))
+		pairs.append(((), ()))
+		return pairs
+	
+	def _expected(self, pairs, **matcherKwargs):
+		return [(index, tuple(tuple(block) for block in SequenceMatcher(a, b, **matcherKwargs).get_matching_blocks())) for index, (a, b) in enumerate(pairs)]
+	
+	def test_ordered(self):
+		pairs = self._makePairs()
+		self.assertEqual(list(diff_many(pairs, workers=2)), self._expected(pairs))
+	
+	def test_unordered(self):
+		pairs = self._makePairs()
+		self.assertEqual(sorted(diff_many(iter(pairs), workers=2, ordered=False, chunksize=3)), self._expected(pairs))
+	
+	def test_inProcess(self):
+		pairs = self._makePairs()
+		self.assertEqual(list(diff_many(pairs, workers=1, skipIdentical=False)), self._expected(pairs))
+	
+	def test_matcherKwargs(self):
+		pairs = self._makePairs()
+		self.assertEqual(list(diff_many(pairs, workers=2, algorithm="myers")), self._expected(pairs, algorithm="myers"))
+	
+	def test_cutoff(self):
+		pairs = [(tuple("abcd"), tuple("abce")), (tuple("abcd"), tuple("wxyz"))]
+		results = list(diff_many(pairs, workers=1, cutoff=0.8))
+		self.assertEqual(results, [(0, ((0, 0, 3),)), (1, None)])
+
+if __name__ == "__main__":
+	unittest.main()
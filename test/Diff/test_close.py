@@ -0,0 +1,32 @@
+from Lang.Diff import SequenceMatcher, CloseMatchIndex, find_close
+
+import random
+import unittest
+
+class Test_FindClose(unittest.TestCase):
+	def test_basic(self):
+		words = ["ape", "apple", "peach", "puppy", "appel"]
+		self.assertEqual(find_close("appel", words, cutoff=0.9), ["appel", "apple"])
+		self.assertEqual(find_close("appel", words, cutoff=0.9, n=1), ["appel"])
+		self.assertEqual(find_close("zzzzz", words, cutoff=0.8), [])
+	
+	def test_sameAsBruteForce(self):
+		rand = random.Random(0)
+		candidates = ["".join(rand.choice("abcde") for _ in range(rand.randint(0, 12))) for _ in range(300)]
+		for gramSize in (1, 2, 3):
+			index = CloseMatchIndex(candidates, gramSize=gramSize)
+			for target in candidates[:30] + ["", "abc"]:
+				for cutoff in (0, 0.5, 0.7, 0.85, 1):
+					expected = set(candidate for candidate in candidates if SequenceMatcher(candidate, target).ratio() >= cutoff)
+					found = index.find_close(target, cutoff=cutoff, n=None)
+					self.assertEqual(set(found), expected)
+					ratios = [SequenceMatcher(candidate, target).ratio() for candidate in found]
+					self.assertEqual(ratios, sorted(ratios, reverse=True))
+	
+	def test_badParameters(self):
+		self.assertRaises(ValueError, find_close, "a", ["a"], cutoff=2)
+		self.assertRaises(ValueError, find_close, "a", ["a"], n=0)
+		self.assertRaises(ValueError, CloseMatchIndex, ["a"], gramSize=0)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import division
+from Lang.Diff import SequenceMatcher, ALGORITHMS
+from Lang.Diff import _engines
+
+import random
+import unittest
+
+def _lcsLength(a, b):
+	"""Plain dynamic programming, used as a reference"""
+	previous = [0] * (len(b) + 1)
+	for elemA in a:
+		current = [0]
+		for j, elemB in enumerate(b):
+			if elemA == elemB:
+				current.append(previous[j] + 1)
+			else:
+				current.append(max(previous[j + 1], current[j]))
+		previous = current
+	return previous[-1]
+
+class Test_Engines(unittest.TestCase):
+	def _checkBlocks(self, engine, a, b):
+		blocks = engine(a, 0, len(a), b, 0, len(b))
+		lastI = lastJ = 0
+		for i, j, size in blocks:
+			self.assertTrue(size > 0)
+			self.assertTrue(i >= lastI and j >= lastJ, "Blocks are not in increasing order")
+			self.assertEqual(a[i:i+size], b[j:j+size])
+			lastI, lastJ = i + size, j + size
+		self.assertEqual(sum(size for _, _, size in blocks), _lcsLength(a, b), "Matching blocks are not a longest common subsequence")
+	
+	def _checkEngine(self, engine):
+		self._checkBlocks(engine, "", "")
+		self._checkBlocks(engine, "abc", "")
+		self._checkBlocks(engine, "", "abc")
+		self._checkBlocks(engine, "abcdef", "abcdef")
+		self._checkBlocks(engine, "abcdef", "uvwxyz")
+		self._checkBlocks(engine, "aebcdef", "abbcdgef")
+		self._checkBlocks(engine, "abcdefg", "cefhi")
+		rand = random.Random(0)
+		for _ in range(200):
+			a = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 30)))
+			b = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 30)))
+			self._checkBlocks(engine, a, b)
+	
+	def test_myers(self):
+		self._checkEngine(_engines.myers)
+	def test_huntSzymanski(self):
+		self._checkEngine(_engines.huntSzymanski)
+	
+	def test_subRange(self):
+		for engine in (_engines.myers, _engines.huntSzymanski):
+			blocks = engine("xxabcxx", 2, 5, "yabcy", 1, 4)
+			self.assertEqual(blocks, [(2, 1, 3)])
+
+class Test_SequenceMatcher_Algorithm(unittest.TestCase):
+	def test_unknownAlgorithm(self):
+		self.assertRaises(ValueError, SequenceMatcher, "abc", "abc", algorithm="foo")
+	
+	def test_sameResultsAsDefault(self):
+		for algorithm in ALGORITHMS:
+			diff = SequenceMatcher(tuple("abcdefg"), tuple("cefhi"), algorithm=algorithm)
+			self.assertEqual(diff.ratio(), 1 - 3/(7+5))
+			blocks = [(block.a.index, block.b.index, block.size) for block in diff.get_matching_blocks()]
+			self.assertEqual(blocks, [(2, 0, 1), (4, 1, 2)])
+			mismatches = [(block.a and (block.a.index, block.a.size), block.b and (block.b.index, block.b.size)) for block in diff.get_mismatching_blocks()]
+			self.assertEqual(mismatches, [((0, 2), None), ((3, 1), None), ((6, 1), (3, 2))])
+			self.assertEqual([elems.a for elems in diff.get_matching_elems()], [tuple("c"), tuple("ef")])
+	
+	def test_noAutojunk(self):
+		"""`difflib` treats frequent elements as junk in sequences of 200 elements or more"""
+		a = ("x",) * 300
+		b = ("x",) * 150 + ("y",) + ("x",) * 150
+		self.assertEqual(SequenceMatcher(a, b, algorithm="myers").ratio(), 1 - 1/(2*(300+301)))
+		self.assertEqual(SequenceMatcher(a, b, algorithm="hunt-szymanski").ratio(), 1 - 1/(2*(300+301)))
+
+if __name__ == "__main__":
+	unittest.main()
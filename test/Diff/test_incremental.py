@@ -0,0 +1,76 @@
+from Lang.Diff import SequenceMatcher, ALGORITHMS
+
+import random
+import unittest
+
+class Test_SequenceMatcher_Incremental(unittest.TestCase):
+	def _checkBlocks(self, diff, a, b):
+		lastI = lastJ = 0
+		for block in diff.get_matching_blocks():
+			self.assertTrue(block.a.index >= lastI and block.b.index >= lastJ, "Blocks are not in increasing order")
+			self.assertEqual(list(a[block.a.index:block.a.index + block.size]), list(b[block.b.index:block.b.index + block.size]))
+			lastI, lastJ = block.a.index + block.size, block.b.index + block.size
+	
+	def test_b2jIsUpdated(self):
+		rand = random.Random(0)
+		for algorithm in ALGORITHMS:
+			a = [rand.randint(0, 20) for _ in range(100)]
+			diff = SequenceMatcher(a, list(a), algorithm=algorithm)
+			diff.ratio()
+			b = list(a)
+			for _ in range(30):
+				newB = list(b)
+				start = rand.randint(0, len(newB))
+				newB[start:start + rand.randint(0, 5)] = [rand.randint(0, 25) for _ in range(rand.randint(0, 5))]
+				diff.rediff(newB)
+				b = newB
+				self.assertEqual(diff.b, b)
+				self.assertEqual(diff.b2j, SequenceMatcher(a, b).b2j)
+				self._checkBlocks(diff, a, b)
+	
+	def test_onlyChangedRegionIsRecomputed(self):
+		a = ["line %d" % i for i in range(1000)]
+		diff = SequenceMatcher(a, list(a))
+		self.assertEqual(diff.ratio(), 1)
+		self.assertEqual(diff.getCacheStats(), {"hits": 0, "misses": 1})
+		
+		b = list(a)
+		b[500] = "changed"
+		diff.rediff(b)
+		self.assertEqual([tuple(block) for block in diff.get_matching_blocks()], [(0, 0, 500), (501, 501, 499)])
+		self.assertEqual(diff.getCacheStats(), {"hits": 2, "misses": 1})
+		mismatches = diff.get_mismatching_elems()
+		self.assertEqual(len(mismatches), 1)
+		self.assertEqual(mismatches[0].a, ("line 500",))
+		self.assertEqual(mismatches[0].b, ("changed",))
+	
+	def test_update_b(self):
+		diff = SequenceMatcher("abcdefgh", "abcdefgh")
+		diff.ratio()
+		diff.update_b([(6, 7, "x"), (1, 3, ""), (4, 4, "yz")])
+		self.assertEqual("".join(diff.b), "adyzefxh")
+		self._checkBlocks(diff, "abcdefgh", "adyzefxh")
+		self.assertEqual(diff.ratio(), SequenceMatcher("abcdefgh", "adyzefxh").ratio())
+		
+		self.assertRaises(ValueError, diff.update_b, [(0, 2, "a"), (1, 3, "b")])
+		self.assertRaises(IndexError, diff.update_b, [(7, 20, "a")])
+	
+	def test_callersSequenceIsNotChanged(self):
+		a = list("abcdef")
+		b = list("abcdef")
+		diff = SequenceMatcher(a, b)
+		diff.ratio()
+		diff.rediff(list("abXdef"))
+		diff.update_b([(0, 1, "Y")])
+		self.assertEqual("".join(diff.b), "YbXdef")
+		self.assertEqual(b, list("abcdef"))
+		self.assertEqual(a, list("abcdef"))
+	
+	def test_interned(self):
+		diff = SequenceMatcher(tuple("abcdef"), tuple("abcdef"), intern=True)
+		diff.ratio()
+		diff.rediff(tuple("abXdef"))
+		self.assertEqual([(elems.a, elems.b) for elems in diff.get_mismatching_elems()], [(("c",), ("X",))])
+
+if __name__ == "__main__":
+	unittest.main()
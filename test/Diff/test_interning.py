@@ -0,0 +1,72 @@
+from Lang.Diff import SequenceMatcher, ALGORITHMS
+from Lang.Struct import FrozenDict
+
+from array import array
+import unittest
+
+class Test_SequenceMatcher_Intern(unittest.TestCase):
+	def _rows(self, names):
+		return [FrozenDict({"name": name, "nested": {"value": len(name)}}) for name in names]
+	
+	def test_storedAsArrays(self):
+		diff = SequenceMatcher(self._rows("abcabc"), self._rows("abd"), intern=True)
+		self.assertIsInstance(diff.a, array)
+		self.assertIsInstance(diff.b, array)
+		self.assertEqual(list(diff.a), [0, 1, 2, 0, 1, 2])
+		self.assertEqual(list(diff.b), [0, 1, 3])
+	
+	def test_sameBlocksAsNotInterned(self):
+		a, b = self._rows("aebcdef"), self._rows("abbcdgef")
+		for algorithm in ALGORITHMS:
+			plain = SequenceMatcher(a, b, algorithm=algorithm)
+			interned = SequenceMatcher(a, b, algorithm=algorithm, intern=True)
+			self.assertEqual([tuple(block) for block in interned.get_matching_blocks()], [tuple(block) for block in plain.get_matching_blocks()])
+			self.assertEqual(interned.ratio(), plain.ratio())
+			self.assertEqual(plain, interned)
+	
+	def test_elemsAreOriginalObjects(self):
+		a, b = self._rows("abcdefg"), self._rows("cefhi")
+		diff = SequenceMatcher(a, b, intern=True)
+		elems = diff.get_matching_elems()
+		self.assertEqual(elems[0].a, (a[2],))
+		self.assertEqual(elems[1].b, (b[1], b[2]))
+		self.assertTrue(elems[0].a[0] is a[2])
+		mismatches = diff.get_mismatching_elems()
+		self.assertEqual(mismatches[-1].b, tuple(b[3:]))
+	
+	def test_isjunkGetsOriginalElems(self):
+		seen = set()
+		def isjunk(elem):
+			seen.add(elem)
+			return elem == " "
+		diff = SequenceMatcher("a b", "a  b", isjunk=isjunk, intern=True)
+		diff.ratio()
+		self.assertEqual(seen, set("a b"))
+	
+	def test_setSeqs(self):
+		diff = SequenceMatcher("abc", "abc", intern=True)
+		diff.set_seq2("abd")
+		self.assertEqual([elems.b for elems in diff.get_mismatching_elems()], [("d",)])
+	
+	def test_tablePrunedWhenSidesReplaced(self):
+		diff = SequenceMatcher(range(10), range(10), intern=True)
+		for start in xrange(0, 5000, 100):
+			diff.set_seq2(range(start, start + 100))
+		self.assertLess(len(diff._internTable), 2 * 110 + 1100)
+		self.assertEqual([elems.b for elems in diff.get_matching_elems()], [])
+		diff.set_seq2(range(5, 15))
+		self.assertEqual([elems.b for elems in diff.get_matching_elems()], [tuple(range(5, 10))])
+	
+	def test_tablePrunedByRediff(self):
+		def isjunk(elem):
+			return elem == -1
+		diff = SequenceMatcher(range(10), range(10), intern=True, isjunk=isjunk)
+		for start in xrange(0, 5000, 100):
+			diff.rediff(range(5) + range(start + 1000, start + 1100))
+		self.assertLess(len(diff._internTable), 2 * 115 + 1100)
+		diff.rediff(range(10) + [-1])
+		self.assertEqual([elems.b for elems in diff.get_matching_elems()], [tuple(range(10))])
+		self.assertEqual(list(diff._getSideElems("b")), range(10) + [-1])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,77 @@
+from Lang.Diff import merge3
+
+import random
+import unittest
+
+def _merged(hunks):
+	return "".join("".join(hunk.elems) for hunk in hunks)
+
+class Test_merge3(unittest.TestCase):
+	def test_noChanges(self):
+		hunks = merge3("abc", "abc", "abc")
+		self.assertEqual([(hunk.source, tuple(hunk.elems)) for hunk in hunks], [("base", tuple("abc"))])
+		self.assertEqual(merge3("", "", ""), [])
+	
+	def test_clean(self):
+		hunks = merge3("abcdefg", "aXcdefg", "abcdeYg")
+		self.assertFalse(any(hunk.isConflict for hunk in hunks))
+		self.assertEqual(_merged(hunks), "aXcdeYg")
+		self.assertEqual([hunk.source for hunk in hunks], ["base", "ours", "base", "theirs", "base"])
+	
+	def test_deleteAndInsert(self):
+		self.assertEqual(_merged(merge3("abcdefg", "abefg", "abcdefgh")), "abefgh")
+		self.assertEqual(_merged(merge3("abc", "", "abc")), "")
+	
+	def test_sameChange(self):
+		hunks = merge3("abcdefg", "abXdefg", "abXdefg")
+		self.assertEqual([hunk.source for hunk in hunks], ["base", "both", "base"])
+		self.assertEqual(_merged(hunks), "abXdefg")
+	
+	def test_conflict(self):
+		hunks = merge3("abcdefg", "abXdefg", "abYdefg")
+		conflicts = [hunk for hunk in hunks if hunk.isConflict]
+		self.assertEqual(len(conflicts), 1)
+		self.assertEqual((tuple(conflicts[0].base), tuple(conflicts[0].ours), tuple(conflicts[0].theirs)), (("c",), ("X",), ("Y",)))
+	
+	def test_interned(self):
+		base = [("row", i) for i in range(10)]
+		ours = base[:3] + [("new", 0)] + base[3:]
+		theirs = base[:8] + base[9:]
+		hunks = merge3(base, ours, theirs, intern=True, algorithm="myers")
+		self.assertEqual([elem for hunk in hunks for elem in hunk.elems], base[:3] + [("new", 0)] + base[3:8] + base[9:])
+	
+	def test_mixedSequenceTypes(self):
+		for intern in (False, True):
+			for base, ours, theirs in ((tuple("abcdefg"), list("aXcdefg"), list("abcdeYg")), ("abcdefg", list("aXcdefg"), iter("abcdeYg"))):
+				hunks = merge3(base, ours, theirs, intern=intern)
+				self.assertFalse(any(hunk.isConflict for hunk in hunks))
+				self.assertEqual([elem for hunk in hunks for elem in hunk.elems], list("aXcdeYg"))
+				self.assertEqual([hunk.source for hunk in hunks], ["base", "ours", "base", "theirs", "base"])
+	
+	def test_interned_tablePruned(self):
+		"""`ours` is much longer than the other two, so the intern table is pruned when `theirs` is diffed"""
+		base = range(10)
+		ours = base + range(100, 2100)
+		theirs = base[1:]
+		hunks = merge3(base, ours, theirs, intern=True)
+		self.assertFalse(any(hunk.isConflict for hunk in hunks))
+		self.assertEqual([elem for hunk in hunks for elem in hunk.elems], range(1, 10) + range(100, 2100))
+	
+	def test_randomNonOverlapping(self):
+		"""Changes to different halves of `base` always merge cleanly"""
+		rand = random.Random(0)
+		for _ in range(50):
+			base = [rand.randint(0, 1000) for _ in range(40)]
+			ours = base[:20]
+			theirs = base[20:]
+			for _ in range(3):
+				ours.insert(rand.randint(1, len(ours) - 1), -1)
+				theirs.insert(rand.randint(1, len(theirs) - 1), -2)
+			ours, theirs = ours + base[20:], base[:20] + theirs
+			hunks = merge3(base, ours, theirs, algorithm="myers")
+			self.assertFalse(any(hunk.isConflict for hunk in hunks))
+			merged = [elem for hunk in hunks for elem in hunk.elems]
+			self.assertEqual(merged, ours[:len(ours) - 20] + theirs[20:])
+
+if __name__ == "__main__":
+	unittest.main()
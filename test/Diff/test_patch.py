@@ -0,0 +1,112 @@
+from Lang.Diff import SequenceMatcher, Patch
+
+from datetime import date
+import cPickle as pickle
+import random
+import struct
+import unittest
+
+class Test_Patch(unittest.TestCase):
+	def _randomPairs(self):
+		rand = random.Random(0)
+		yield "", ""
+		yield "abc", ""
+		yield "", "abc"
+		yield "aebcdef", "abbcdgef"
+		for _ in range(100):
+			a = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 20)))
+			b = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 20)))
+			yield a, b
+	
+	def test_ops(self):
+		patch = SequenceMatcher("abcdefg", "cefhi").get_patch()
+		self.assertEqual(list(patch), [(Patch.DELETE, 0, 0, 2), (Patch.EQUAL, 2, 0, 1), (Patch.DELETE, 3, 1, 1), (Patch.EQUAL, 4, 1, 2),
+									(Patch.DELETE, 6, 3, 1), (Patch.INSERT, 7, 3, 2)])
+	
+	def test_apply(self):
+		for a, b in self._randomPairs():
+			patch = SequenceMatcher(a, b).get_patch()
+			self.assertEqual(patch.apply(a), b)
+			self.assertEqual(patch.apply(tuple(a)), tuple(b))
+			self.assertEqual(patch.apply(list(a)), list(b))
+		self.assertRaises(ValueError, patch.apply, a + "x")
+	
+	def test_invert(self):
+		for a, b in self._randomPairs():
+			patch = SequenceMatcher(a, b).get_patch()
+			inverted = patch.invert()
+			self.assertEqual(inverted.apply(b), a)
+			self.assertEqual(inverted.invert(), patch)
+			self.assertEqual(list(inverted), list(SequenceMatcher(a, b).get_patch(includePayload=False).invert()))
+	
+	def test_bytes(self):
+		for includePayload in (True, False):
+			patch = SequenceMatcher(tuple("aebcdef"), tuple("abbcdgef")).get_patch(includePayload)
+			self.assertEqual(Patch.from_bytes(patch.to_bytes()), patch)
+			self.assertEqual(pickle.loads(pickle.dumps(patch, pickle.HIGHEST_PROTOCOL)), patch)
+		self.assertRaises(ValueError, Patch.from_bytes, "garbage")
+		self.assertRaises(ValueError, Patch.from_bytes, patch.to_bytes()[:-1])
+	
+	def test_bytesPayloadIsNotPickled(self):
+		patch = SequenceMatcher(list("abc"), ["a", ("x", 1), u"y\xe9", "c"]).get_patch()
+		self.assertEqual(Patch.from_bytes(patch.to_bytes()), patch)
+		elems = [None, True, False, -5, 1L, 1 << 70, -(1 << 63), 0.5, "", u"", ("a", (u"b", [1, 2.0])), []]
+		patch = Patch.fromBlocks([], [], elems)
+		self.assertEqual(Patch.from_bytes(patch.to_bytes()).apply([]), elems)
+		self.assertEqual([type(elem) for elem in Patch.from_bytes(patch.to_bytes()).apply([])], [type(elem) for elem in elems])
+		
+		patch = SequenceMatcher([date(2000, 1, 1)], [date(2000, 1, 2)]).get_patch()		# not a built-in type
+		self.assertRaises(ValueError, Patch.from_bytes, patch.to_bytes())
+		self.assertEqual(Patch.from_bytes(patch.to_bytes(), allowPickle=True), patch)
+		self.assertEqual(pickle.loads(pickle.dumps(patch, pickle.HIGHEST_PROTOCOL)), patch)
+	
+	def test_bytesBadHeader(self):
+		patch = SequenceMatcher("abc", "abd").get_patch(includePayload=False)
+		data = patch.to_bytes()
+		header = struct.Struct("<4sBqqq")
+		ops = data[header.size:]
+		self.assertEqual(Patch.from_bytes(header.pack("LDP1", 0, 3, 3, len(patch)) + ops), patch)
+		for numOps in (-1, -5, len(patch) - 1, 10, 1 << 40):
+			self.assertRaises(ValueError, Patch.from_bytes, header.pack("LDP1", 0, 3, 3, numOps) + ops)
+		self.assertRaises(ValueError, Patch.from_bytes, header.pack("LDP1", 0, 3, -1, len(patch)) + ops)
+		self.assertRaises(ValueError, Patch.from_bytes, header.pack("LDP1", 64, 3, 3, len(patch)) + ops)
+		self.assertRaises(ValueError, Patch.from_bytes, Patch([Patch.EQUAL, 0, 0, 5], 3, 3).to_bytes())		# op past the end
+		self.assertRaises(ValueError, Patch.from_bytes, Patch([7, 0, 0, 3], 3, 3).to_bytes())
+		self.assertRaises(ValueError, Patch.from_bytes, data + "x")
+	
+	def test_bytesBadPayload(self):
+		"""Damaged payloads raise `ValueError`, and never anything else"""
+		patch = Patch.fromBlocks([(0, 0, 1)], list("abc"), ["a", ("x", 1, [u"y", 2.5, None]), 1 << 70, "c"])
+		data = patch.to_bytes()
+		payloadStart = struct.calcsize("<4sBqqq") + len(patch) * 4 * 8
+		for end in xrange(len(data)):
+			self.assertRaises(ValueError, Patch.from_bytes, data[:end])
+		rand = random.Random(0)
+		for _ in range(2000):
+			damaged = bytearray(data)
+			damaged[rand.randrange(payloadStart, len(data))] = rand.randrange(256)
+			try:
+				Patch.from_bytes(str(damaged))
+			except ValueError:
+				pass
+		
+		nested = []
+		for _ in range(100):
+			nested = [nested]
+		patch = Patch.fromBlocks([], [], [nested])
+		self.assertRaises(ValueError, Patch.from_bytes, patch.to_bytes())		# pickled, since it's nested too deeply
+		self.assertEqual(Patch.from_bytes(patch.to_bytes(), allowPickle=True), patch)
+	
+	def test_noPayload(self):
+		patch = SequenceMatcher("abc", "abd").get_patch(includePayload=False)
+		self.assertFalse(patch.hasPayload)
+		self.assertRaises(ValueError, patch.apply, "abc")
+		self.assertEqual(SequenceMatcher("abc", "ab").get_patch(includePayload=False).apply("abc"), "ab")
+	
+	def test_interned(self):
+		a, b = [("x", 1), ("y", 2)], [("y", 2), ("z", 3)]
+		patch = SequenceMatcher(a, b, intern=True).get_patch()
+		self.assertEqual(patch.apply(a), b)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,58 @@
+from Lang.Diff import SequenceMatcher, stream_mismatching
+
+from itertools import chain, count
+import random
+import unittest
+
+class Test_StreamMismatching(unittest.TestCase):
+	def _checkValidDiff(self, a, b, mismatches):
+		"""Everything that is not in a mismatch must be equal on both sides, and in the same order"""
+		removedA, removedB = set(), set()
+		for mismatch in mismatches:
+			for side, removed, original in ((mismatch.a, removedA, a), (mismatch.b, removedB, b)):
+				if side.elems == None:
+					continue
+				self.assertEqual(side.elems, tuple(original[side.index:side.index + side.size]))
+				removed.update(range(side.index, side.index + side.size))
+		self.assertEqual([elem for i, elem in enumerate(a) if i not in removedA],
+						 [elem for i, elem in enumerate(b) if i not in removedB])
+	
+	def test_sameAsSequenceMatcher(self):
+		a, b = tuple("abcdefg"), tuple("cefhi")
+		expected = [(i.a and (i.a.index, i.a.size), i.b and (i.b.index, i.b.size)) for i in SequenceMatcher(a, b).get_mismatching_blocks()]
+		streamed = [(i.a.elems and (i.a.index, i.a.size), i.b.elems and (i.b.index, i.b.size)) for i in stream_mismatching(iter(a), iter(b))]
+		self.assertEqual(streamed, expected)
+	
+	def test_identical(self):
+		self.assertEqual(list(stream_mismatching(iter(range(100)), iter(range(100)), windowSize=7)), [])
+	
+	def test_empty(self):
+		self.assertEqual(list(stream_mismatching(iter([]), iter([]))), [])
+		mismatches = list(stream_mismatching(iter([]), iter("abc"), windowSize=2))
+		self._checkValidDiff([], "abc", mismatches)
+	
+	def test_randomEdits(self):
+		rand = random.Random(0)
+		for windowSize in (1, 2, 5, 50, 1000):
+			for _ in range(20):
+				a = [rand.randint(0, 40) for _ in range(rand.randint(0, 200))]
+				b = list(a)
+				for _ in range(rand.randint(0, 10)):
+					if len(b) != 0 and rand.random() < 0.5:
+						del b[rand.randrange(len(b))]
+					else:
+						b.insert(rand.randint(0, len(b)), rand.randint(0, 40))
+				mismatches = list(stream_mismatching(iter(a), iter(b), windowSize=windowSize))
+				self._checkValidDiff(a, b, mismatches)
+	
+	def test_lazy(self):
+		"""Only a window of each side should be read before a mismatch is reported"""
+		a = chain(["x"], count())
+		b = chain(["y"], count())
+		mismatch = next(stream_mismatching(a, b, windowSize=10))
+		self.assertEqual(mismatch.a.elems, ("x",))
+		self.assertEqual(mismatch.b.elems, ("y",))
+		self.assertEqual(next(a), 9)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,53 @@
+from Lang.Diff import SequenceMatcher
+from Lang.Diff._views import SequenceView
+
+import unittest
+
+class Test_SequenceView(unittest.TestCase):
+	def test_sequence(self):
+		elems = list("abcdefg")
+		view = SequenceView(elems, 2, 5)
+		self.assertEqual(len(view), 3)
+		self.assertEqual(view[0], "c")
+		self.assertEqual(view[-1], "e")
+		self.assertRaises(IndexError, view.__getitem__, 3)
+		self.assertEqual(list(view), ["c", "d", "e"])
+		self.assertEqual(view, tuple("cde"))
+		self.assertEqual(tuple("cde"), view)
+		self.assertNotEqual(view, tuple("cd"))
+		self.assertEqual(hash(view), hash(tuple("cde")))
+		self.assertEqual(view, list("cde"))
+		self.assertEqual(view, SequenceView("xcde", 1, 4))
+		self.assertNotEqual(view, "cde")		# it hashes like a tuple, so it must not be equal to a string
+		self.assertNotEqual("cde", view)
+		self.assertNotEqual(view, iter("cde"))
+		self.assertFalse(view == set("cde"))
+		self.assertEqual(repr(view), repr(tuple("cde")))
+	
+	def test_slice(self):
+		view = SequenceView("abcdefg", 1, 6)
+		self.assertIsInstance(view[1:3], SequenceView)
+		self.assertEqual(view[1:3], tuple("cd"))
+		self.assertEqual(view[3:1], ())
+		self.assertEqual(view[::2], tuple("bdf"))
+	
+	def test_noCopy(self):
+		elems = list("abc")
+		view = SequenceView(elems, 0, 3)
+		elems[1] = "x"
+		self.assertEqual(view, tuple("axc"))
+	
+	def test_decode(self):
+		view = SequenceView([2, 0], 0, 2, ["x", "y", "z"].__getitem__)
+		self.assertEqual(view, ("z", "x"))
+	
+	def test_diffElems(self):
+		for intern in (False, True):
+			diff = SequenceMatcher(list("abcdefg"), list("cefhi"), intern=intern)
+			elems = diff.get_matching_elems()
+			self.assertIsInstance(elems[1].a, SequenceView)
+			self.assertEqual([(match.a, match.b) for match in elems], [(tuple("c"), tuple("c")), (tuple("ef"), tuple("ef"))])
+			self.assertEqual([match.a for match in diff.get_mismatching_elems()], [tuple("ab"), tuple("d"), tuple("g")])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,72 @@
+from Lang.Struct import OrderedSet
+
+import random
+from abc import ABCMeta, abstractmethod
+
+class Struct_OrderedSet_Abstract(object):
+	"""Tests which every `AbstractOrderedSet` implementation must pass, by comparing it with `OrderedSet`"""
+	__metaclass__ = ABCMeta
+	@abstractmethod
+	def getInstance(self, iterable=None):
+		pass
+	
+	def test_equalToOrderedSet(self):
+		set_ = self.getInstance("abcb")
+		self.assertEqual(set_, OrderedSet("abc"))
+		self.assertNotEqual(set_, OrderedSet("acb"))
+		self.assertEqual(list(set_), list("abc"))
+		self.assertEqual(len(set_), 3)
+		self.assertIn("b", set_)
+		self.assertNotIn("d", set_)
+	
+	def test_sameAsOrderedSet(self):
+		"""Random operations give the same results as on `OrderedSet`"""
+		rand = random.Random(0)
+		expected, actual = OrderedSet(), self.getInstance()
+		for _ in range(3000):
+			action = rand.randint(0, 9)
+			elem = rand.randint(0, 60)
+			if action <= 1:
+				updateOnExist = rand.random() < 0.5
+				self.assertEqual(actual.add(elem, updateOnExist), expected.add(elem, updateOnExist))
+			elif action == 2:
+				actual.discard(elem)
+				expected.discard(elem)
+			elif action == 3 and len(expected) != 0:
+				index = rand.randrange(len(expected))
+				if expected[index] != elem:
+					self.assertEqual(actual.insertAt(index, elem), expected.insertAt(index, elem))
+			elif action == 4 and len(expected) != 0:
+				index = rand.randrange(len(expected))
+				if elem not in expected:
+					actual[index] = elem
+					expected[index] = elem
+			elif action == 5 and len(expected) != 0:
+				index = rand.randrange(len(expected))
+				del actual[index]
+				del expected[index]
+			elif action == 6 and len(expected) != 0:
+				self.assertEqual(actual.pop(), expected.pop())
+			elif action == 7 and len(expected) != 0:
+				after = expected[rand.randrange(len(expected))]
+				newElems = rand.sample(range(61), 3)
+				if after not in newElems:
+					self.assertEqual(actual.insertMultiBefore(newElems, after, True), expected.insertMultiBefore(newElems, after, True))
+			elif action == 8:
+				slice_ = slice(rand.randint(-5, 40), rand.randint(-5, 40))
+				newElems = rand.sample(range(61), rand.randint(0, 3))
+				actual[slice_] = newElems
+				expected[slice_] = newElems
+			elif action == 9:
+				slice_ = slice(rand.randint(-5, 40), rand.randint(-5, 40), rand.choice((1, 2, -1, -3)))
+				del actual[slice_]
+				del expected[slice_]
+			self.assertEqual(list(actual), list(expected))
+			self.assertEqual(list(reversed(actual)), list(reversed(expected)))
+			slice_ = slice(rand.randint(-5, 40), rand.randint(-5, 40), rand.choice((None, 2, -1, -3)))
+			self.assertEqual(list(actual[slice_]), list(expected)[slice_])
+			self.assertEqual(list(expected[slice_]), list(expected)[slice_])
+			self.assertEqual(len(actual), len(expected))
+			if len(expected) != 0:
+				elem = expected[rand.randrange(len(expected))]
+				self.assertEqual(actual.index(elem), expected.index(elem))
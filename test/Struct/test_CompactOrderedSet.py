@@ -0,0 +1,79 @@
+from Lang.Struct import OrderedSet, CompactOrderedSet
+from Lang.Struct import _CompactOrderedSet
+from test_Abstract_OrderedSet import Struct_OrderedSet_Abstract
+
+import unittest
+
+class Test_CompactOrderedSet(Struct_OrderedSet_Abstract, unittest.TestCase):
+	def getInstance(self, iterable=None):
+		return CompactOrderedSet(iterable)
+	
+	def test_compaction(self):
+		set_ = CompactOrderedSet(range(100))
+		for elem in range(0, 100, 3):
+			set_.discard(elem)
+		expected = [elem for elem in range(100) if elem % 3 != 0]
+		self.assertEqual(list(set_), expected)
+		self.assertEqual(list(reversed(set_)), expected[::-1])
+		self.assertEqual(set_.index(expected[10]), 10)
+		self.assertEqual(set_[10], expected[10])
+		self.assertEqual(set_[-1], 98)
+	
+	def test_popAfterDiscard(self):
+		set_ = CompactOrderedSet("abcd")
+		set_.discard("d")
+		set_.discard("c")
+		self.assertEqual(set_.pop(), "b")
+		self.assertEqual(set_.pop(), "a")
+		self.assertRaises(KeyError, set_.pop)
+	
+	def test_replace(self):
+		set_ = CompactOrderedSet("abcd")
+		set_.replace("b", "x")
+		self.assertEqual(set_, OrderedSet("axcd"))
+		set_.replace("x", "d")
+		self.assertEqual(set_, OrderedSet("adc"))
+		self.assertRaises(ValueError, set_.replace, "z", "y")
+	
+	def test_insertBefore(self):
+		set_ = CompactOrderedSet("bdace")
+		set_.insertBefore("c", "d", updateOnExist=True)
+		self.assertEqual(set_, OrderedSet("bcdae"))
+		set_.insertBefore("a", "b", updateOnExist=True)
+		self.assertEqual(set_, OrderedSet("abcde"))
+		self.assertFalse(set_.insertBefore("d", "c", updateOnExist=False))
+		self.assertEqual(set_, OrderedSet("abcde"))
+	
+	def test_compactionThresholds(self):
+		"""Tombstones are only removed once there are at least `_MIN_COMPACT` of them, and they take up half of the keys"""
+		minCompact = _CompactOrderedSet._MIN_COMPACT
+		set_ = CompactOrderedSet(range(minCompact * 3))
+		keys = lambda: set_._CompactOrderedSet__keys
+		tombstones = lambda: set_._CompactOrderedSet__tombstones
+		for elem in range(minCompact * 3 // 2 - 1):
+			set_.discard(elem)
+		self.assertEqual(tombstones(), minCompact * 3 // 2 - 1)
+		self.assertEqual(len(keys()), minCompact * 3)
+		set_.discard(minCompact * 3 // 2 - 1)
+		self.assertEqual(tombstones(), 0, "Half of the keys are tombstones")
+		self.assertEqual(keys(), range(minCompact * 3 // 2, minCompact * 3))
+		
+		set_ = CompactOrderedSet(range(minCompact))
+		for elem in range(minCompact - 2):
+			set_.discard(elem)
+		self.assertEqual(tombstones(), minCompact - 2, "Fewer than `_MIN_COMPACT` tombstones are kept, even if they are most of the keys")
+		set_.discard(minCompact - 1)
+		self.assertEqual(keys(), [_CompactOrderedSet._TOMBSTONE] * (minCompact - 2) + [minCompact - 2], "Tombstones at the end are dropped")
+		self.assertEqual(set_.index(minCompact - 2), 0)
+		self.assertEqual(tombstones(), 0, "Reading by index compacts")
+	
+	def test_sameAsOrderedSet(self):
+		oldMinCompact = _CompactOrderedSet._MIN_COMPACT
+		_CompactOrderedSet._MIN_COMPACT = 2		# so that it compacts often
+		try:
+			super(Test_CompactOrderedSet, self).test_sameAsOrderedSet()
+		finally:
+			_CompactOrderedSet._MIN_COMPACT = oldMinCompact
+
+if __name__ == "__main__":
+	unittest.main()
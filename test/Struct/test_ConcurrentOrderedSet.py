@@ -0,0 +1,140 @@
+from Lang.Struct import OrderedSet, ConcurrentOrderedSet, IndexedOrderedSet
+from test_Abstract_OrderedSet import Struct_OrderedSet_Abstract
+
+import threading
+import unittest
+
+class Test_ConcurrentOrderedSet(Struct_OrderedSet_Abstract, unittest.TestCase):
+	def getInstance(self, iterable=None):
+		return ConcurrentOrderedSet(iterable)
+	
+	def test_setClass(self):
+		set_ = ConcurrentOrderedSet("abcd", setClass=IndexedOrderedSet)
+		self.assertIsInstance(set_._set, IndexedOrderedSet)
+		set_.insertAt(1, "x")
+		self.assertEqual(set_, OrderedSet("axbcd"))
+	
+	def test_snapshot(self):
+		set_ = ConcurrentOrderedSet("abc")
+		snapshot = set_.snapshot()
+		self.assertEqual(snapshot, ("a", "b", "c"))
+		self.assertIs(set_.snapshot(), snapshot, "Snapshot should be shared until the set changes")
+		set_.add("d")
+		self.assertEqual(snapshot, ("a", "b", "c"))
+		self.assertEqual(set_.snapshot(), ("a", "b", "c", "d"))
+	
+	def test_snapshotIsolation(self):
+		"""Readers see each bulk change either completely or not at all"""
+		set_ = ConcurrentOrderedSet(range(10))
+		batch = [("batch", i) for i in xrange(200)]
+		stop = threading.Event()
+		errors = []
+		def writer():
+			try:
+				while not stop.is_set():
+					set_.extend(batch)
+					set_.difference_update(batch)
+			except Exception as e:
+				errors.append(e)
+		thread = threading.Thread(target=writer)
+		thread.start()
+		try:
+			for _ in xrange(300):
+				elems = list(set_)
+				self.assertIn(len(elems), (10, 210))
+				self.assertEqual(elems[:10], range(10))
+				self.assertEqual(elems[10:], batch[:len(elems) - 10])
+		finally:
+			stop.set()
+			thread.join()
+		self.assertEqual(errors, [])
+	
+	def test_changeWhileIterating(self):
+		set_ = ConcurrentOrderedSet("abc")
+		seen = []
+		for elem in set_:
+			seen.append(elem)
+			set_.discard("c")
+			set_.add(elem + elem)
+		self.assertEqual(seen, list("abc"), "Iteration should be unaffected by changes to the set")
+		self.assertEqual(set_, OrderedSet(["a", "b", "aa", "bb", "cc"]))
+	
+	def test_errorKeepsSetConsistent(self):
+		set_ = ConcurrentOrderedSet("ab")
+		list(set_)
+		self.assertRaises(ValueError, set_.replace, "x", "y")
+		self.assertRaises(KeyError, set_.__getitem__, 2)
+		set_.add("c")
+		self.assertEqual(list(set_), list("abc"))
+	
+	def test_changeWithSelf(self):
+		set_ = ConcurrentOrderedSet("abc")
+		set_.add("d")
+		set_.extend(set_)
+		self.assertEqual(set_, OrderedSet("abcd"))
+		set_.add("e")
+		set_ -= set_
+		self.assertEqual(len(set_), 0)
+	
+	def _runWithTimeout(self, func):
+		"""Runs `func` in another thread, so that a deadlock fails the test instead of hanging it"""
+		errors = []
+		def run():
+			try:
+				func()
+			except Exception as e:
+				errors.append(e)
+		thread = threading.Thread(target=run)
+		thread.daemon = True
+		thread.start()
+		thread.join(5)
+		self.assertFalse(thread.is_alive(), "Deadlocked")
+		self.assertEqual(errors, [])
+	
+	def test_changeWithViewOfSelf(self):
+		set_ = ConcurrentOrderedSet("abcdef")
+		self._runWithTimeout(lambda: set_.difference_update(set_[0:2]))
+		self.assertEqual(set_, OrderedSet("cdef"))
+		def setSlice():
+			set_[0:1] = set_[2:4]
+		self._runWithTimeout(setSlice)
+		self.assertEqual(set_, OrderedSet("efd"))
+		self._runWithTimeout(lambda: set_.extend(elem * 2 for elem in set_))
+		self.assertEqual(set_, OrderedSet(["e", "f", "d", "ee", "ff", "dd"]))
+		self.assertEqual(set_.snapshot(), ("e", "f", "d", "ee", "ff", "dd"), "Snapshot read during the change must not be kept")
+	
+	def test_threads(self):
+		set_ = ConcurrentOrderedSet()
+		errors = []
+		def writer(threadNum):
+			try:
+				elems = [(threadNum, i) for i in xrange(300)]
+				for elem in elems:
+					set_.add(elem)
+				for elem in elems[::2]:
+					set_.discard(elem)
+				set_.extend(elems[::2])
+			except Exception as e:
+				errors.append(e)
+		def reader():
+			try:
+				for _ in xrange(100):
+					elems = list(set_)
+					if len(elems) != len(set(elems)):
+						raise AssertionError("Duplicate elements in snapshot")
+			except Exception as e:
+				errors.append(e)
+		threads = [threading.Thread(target=writer, args=(threadNum,)) for threadNum in xrange(8)]
+		threads += [threading.Thread(target=reader) for _ in xrange(4)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(errors, [])
+		self.assertEqual(len(set_), 8 * 300)
+		for threadNum in xrange(8):
+			elems = [elem for elem in set_ if elem[0] == threadNum]
+			self.assertEqual(elems, [(threadNum, i) for i in xrange(1, 300, 2)] + [(threadNum, i) for i in xrange(0, 300, 2)])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,60 @@
+from Lang.Struct import FIFOqueue
+
+import copy
+import cPickle as pickle
+import unittest
+
+class Test_FIFOqueue(unittest.TestCase):
+	def _constructQueue(self, capacity=None):
+		queue = FIFOqueue(capacity)
+		for item in "abcd":
+			queue.push(item)
+		return queue
+	
+	def test_pop(self):
+		queue = self._constructQueue()
+		self.assertEqual(queue.pop(), "a")
+		self.assertEqual(queue.pop(), "b")
+		queue.push("e")
+		self.assertEqual(queue.pop(), "c")
+		self.assertEqual(queue.pop(), "d")
+		self.assertEqual(queue.pop(), "e")
+		self.assertRaises(IndexError, queue.pop)
+	
+	def test_peek(self):
+		queue = self._constructQueue()
+		self.assertEqual(queue.peek(), "a")
+		self.assertEqual(queue.peek(2), "b")
+		self.assertEqual(queue[-1], "d")
+		queue[0] = "x"
+		self.assertEqual(queue.peek(), "x")
+		self.assertEqual(len(queue), 4)
+	
+	def test_capacity(self):
+		queue = self._constructQueue(capacity=2)
+		self.assertEqual(len(queue), 2, "The front items should be dropped when the queue is full")
+		self.assertEqual(queue.pop(), "c")
+	
+	def test_equal(self):
+		self.assertEqual(self._constructQueue(), self._constructQueue())
+		queue = self._constructQueue()
+		queue.pop()
+		self.assertNotEqual(queue, self._constructQueue())
+	
+	def test_toString(self):
+		"""This is for code coverage only"""
+		str(FIFOqueue())
+		repr(self._constructQueue())
+	
+	def test_copy(self):
+		for capacity in (None, 4):
+			queue = self._constructQueue(capacity)
+			for copied in [copy.copy(queue), copy.deepcopy(queue)] + [pickle.loads(pickle.dumps(queue, protocol)) for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]:
+				self.assertEqual(copied, queue)
+				copied.push("e")
+				self.assertEqual(len(queue), 4, "Pushing onto a copy should not change the original")
+				self.assertEqual(copied.pop(), "a" if capacity is None else "b")
+				self.assertEqual(queue.peek(), "a")
+
+if __name__ == "__main__":
+	unittest.main()
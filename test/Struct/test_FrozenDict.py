@@ -1,7 +1,18 @@
 from Lang.Struct import FrozenDict
 
+import copy
+import cPickle
+import pickle
 import unittest
 
+class _Unhashable(object):
+	__hash__ = None
+
+class _SameHash(object):
+	"""Instances are only equal to themselves, but all have the same hash"""
+	def __hash__(self):
+		return 1
+
 class Test_FrozenDict(unittest.TestCase):
 	def test_equal(self):
 		dict_ = {"a":1, "b":2, "c":3}
@@ -25,6 +36,97 @@ class Test_FrozenDict(unittest.TestCase):
 	def test_hash(self):
 		self.assertEqual(hash(FrozenDict({"a":1, "b":2, "c":3})), hash(FrozenDict({"a":1, "b":2, "c":3})))
 	
+	def test_lazy(self):
+		nested = {"c": 3, "d": [{"e": 5}]}
+		lazy = FrozenDict.lazy({"a": nested, "b": [1, 2]})
+		self.assertIs(dict.__getitem__(lazy, "a"), nested, "Nested values should not be converted before they are accessed")
+		self.assertIsInstance(lazy["a"], FrozenDict)
+		self.assertIs(lazy["a"], lazy["a"], "Nested values should only be converted once")
+		self.assertIsInstance(lazy["a"]["d"][0], FrozenDict)
+		self.assertEqual(lazy.get("b"), (1, 2))
+		self.assertEqual(lazy.get("x", 4), 4)
+		eager = FrozenDict({"a": nested, "b": [1, 2]})
+		self.assertEqual(FrozenDict.lazy({"a": nested, "b": [1, 2]}), eager)
+		self.assertEqual(eager, FrozenDict.lazy({"a": nested, "b": [1, 2]}))
+		self.assertEqual(hash(FrozenDict.lazy({"a": nested, "b": [1, 2]})), hash(eager))
+		self.assertEqual(dict(FrozenDict.lazy({"a": [1]}).items()), {"a": (1,)})
+		self.assertTrue(repr(FrozenDict.lazy({"a": [1]})).startswith("FrozenDict("))
+	
+	def test_interned(self):
+		first = FrozenDict.interned({"a": {"b": 1}, "c": [{"b": 1}]})
+		second = FrozenDict.interned({"a": {"b": 1}, "c": [{"b": 1}]})
+		self.assertIs(first, second)
+		self.assertIs(first["a"], first["c"][0], "Equal nested dicts should be the same instance")
+		self.assertEqual(first, FrozenDict({"a": {"b": 1}, "c": [{"b": 1}]}))
+		self.assertNotEqual(first, FrozenDict.interned({"a": {"b": 2}}))
+		self.assertRaises(TypeError, FrozenDict.interned, {"a": _Unhashable()})
+	
+	def test_internedSubclass(self):
+		class Sub(FrozenDict):
+			__slots__ = ()
+		self.assertEqual(FrozenDict({1: 2}), Sub({1: 2}))
+		self.assertEqual(FrozenDict.interned({1: 2}), Sub.interned({1: 2}), "Being interned should not change equality")
+		self.assertEqual(Sub.interned({1: 2}), FrozenDict.interned({1: 2}))
+		self.assertIsNot(FrozenDict.interned({1: 2}), Sub.interned({1: 2}))
+		self.assertNotEqual(FrozenDict.interned({1: 2}), Sub.interned({1: 3}))
+	
+	def test_internedHashCollision(self):
+		keyA, keyB = _SameHash(), _SameHash()
+		first, second = FrozenDict.interned({keyA: 1}), FrozenDict.interned({keyB: 1})
+		self.assertEqual(hash(first), hash(second))
+		self.assertNotEqual(first, second)
+		self.assertIs(FrozenDict.interned({keyA: 1}), first)
+		self.assertIs(FrozenDict.interned({keyB: 1}), second, "A dict whose hash collides with another should be interned too")
+	
+	def test_internedGarbageCollected(self):
+		first, second = FrozenDict.interned({_SameHash(): 1}), FrozenDict.interned({_SameHash(): 1})
+		hash_ = hash(first)
+		self.assertEqual(len(FrozenDict._internTable[hash_]), 2)
+		del first
+		self.assertEqual(len(FrozenDict._internTable[hash_]), 1)
+		del second
+		self.assertNotIn(hash_, FrozenDict._internTable)
+	
+	def test_lazyCopy(self):
+		lazy = FrozenDict.lazy({"a": [1], "b": {"c": 2}})
+		copy = lazy.copy()
+		self.assertIs(type(copy), dict)
+		self.assertEqual(copy, {"a": (1,), "b": FrozenDict(c=2)})
+		self.assertIsInstance(copy["b"], FrozenDict)
+	
+	def test_pickle(self):
+		document = {"a": {"b": 1}, "c": [{"b": 1}, set([2])]}
+		for frozenDict in (FrozenDict(document), FrozenDict.lazy(document), FrozenDict.interned(document)):
+			for pickleModule in (pickle, cPickle):
+				for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+					unpickled = pickleModule.loads(pickleModule.dumps(frozenDict, protocol))
+					self.assertIs(type(unpickled), FrozenDict)
+					self.assertEqual(unpickled, frozenDict)
+					self.assertEqual(hash(unpickled), hash(frozenDict))
+					self.assertIsInstance(unpickled["a"], FrozenDict)
+			self.assertEqual(copy.deepcopy(frozenDict), frozenDict)
+		interned = FrozenDict.interned(document)
+		self.assertIs(cPickle.loads(cPickle.dumps(interned, 0)), interned, "Unpickled interned dicts should be interned again")
+	
+	def test_nestedContainers(self):
+		frozenDict = FrozenDict({"a": [set([1]), [2]], "b": (3, [4]), "c": bytearray("xy"), "d": (5, 6)})
+		self.assertEqual(frozenDict["a"], (frozenset([1]), (2,)))
+		self.assertEqual(frozenDict["b"], (3, (4,)))
+		self.assertEqual(frozenDict["c"], "xy")
+		self.assertIsInstance(frozenDict["c"], str)
+		hash(frozenDict)
+		self.assertEqual(hash(FrozenDict.lazy({"a": [set([1]), [2]]})), hash(FrozenDict({"a": [set([1]), [2]]})))
+	
+	def test_hashOrder(self):
+		items = [(str(i), i) for i in range(100)]
+		self.assertEqual(hash(FrozenDict(items)), hash(FrozenDict(reversed(items))))
+		self.assertNotEqual(hash(FrozenDict({"a": 1, "b": 2})), hash(FrozenDict({"a": 2, "b": 1})))
+	
+	def test_unhashable(self):
+		frozenDict = FrozenDict({"a": _Unhashable()})
+		self.assertRaises(TypeError, hash, frozenDict)
+		self.assertEqual(frozenDict, frozenDict)
+	
 	def test_toString(self):
 		"""This is for code coverage only"""
 		str(FrozenDict())
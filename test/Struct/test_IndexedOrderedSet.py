@@ -0,0 +1,55 @@
+from Lang.Struct import OrderedSet, IndexedOrderedSet
+from Lang.Struct import _IndexedOrderedSet
+from test_Abstract_OrderedSet import Struct_OrderedSet_Abstract
+
+import unittest
+
+class Test_IndexedOrderedSet(Struct_OrderedSet_Abstract, unittest.TestCase):
+	def getInstance(self, iterable=None):
+		return IndexedOrderedSet(iterable)
+	
+	def setUp(self):
+		self._oldBlockSize = _IndexedOrderedSet._BLOCK_SIZE
+		_IndexedOrderedSet._BLOCK_SIZE = 4		# so that blocks are split and removed often
+	def tearDown(self):
+		_IndexedOrderedSet._BLOCK_SIZE = self._oldBlockSize
+	
+	def test_index(self):
+		set_ = IndexedOrderedSet("abcdefghijklmnop")
+		for i, elem in enumerate("abcdefghijklmnop"):
+			self.assertEqual(set_.index(elem), i)
+			self.assertEqual(set_[i], elem)
+		self.assertEqual(set_[-1], "p")
+		self.assertRaises(KeyError, set_.__getitem__, 16)
+		self.assertRaises(ValueError, set_.index, "z")
+	
+	def test_slice(self):
+		set_ = IndexedOrderedSet("abcdefghijklmnop")
+		self.assertEqual(set_[2:11], IndexedOrderedSet("cdefghijk"))
+		self.assertEqual(set_[-3:], OrderedSet("nop"))
+		self.assertEqual(set_[::5], OrderedSet("afkp"))
+		self.assertEqual(set_[5:2], OrderedSet())
+	
+	def test_mergeBlocks(self):
+		"""Deleting most elements doesn't leave many small blocks behind"""
+		set_ = IndexedOrderedSet(xrange(100))
+		del set_[::3]
+		del set_[10:50]
+		for elem in list(set_)[::2]:
+			set_.discard(elem)
+		blocks = set_._IndexedOrderedSet__blocks
+		self.assertTrue(all(len(block.keys) >= 2 for block in blocks[:-1]))
+		self.assertEqual(sum(len(block.keys) for block in blocks), len(set_))
+		expected = range(100)
+		del expected[::3]
+		del expected[10:50]
+		self.assertEqual(list(set_), expected[1::2])
+		for i, elem in enumerate(set_):
+			self.assertEqual(set_.index(elem), i)
+			self.assertEqual(set_[i], elem)
+	
+	def test_repr(self):
+		self.assertEqual(repr(IndexedOrderedSet("ab")), "IndexedOrderedSet(['a', 'b'])")
+
+if __name__ == "__main__":
+	unittest.main()
@@ -1,7 +1,20 @@
 from Lang.Struct import LIFOstack
 
+import copy
+import cPickle as pickle
 import unittest
 
+class _NamedStack(LIFOstack):
+	"""A subclass which takes other constructor arguments, has a `__dict__` and overrides `push`"""
+	def __init__(self, name, maxItems=3):
+		super(_NamedStack, self).__init__()
+		self.name = name
+		self.maxItems = maxItems
+	def push(self, item):
+		if len(self) == self.maxItems:
+			raise OverflowError()
+		super(_NamedStack, self).push(item)
+
 class Test_LIFOstack(unittest.TestCase):
 	def _constructStack(self):
 		stack = LIFOstack()
@@ -43,6 +56,83 @@ class Test_LIFOstack(unittest.TestCase):
 		stack2.push("e")
 		self.assertNotEqual(self._constructStack(), stack2)
 	
+	def test_capacity(self):
+		stack = LIFOstack(capacity=3)
+		for item in "abcde":
+			stack.push(item)
+		self.assertEqual(len(stack), 3, "The bottom items should be dropped when the stack is full")
+		self.assertEqual(stack.peek(), "e")
+		self.assertEqual(stack.peek(3), "c")
+		self.assertEqual(stack[0], "c")
+		stack[-1] = "y"
+		self.assertEqual(stack.pop(), "y")
+		self.assertEqual(stack.pop(), "d")
+		stack.push("f")
+		self.assertEqual(str(stack), str(["c", "f"]))
+		self.assertEqual(stack.pop(), "f")
+		self.assertEqual(stack.pop(), "c")
+		self.assertRaises(IndexError, stack.pop)
+		self.assertRaises(IndexError, stack.peek)
+		self.assertRaises(ValueError, LIFOstack, 0)
+	
+	def test_capacityEqual(self):
+		stack = LIFOstack(capacity=2)
+		for item in "abcd":
+			stack.push(item)
+		self.assertIsInstance(stack, LIFOstack)
+		expected = LIFOstack()
+		expected.push("c")
+		expected.push("d")
+		self.assertEqual(stack, expected)
+	
+	def test_copy(self):
+		for stack in (self._constructStack(), LIFOstack(capacity=3)):
+			stack.push("x")
+			for copied in [copy.copy(stack), copy.deepcopy(stack)] + [pickle.loads(pickle.dumps(stack, protocol)) for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]:
+				self.assertEqual(copied, stack)
+				copied.push("y")
+				self.assertEqual(copied.peek(), "y")
+				self.assertEqual(stack.peek(), "x", "Pushing onto a copy should not change the original")
+				self.assertEqual(copied.pop(), "y")
+		self.assertEqual(copy.deepcopy(LIFOstack()), LIFOstack())
+		self.assertEqual(copy.copy(LIFOstack(capacity=2)).capacity, 2)
+	
+	def test_capacitySlots(self):
+		stack = LIFOstack(capacity=3)
+		self.assertFalse(hasattr(stack, "_list"), "The ring buffer stack shouldn't have the slots of the list based one")
+	
+	def test_subclass(self):
+		stack = _NamedStack("calls", maxItems=2)
+		self.assertIsInstance(stack, _NamedStack)
+		stack.push("a")
+		stack.push("b")
+		self.assertRaises(OverflowError, stack.push, "c")
+		self.assertEqual(stack.pop(), "b")
+		stack.tag = "x"
+		for copied in (copy.copy(stack), copy.deepcopy(stack), pickle.loads(pickle.dumps(stack, pickle.HIGHEST_PROTOCOL))):
+			self.assertEqual((copied.name, copied.maxItems, copied.tag), ("calls", 2, "x"))
+			self.assertEqual(copied, stack)
+			copied.push("c")
+			self.assertRaises(OverflowError, copied.push, "d")
+			self.assertEqual(len(stack), 1)
+	
+	def test_slice(self):
+		for capacity in (None, 5):
+			stack = LIFOstack(capacity)
+			for item in "abcd":
+				stack.push(item)
+			self.assertEqual(stack[1:3], ["b", "c"])
+			self.assertEqual(stack[::-1], list("dcba"))
+			stack[1:3] = ["x"]
+			self.assertEqual(stack[:], list("axd"))
+			stack[0:0] = ["y", "z"]
+			self.assertEqual(stack.pop(), "d")
+			self.assertEqual(stack[:], list("yzax"))
+		stack = LIFOstack(capacity=3)
+		stack[:] = "abcd"
+		self.assertEqual(stack[:], list("bcd"), "Only the top items should be kept")
+		self.assertEqual(stack.pop(), "d")
+	
 	def test_toString(self):
 		"""This is for code coverage only"""
 		str(LIFOstack())
@@ -1,4 +1,4 @@
-from Lang.Struct import OrderedSet
+from Lang.Struct import OrderedSet, OrderedSetView, AbstractOrderedSet, IndexedOrderedSet, CompactOrderedSet
 
 import unittest
 
@@ -78,6 +78,60 @@ class Test_OrderedSet(unittest.TestCase):
 		set_.insertMultiBefore(("e","f"), "g", updateOnExist=False)
 		self.assertEqual(set_, OrderedSet("edfg"), "Incorrect set with multiple insert where some elements already exist")
 	
+	def test_insertBeforeMulti_duplicates(self):
+		set_ = OrderedSet("xyz")
+		self.assertFalse(set_.insertMultiBefore(("a","b","a"), "z", updateOnExist=False))
+		self.assertEqual(set_, OrderedSet("xybaz"), "Last occurrence should win when updateOnExist=False")
+		
+		set_ = OrderedSet("xyz")
+		self.assertTrue(set_.insertMultiBefore(("a","x","a"), "z", updateOnExist=True))
+		self.assertEqual(set_, OrderedSet("yaxz"), "First occurrence should win when updateOnExist=True")
+	
+	def test_insertBeforeMulti_anchorInElems(self):
+		"""All ordered set classes give the same result when the anchor is one of the inserted elements"""
+		for elems, newElems, anchor, expected in (([5, 3], [5, 2, 10], 5, [5, 2, 10, 3]), ([6, 3], [1, 0, 3, 6, 8], 6, [1, 0, 3, 6, 8]),
+												([1, 2, 3], [2, 4, 2], 2, [1, 2, 4, 3]), ([1, 2], [2], 2, [1, 2])):
+			for cls in (OrderedSet, IndexedOrderedSet, CompactOrderedSet):
+				set_ = cls(elems)
+				self.assertTrue(set_.insertMultiBefore(newElems, anchor, True))
+				self.assertEqual(list(set_), expected, cls.__name__)
+	
+	def test_extend(self):
+		set_ = OrderedSet("ab")
+		set_.extend("cbdc")
+		self.assertEqual(set_, OrderedSet("abcd"), "Existing elements should not move when updateOnExist=False")
+		set_.extend("bab", updateOnExist=True)
+		self.assertEqual(set_, OrderedSet("cdab"), "Last occurrence should win when updateOnExist=True")
+		set_.extend(iter(()))
+		self.assertEqual(set_, OrderedSet("cdab"))
+		self.assertEqual(OrderedSet(iter("abcabc")), OrderedSet("abc"))
+	
+	def test_update(self):
+		set_ = OrderedSet("ab")
+		set_.update("bc", ["d", "a"])
+		self.assertEqual(set_, OrderedSet("abcd"))
+		set_ |= "ex"
+		self.assertEqual(set_, OrderedSet("abcdex"))
+	
+	def test_difference_update(self):
+		set_ = OrderedSet("abcdef")
+		set_.difference_update("bz", ["e"])
+		self.assertEqual(set_, OrderedSet("acdf"))
+		set_ -= "a"
+		self.assertEqual(set_, OrderedSet("cdf"))
+		set_.add("g")
+		self.assertEqual(list(set_), list("cdfg"))
+		set_ -= set_
+		self.assertEqual(len(set_), 0)
+	
+	def test_union_intersection(self):
+		set_ = OrderedSet("abcd")
+		union = set_.union("ce", iter("fa"))
+		self.assertIsInstance(union, OrderedSet)
+		self.assertEqual(union, OrderedSet("abcdef"))
+		self.assertEqual(set_, OrderedSet("abcd"), "union should not change the set")
+		self.assertEqual(set_.intersection("dbx", iter("bcd")), OrderedSet("bd"))
+	
 	def test_append(self):
 		set_ = OrderedSet("bc")
 		set_.append("d", updateOnExist=True)
@@ -130,23 +184,120 @@ class Test_OrderedSet(unittest.TestCase):
 		set_[1] = "y"
 		self.assertEqual(set_, OrderedSet("xyz"), "Failed to change item in middle of set")
 	
-# 	def test_setitem_slice_insert(self):
-# 		set_ = OrderedSet("abc")
-# 		set_[3:3] = "o"
-# 		self.assertEqual(set_, OrderedSet("abco"), "Failed to insert item at end of set")
-# 		set_[1:1] = "o"
-# 		self.assertEqual(set_, OrderedSet("aobco"), "Failed to insert item in middle of set")
-# 		set_[0:0] = "o"
-# 		self.assertEqual(set_, OrderedSet("oaobco"), "Failed to insert item at beginning of set")
-	
-# 	def test_setitems_slice(self):
-# 		set_ = OrderedSet("abcd")
-# 		set_[0:2] = ("w", "k")
-# 		self.assertEqual(set_, OrderedSet("wkcd"), "Failed to change items, at beginning of set, by slice")
-# 		set_[2:4] = ("l", "z")
-# 		self.assertEqual(set_, OrderedSet("wklz"), "Failed to change items, at end of set, by slice")
-# 		set_[1:3] = ("x", "y")
-# 		self.assertEqual(set_, OrderedSet("wxyz"), "Failed to change items, in middle of set, by slice")
+	def test_setitem_slice_insert(self):
+		set_ = OrderedSet("abc")
+		set_[3:3] = "o"
+		self.assertEqual(set_, OrderedSet("abco"), "Failed to insert item at end of set")
+		set_[1:1] = "o"
+		self.assertEqual(set_, OrderedSet("aobco"), "Failed to insert item in middle of set")
+		set_[0:0] = "o"
+		self.assertEqual(set_, OrderedSet("oaobco"), "Failed to insert item at beginning of set")
+	
+	def test_setitems_slice(self):
+		set_ = OrderedSet("abcd")
+		set_[0:2] = ("w", "k")
+		self.assertEqual(set_, OrderedSet("wkcd"), "Failed to change items, at beginning of set, by slice")
+		set_[2:4] = ("l", "z")
+		self.assertEqual(set_, OrderedSet("wklz"), "Failed to change items, at end of set, by slice")
+		set_[1:3] = ("x", "y")
+		self.assertEqual(set_, OrderedSet("wxyz"), "Failed to change items, in middle of set, by slice")
+	
+	def test_setitems_extendedSlice(self):
+		set_ = OrderedSet("abcd")
+		set_[::2] = ("x", "y")
+		self.assertEqual(set_, OrderedSet("xbyd"), "Failed to change items by extended slice")
+		self.assertRaises(ValueError, set_.__setitem__, slice(None, None, 2), "xyz")
+	
+	def test_setitems_slice_resize(self):
+		set_ = OrderedSet("abcde")
+		set_[1:4] = "x"
+		self.assertEqual(set_, OrderedSet("axe"), "Failed to replace a slice with fewer items")
+		set_[1:2] = "bcd"
+		self.assertEqual(set_, OrderedSet("abcde"), "Failed to replace a slice with more items")
+		set_[0:1] = "e"
+		self.assertEqual(set_, OrderedSet("ebcd"), "Failed to move an existing item into a slice")
+	
+	def test_delitem_slice(self):
+		set_ = OrderedSet("abcdefg")
+		del set_[1:3]
+		self.assertEqual(set_, OrderedSet("adefg"), "Failed to delete a slice")
+		del set_[::2]
+		self.assertEqual(set_, OrderedSet("df"), "Failed to delete an extended slice")
+		del set_[5:]
+		self.assertEqual(set_, OrderedSet("df"))
+	
+	def test_getitem_sliceView(self):
+		set_ = OrderedSet("abcdef")
+		view = set_[1:4]
+		self.assertIsInstance(view, OrderedSetView)
+		self.assertEqual(len(view), 3)
+		self.assertTrue("c" in view)
+		self.assertFalse("a" in view)
+		self.assertEqual(list(reversed(view)), list("dcb"))
+		self.assertEqual(view[-1], "d")
+		self.assertEqual(view[1:], OrderedSet("cd"))
+		self.assertEqual(set_[::-2], OrderedSet("fdb"))
+		self.assertEqual(set_[4:1:-1][::2], OrderedSet("ec"))
+		set_.discard("b")
+		self.assertEqual(view, OrderedSet("cde"), "View should show the current elements of the set")
+		copy = view.copy()
+		set_.discard("c")
+		self.assertEqual(copy, OrderedSet("cde"))
+	
+	def test_changeDuringIteration(self):
+		set_ = OrderedSet("abc")
+		iterator = iter(set_)
+		next(iterator)
+		set_.add("d")
+		self.assertRaises(RuntimeError, next, iterator)
+		iterator = reversed(set_)
+		next(iterator)
+		set_.discard("a")
+		self.assertRaises(RuntimeError, next, iterator)
+		iterator = iter(set_)
+		next(iterator)
+		set_.add("b")		# already in the set, so nothing changes
+		self.assertEqual(list(iterator), list("cd"))
+	
+	def test_noOpBulkChangeDuringIteration(self):
+		set_ = OrderedSet("abc")
+		iterator = iter(set_)
+		next(iterator)
+		set_ |= ["a", "c"]
+		set_.extend("ab")
+		set_.difference_update(["x", "y"])
+		set_.insertMultiBefore(["a", "b"], "c", updateOnExist=False)
+		self.assertEqual(list(iterator), list("bc"))
+		
+		iterator = iter(set_)
+		next(iterator)
+		set_.extend("bx")
+		self.assertRaises(RuntimeError, next, iterator)
+		iterator = iter(set_)
+		next(iterator)
+		set_.difference_update(["y", "x"])
+		self.assertRaises(RuntimeError, next, iterator)
+		self.assertRaises(RuntimeError, set_.extend, (elem * 2 for elem in set_))
+	
+	def test_eq(self):
+		self.assertEqual(OrderedSet("abc"), OrderedSet("abc"))
+		self.assertNotEqual(OrderedSet("abc"), OrderedSet("acb"))
+		self.assertNotEqual(OrderedSet("abc"), OrderedSet("ab"))
+		self.assertEqual(OrderedSet(), OrderedSet())
+	
+	def test_repr(self):
+		self.assertEqual(repr(OrderedSet()), "OrderedSet()")
+		self.assertEqual(repr(OrderedSet(["a", 1])), "OrderedSet(['a', 1])")
+	
+	def test_reversed(self):
+		self.assertEqual(list(reversed(OrderedSet())), [])
+		self.assertEqual(list(reversed(OrderedSet("a"))), ["a"])
+		self.assertEqual(list(reversed(OrderedSet("abc"))), list("cba"))
+	
+	def test_iterSliceIsAbstract(self):
+		class NoIterSlice(AbstractOrderedSet):
+			__contains__ = __iter__ = __len__ = add = discard = lambda self, *args: None
+		self.assertRaises(TypeError, NoIterSlice)
 
 if __name__ == "__main__":
 	unittest.main()
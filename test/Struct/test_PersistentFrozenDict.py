@@ -0,0 +1,113 @@
+from Lang.Struct import PersistentFrozenDict, FrozenDict
+
+import pickle
+import random
+import unittest
+
+class _Key(object):
+	"""A key with a chosen hash, for making keys whose hashes collide"""
+	def __init__(self, name, hash_):
+		self.name = name
+		self.hash = hash_
+	def __hash__(self):
+		return self.hash
+	def __eq__(self, other):
+		return isinstance(other, _Key) and self.name == other.name
+	def __ne__(self, other):
+		return not (self == other)
+	def __repr__(self):
+		return "_Key(" + repr(self.name) + ")"
+
+class _Unhashable(object):
+	__hash__ = None
+
+class Test_PersistentFrozenDict(unittest.TestCase):
+	def test_equal(self):
+		dict_ = {"a":1, "b":2, "c":3}
+		frozenDict = PersistentFrozenDict(dict_)
+		self.assertEqual(frozenDict, dict_)
+		self.assertEqual(dict_, frozenDict)
+		self.assertEqual(PersistentFrozenDict(a=1, b=2, c=3), frozenDict)
+		self.assertNotEqual(frozenDict, {"a":1, "b":2})
+		self.assertNotEqual(frozenDict, {"a":1, "b":2, "c":4})
+		self.assertEqual(PersistentFrozenDict(), {})
+	
+	def test_nested(self):
+		frozenDict = PersistentFrozenDict({"a": {"c":3}, "b": ["e", {"f":6}]})
+		self.assertIsInstance(frozenDict["a"], PersistentFrozenDict)
+		self.assertIsInstance(frozenDict["b"], tuple)
+		self.assertIsInstance(frozenDict["b"][1], PersistentFrozenDict)
+		self.assertIsInstance(frozenDict.set("g", {"h": 1})["g"], PersistentFrozenDict)
+		hash(frozenDict)
+	
+	def test_setDelete(self):
+		original = PersistentFrozenDict({"a":1, "b":2})
+		changed = original.set("c", 3).set("a", 10).delete("b")
+		self.assertEqual(changed, {"a":10, "c":3})
+		self.assertEqual(original, {"a":1, "b":2}, "The original should not change")
+		self.assertIs(original.set("a", 1), original, "Setting the same value should return the same dict")
+		self.assertRaises(KeyError, original.delete, "x")
+		self.assertEqual(original.delete("a").delete("b"), {})
+		self.assertEqual(original.update({"b": 20}, d=4), {"a":1, "b":20, "d":4})
+		self.assertEqual(PersistentFrozenDict().set("a", 1), {"a":1})
+	
+	def test_collisions(self):
+		keys = [_Key(i, i % 3) for i in range(12)]
+		frozenDict = PersistentFrozenDict((key, key.name) for key in keys)
+		self.assertEqual(len(frozenDict), 12)
+		for key in keys:
+			self.assertEqual(frozenDict[key], key.name)
+		self.assertNotIn(_Key(99, 0), frozenDict)
+		for key in keys[:11]:
+			frozenDict = frozenDict.delete(key)
+		self.assertEqual(frozenDict, {keys[11]: 11})
+		frozenDict = frozenDict.set(_Key("x", 11), "x").set(_Key("y", 11 + (1 << 40)), "y")
+		self.assertEqual(len(frozenDict), 3)
+		self.assertEqual(frozenDict[_Key("y", 11 + (1 << 40))], "y")
+	
+	def test_sameAsDict(self):
+		rand = random.Random(3)
+		expected = {}
+		frozenDict = PersistentFrozenDict()
+		for _ in range(3000):
+			key = rand.randrange(400)
+			if rand.random() < 0.4 and key in expected:
+				del expected[key]
+				frozenDict = frozenDict.delete(key)
+			else:
+				expected[key] = rand.random()
+				frozenDict = frozenDict.set(key, expected[key])
+			self.assertEqual(len(frozenDict), len(expected))
+		self.assertEqual(dict(frozenDict.iteritems()), expected)
+		self.assertEqual(sorted(frozenDict), sorted(expected))
+		self.assertEqual(frozenDict, PersistentFrozenDict(expected))
+	
+	def test_hash(self):
+		frozenDict = PersistentFrozenDict({"a":1, "b":2, "c":3})
+		hash(frozenDict)
+		derived = frozenDict.set("d", 4).set("a", 5).delete("d").set("a", 1)
+		self.assertEqual(derived._itemsHash, frozenDict._itemsHash, "The hash should be updated by each change")
+		self.assertEqual(hash(derived), hash(PersistentFrozenDict({"a":1, "b":2, "c":3})))
+		self.assertEqual(len(set([frozenDict, derived])), 1)
+		self.assertRaises(TypeError, hash, PersistentFrozenDict({"a": _Unhashable()}))
+		self.assertRaises(TypeError, hash, frozenDict.set("e", _Unhashable()))
+		self.assertEqual(hash(frozenDict), hash(FrozenDict({"a":1, "b":2, "c":3})), "Equal frozen dicts should have equal hashes")
+	
+	def test_nestedContainers(self):
+		frozenDict = PersistentFrozenDict({"a": set([1]), "b": ([1], {"c": 2}), "d": bytearray("xy")})
+		self.assertEqual(frozenDict["a"], frozenset([1]))
+		self.assertEqual(frozenDict["b"], ((1,), PersistentFrozenDict({"c": 2})))
+		self.assertEqual(frozenDict["d"], "xy")
+		hash(frozenDict)
+	
+	def test_pickle(self):
+		frozenDict = PersistentFrozenDict({"a":1, "b": {"c": 2}})
+		self.assertEqual(pickle.loads(pickle.dumps(frozenDict)), frozenDict)
+	
+	def test_toString(self):
+		"""This is for code coverage only"""
+		str(PersistentFrozenDict())
+		repr(PersistentFrozenDict({"a":1, "b":2, "c":3}))
+
+if __name__ == "__main__":
+	unittest.main()
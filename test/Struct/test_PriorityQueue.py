@@ -0,0 +1,58 @@
+from Lang.Struct import PriorityQueue
+
+import copy
+import cPickle as pickle
+import unittest
+
+class Test_PriorityQueue(unittest.TestCase):
+	def test_pop(self):
+		queue = PriorityQueue()
+		for item in (5, 1, 4, 2, 3):
+			queue.push(item)
+		self.assertEqual(len(queue), 5)
+		self.assertEqual([queue.pop() for _ in range(5)], [1, 2, 3, 4, 5])
+		self.assertRaises(IndexError, queue.pop)
+	
+	def test_key(self):
+		queue = PriorityQueue(key=lambda item: item["priority"])
+		items = [{"priority": 2, "name": "b"}, {"priority": 1, "name": "a"}, {"priority": 2, "name": "c"}]
+		for item in items:
+			queue.push(item)
+		self.assertEqual([queue.pop()["name"] for _ in range(3)], ["a", "b", "c"], "Equal priorities should pop in the order they were pushed")
+	
+	def test_peek(self):
+		queue = PriorityQueue()
+		for item in (3, 1, 2):
+			queue.push(item)
+		self.assertEqual(queue.peek(), 1)
+		self.assertEqual(queue.peek(3), 3)
+		self.assertRaises(IndexError, queue.peek, 4)
+		self.assertEqual(len(queue), 3)
+	
+	def test_equal(self):
+		queueA, queueB = PriorityQueue(), PriorityQueue()
+		for item in (3, 1, 2):
+			queueA.push(item)
+		for item in (1, 2, 3):
+			queueB.push(item)
+		self.assertEqual(queueA, queueB)
+		queueB.pop()
+		self.assertNotEqual(queueA, queueB)
+	
+	def test_toString(self):
+		"""This is for code coverage only"""
+		str(PriorityQueue())
+		repr(PriorityQueue())
+	
+	def test_copy(self):
+		queue = PriorityQueue()
+		for item in (3, 1, 2):
+			queue.push(item)
+		for copied in [copy.copy(queue), copy.deepcopy(queue)] + [pickle.loads(pickle.dumps(queue, protocol)) for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]:
+			self.assertEqual(copied, queue)
+			copied.push(0)
+			self.assertEqual(queue.peek(), 1, "Pushing onto a copy should not change the original")
+			self.assertEqual([copied.pop() for _ in range(4)], [0, 1, 2, 3])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,27 @@
+from Lang.Struct import _hashing
+
+import unittest
+
+class Test_hashing(unittest.TestCase):
+	def test_itemsHash(self):
+		items = [("a", 1), ("b", 2), ("c", 3)]
+		self.assertEqual(_hashing.itemsHash(items), _hashing.itemsHash(reversed(items)), "Order should not change the hash")
+		self.assertNotEqual(_hashing.itemsHash([("a", 1)]), _hashing.itemsHash([(1, "a")]))
+		self.assertNotEqual(_hashing.itemsHash([("a", 1), ("b", 2)]), _hashing.itemsHash([("a", 2), ("b", 1)]))
+		total = _hashing.itemsHash(items)
+		changed = total ^ _hashing.itemHash("b", 2) ^ _hashing.itemHash("b", 5)
+		self.assertEqual(changed, _hashing.itemsHash([("a", 1), ("b", 5), ("c", 3)]))
+	
+	def test_freeze(self):
+		freezeDict = lambda dict_: tuple(sorted(dict_.items()))
+		self.assertEqual(_hashing.freeze([1, [2], {"a": set([3])}], freezeDict), (1, (2,), (("a", set([3])),)))
+		self.assertEqual(_hashing.freeze(set([1, 2]), freezeDict), frozenset([1, 2]))
+		self.assertEqual(_hashing.freeze(bytearray("ab"), freezeDict), "ab")
+		unchanged = (1, "a", (2,))
+		self.assertIs(_hashing.freeze(unchanged, freezeDict), unchanged)
+		self.assertEqual(_hashing.freeze((1, [2]), freezeDict), (1, (2,)))
+		self.assertFalse(_hashing.needsFreezing(5))
+		self.assertTrue(_hashing.needsFreezing({}))
+
+if __name__ == "__main__":
+	unittest.main()